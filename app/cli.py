@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Nur argparse auf Modulebene: pandas/openpyxl werden erst nach dem Parsen importiert,
+# damit "--help" und Argumentfehler sofort zurückkommen.
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="Excel-Filler ohne GUI: T1 aus T2 über Kopplungen (settings.json) plausibel füllen.",
+    )
+    p.add_argument("--t1", required=True, help="Zieldatei (Tabelle 1)")
+    p.add_argument("--t1-sheet", help="Sheet in Tabelle 1 (Standard: erstes Sheet)")
+    p.add_argument("--t1-header", type=int, default=1, help="Header-Zeile in Tabelle 1 (1-basiert)")
+    p.add_argument("--t1-key", required=True, help='KEY-Spalte(n) in Tabelle 1, z. B. "Kundennr" oder "PLZ,Nachname:lower,Hausnummer" (Normalisierung je Teil: text, lower, digits)')
+
+    p.add_argument("--t2", required=True, help="Quelldatei (Tabelle 2)")
+    p.add_argument("--t2-sheet", help="Sheet in Tabelle 2 (Standard: erstes Sheet)")
+    p.add_argument("--t2-header", type=int, default=1, help="Header-Zeile in Tabelle 2 (1-basiert)")
+    p.add_argument("--t2-key", required=True, help="KEY-Spalte(n) in Tabelle 2 (gleich viele Teile wie --t1-key)")
+
+    p.add_argument(
+        "--source", action="append", nargs=2, default=[], metavar=("DATEI[#SHEET[#HEADER]]", "KEY"),
+        help="weitere Quelle (mehrfach möglich; HEADER = Header-Zeile, 1-basiert, Standard 1); Kopplungen wie T2, Vorrang je Spalte aus settings.json (source_priority)",
+    )
+    p.add_argument(
+        "--priority", action="append", default=[], metavar="SPALTE=QUELLE,QUELLE",
+        help='Vorrang je T1-Spalte, Quellname = "datei.xlsx [Sheet]" (überschreibt source_priority)',
+    )
+
+    p.add_argument("--conflicts", metavar="DATEI", help="Bericht über KEYs mit widersprüchlichen Quellwerten schreiben (.xlsx oder .csv)")
+
+    p.add_argument("--settings", help="settings.json mit col_links/cuts (Standard: ~/.excel_filler_gui/settings.json)")
+    p.add_argument("--drop-leading-zeros", action="store_true", help="führende Nullen im KEY ignorieren")
+
+    out = p.add_mutually_exclusive_group()
+    out.add_argument("-o", "--out", help="Ausgabedatei (Standard: <t1>_filled_<ts>.xlsx neben T1)")
+    out.add_argument("--in-place", action="store_true", help="in Tabelle 1 zurückschreiben (mit Backup)")
+    return p
+
+def _parse_source_spec(spec: str) -> tuple[str, str, int]:
+    # DATEI[#SHEET[#HEADER]]; ein letzter Teil aus Ziffern ist die Header-Zeile, sonst gehört er zum Sheet-Namen
+    path, _, rest = spec.partition("#")
+    sheet, sep, header = rest.rpartition("#")
+    if sep and header.isdigit() and int(header) >= 1:
+        return path, sheet, int(header)
+    return path, rest, 1
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    from app.services.excel_io import list_sheets, load_table
+    from app.services.matcher import MatchEngine, parse_key_spec
+    from app.services.autofill import autofill_linked
+    from app.services.settings import load_settings
+    from app.services import apply_changes
+
+    settings = load_settings(args.settings)
+    if not settings.col_links:
+        print("Keine Kopplungen (col_links) in den Settings definiert.", file=sys.stderr)
+        return 2
+
+    if args.in_place and Path(args.t1).suffix.lower() not in apply_changes.IN_PLACE_SUFFIXES:
+        print("--in-place geht nur für .xlsx/.xlsm; bitte -o ausgabe.xlsx verwenden.", file=sys.stderr)
+        return 2
+
+    t1 = load_table(args.t1, args.t1_sheet or list_sheets(args.t1)[0], args.t1_header)
+    t2 = load_table(args.t2, args.t2_sheet or list_sheets(args.t2)[0], args.t2_header)
+    try:
+        key1, key2 = parse_key_spec(args.t1_key), parse_key_spec(args.t2_key)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    for t, parts in ((t1, key1), (t2, key2)):
+        for part in parts:
+            if part.col not in t.df.columns:
+                print(f"KEY-Spalte '{part.col}' fehlt in {t.path.name} [{t.sheet}].", file=sys.stderr)
+                return 2
+    if len(key1) != len(key2):
+        print("KEY in Tabelle 1 und Tabelle 2 braucht gleich viele Spalten.", file=sys.stderr)
+        return 2
+
+    engine = MatchEngine(t1.df, key1, t2.df, key2, keep_zeros=not args.drop_leading_zeros, source_name=f"{t2.path.name} [{t2.sheet}]")
+    for spec, key in args.source:
+        path, sheet, header = _parse_source_spec(spec)
+        src = load_table(path, sheet or list_sheets(path)[0], header)
+        try:
+            engine.add_source(f"{src.path.name} [{src.sheet}]", src.df, key)
+        except (ValueError, KeyError) as e:
+            print(f"Quelle {spec}: {e}", file=sys.stderr)
+            return 2
+
+    priority = dict(settings.source_priority)
+    for item in args.priority:
+        col, _, names = item.partition("=")
+        priority[col.strip()] = [n.strip() for n in names.split(",") if n.strip()]
+    cols = [c for c in engine.df1.columns if c != "_KEY_" and c not in engine.key1_cols]
+    print(f"{len(engine.keys_with_missing(cols))} Kundennummern mit Lücken gefunden")
+
+    if args.conflicts:
+        from app.services.conflicts import find_conflicts
+        report = find_conflicts(engine, settings.col_links)
+        if args.conflicts.lower().endswith(".csv"):
+            report.table.to_csv(args.conflicts, index=False, encoding="utf-8-sig")
+        else:
+            apply_changes.write_xlsx_streaming(report.table, args.conflicts, sheet_name="Konflikte")
+        print(f"{len(report.keys)} KEY(s) mit widersprüchlichen Quellwerten -> {args.conflicts}")
+
+    filled = autofill_linked(engine, settings.col_links, settings.cuts, settings.country_default_value, priority=priority)
+    for col, n in filled.items():
+        print(f"  {col}: {n}")
+    print(f"{sum(filled.values())} Zellen gefüllt")
+
+    if args.in_place:
+        from app.services.backup_store import BackupStore
+        out = apply_changes.save_in_place(
+            engine.df1, t1.path, t1.sheet, make_backup=True,
+            dirty=engine.dirty, header_row_1based=t1.header_row, source_columns=t1.source_columns,
+            backup_store=BackupStore(keep_last=settings.backup_keep_last, max_age_days=settings.backup_max_age_days),
+        )
+    elif args.out:
+        out = apply_changes.save_to_path(engine.df1, args.out)
+    else:
+        out = apply_changes.save_filled(engine.df1, t1.path.parent, t1.path.stem)
+    print(f"Gespeichert: {out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,33 +1,139 @@
 from __future__ import annotations
 from pathlib import Path
 from datetime import datetime
+from typing import Callable
 import pandas as pd
 from openpyxl import load_workbook
 from openpyxl.utils.dataframe import dataframe_to_rows
+from .backup_store import BackupStore
 
-def save_filled(df: pd.DataFrame, out_dir: str | Path, base_name: str) -> Path:
+WRITE_CHUNK_ROWS = 10_000
+# save_in_place öffnet die Datei mit openpyxl
+IN_PLACE_SUFFIXES = (".xlsx", ".xlsm")
+
+# progress(geschriebene Zeilen, Zeilen gesamt); darf eine Exception werfen, um abzubrechen
+Progress = Callable[[int, int], None]
+
+def _write_engine() -> str:
+    try:
+        import xlsxwriter  # noqa: F401
+        return "xlsxwriter"
+    except ImportError:
+        return "openpyxl"
+
+def _blank(v) -> bool:
+    return v is None or v is pd.NA or (isinstance(v, float) and v != v)
+
+def _row_chunks(df: pd.DataFrame, positions: list[int]):
+    # blockweise nach object-Array, ohne den ganzen Frame zu kopieren
+    for start in range(0, len(df), WRITE_CHUNK_ROWS):
+        yield df.iloc[start:start + WRITE_CHUNK_ROWS, positions].to_numpy(dtype=object)
+
+def write_xlsx_streaming(df: pd.DataFrame, path: str | Path, sheet_name: str = "Sheet1", exclude=("_KEY_",), progress: Progress | None = None) -> Path:
+    path = Path(path)
+    positions = [i for i, c in enumerate(df.columns) if c not in exclude]
+    header = [str(df.columns[i]) for i in positions]
+
+    if _write_engine() == "xlsxwriter":
+        import xlsxwriter
+        wb = xlsxwriter.Workbook(str(path), {"constant_memory": True})
+        ws = wb.add_worksheet(sheet_name)
+        bold = wb.add_format({"bold": True, "border": 1})
+        for c, name in enumerate(header):
+            ws.write_string(0, c, name, bold)
+        r = 1
+        for block in _row_chunks(df, positions):
+            for row in block:
+                for c, v in enumerate(row):
+                    if _blank(v):
+                        continue
+                    if isinstance(v, str):
+                        ws.write_string(r, c, v)  # kein Auto-Formel/URL
+                    else:
+                        ws.write(r, c, v)
+                r += 1
+            if progress:
+                progress(r - 1, len(df))
+        wb.close()
+        return path
+
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+
+    def literal(v):
+        # "=..." als Text, nicht als Formel
+        cell = WriteOnlyCell(ws, value=v)
+        cell.data_type = "s"
+        return cell
+
+    ws.append(header)
+    done = 0
+    for block in _row_chunks(df, positions):
+        for row in block:
+            ws.append([None if _blank(v) else literal(v) if isinstance(v, str) and v.startswith("=") else v for v in row])
+        done += len(block)
+        if progress:
+            progress(done, len(df))
+    wb.save(path)
+    return path
+
+def save_filled(df: pd.DataFrame, out_dir: str | Path, base_name: str, progress: Progress | None = None) -> Path:
     ts = datetime.now().strftime("%Y-%m-%d_%H%M")
     out_dir = Path(out_dir)
     out = out_dir / f"{base_name}_filled_{ts}.xlsx"
-    df2 = df.drop(columns=[c for c in ["_KEY_"] if c in df.columns])
-    df2.to_excel(out, index=False)
-    return out
+    return write_xlsx_streaming(df, out, progress=progress)
 
-def save_to_path(df: pd.DataFrame, path: str | Path) -> Path:
-    path = Path(path)
-    df2 = df.drop(columns=[c for c in ["_KEY_"] if c in df.columns])
-    df2.to_excel(path, index=False)
-    return path
+def save_to_path(df: pd.DataFrame, path: str | Path, progress: Progress | None = None) -> Path:
+    return write_xlsx_streaming(df, path, progress=progress)
 
-def save_in_place(df: pd.DataFrame, path: str | Path, sheet_name: str, make_backup: bool = True) -> Path:
+def _cell_value(v):
+    return None if pd.isna(v) else str(v)
+
+def _patch_sheet(ws, df: pd.DataFrame, dirty, header_row_1based: int, source_columns: list[str]) -> None:
+    # nur geänderte Zellen + neu hinzugefügte Spalten schreiben; Formate/Formeln bleiben erhalten
+    col_pos = {c: i + 1 for i, c in enumerate(source_columns)}
+    first_data_row = header_row_1based + 1
+
+    added = [c for c in df.columns if c != "_KEY_" and c not in col_pos]
+    for i, col in enumerate(added):
+        c = len(source_columns) + 1 + i
+        col_pos[col] = c
+        ws.cell(row=header_row_1based, column=c, value=col)
+        for r, v in enumerate(df[col].tolist()):
+            ws.cell(row=first_data_row + r, column=c, value=_cell_value(v))
+
+    get_loc = df.index.get_loc
+    for idx, col in dirty:
+        if col in added or col not in col_pos or col not in df.columns:
+            continue
+        ws.cell(row=first_data_row + get_loc(idx), column=col_pos[col], value=_cell_value(df.at[idx, col]))
+
+def save_in_place(
+    df: pd.DataFrame,
+    path: str | Path,
+    sheet_name: str,
+    make_backup: bool = True,
+    dirty=None,
+    header_row_1based: int = 1,
+    source_columns: list[str] | None = None,
+    backup_store: BackupStore | None = None,
+) -> Path:
     path = Path(path)
+    if path.suffix.lower() not in IN_PLACE_SUFFIXES:
+        # vor dem Backup prüfen: openpyxl kann .xls nicht öffnen
+        raise ValueError(f"{path.name}: in derselben Datei speichern geht nur für .xlsx/.xlsm – bitte 'Speichern unter…' (.xlsx) verwenden.")
 
     if make_backup and path.exists():
-        ts = datetime.now().strftime("%Y-%m-%d_%H%M")
-        backup = path.with_name(f"{path.stem}_backup_{ts}{path.suffix}")
-        backup.write_bytes(path.read_bytes())
+        (backup_store or BackupStore()).backup(path)
+
+    wb = load_workbook(path, keep_vba=path.suffix.lower() == ".xlsm")
 
-    wb = load_workbook(path)
+    if dirty is not None and source_columns is not None and sheet_name in wb.sheetnames:
+        _patch_sheet(wb[sheet_name], df, dirty, header_row_1based, source_columns)
+        wb.save(path)
+        return path
 
     if sheet_name in wb.sheetnames:
         ws_old = wb[sheet_name]
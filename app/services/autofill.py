@@ -0,0 +1,122 @@
+from __future__ import annotations
+from typing import Callable
+import numpy as np
+import pandas as pd
+from .matcher import MatchEngine, Source
+from .normalize import missing_mask_series
+from .transforms import split_street_house_series, normalize_phone_series, states_from_zip_de
+
+PHONE_COLS = ("phone", "phonegeneral", "telefon", "festnetz", "mobil", "mobilgeneral")
+STREET_COLS = ("street", "straße")
+HOUSE_COLS = ("houseNumber", "hausnummer")
+ZIP_COLS = ("zipCode", "plz", "postalCode")
+
+def first_values_by_key(df2: pd.DataFrame, t2_col: str) -> pd.Series:
+    # erster nicht-fehlender Wert je KEY (Reihenfolge wie in T2)
+    vals = df2[t2_col]
+    vals = vals[~missing_mask_series(vals)].astype(str).str.strip()
+    return vals.groupby(df2.loc[vals.index, "_KEY_"], sort=False).first()
+
+def _source_rows(src: Source, keys) -> pd.DataFrame:
+    # nur die Gruppen dieser KEYs, in T2-Reihenfolge (first_values_by_key nimmt weiter den ersten Wert)
+    indices = src.groups.indices
+    pos = [indices[k] for k in keys if k in indices]
+    return src.df.iloc[np.sort(np.concatenate(pos))] if pos else src.df.iloc[0:0]
+
+def _by_priority(links: list, names: list[str] | None) -> list:
+    # genannte Quellen zuerst (in dieser Reihenfolge), übrige in Engine-Reihenfolge
+    if not names:
+        return links
+    rank = {n: i for i, n in enumerate(names)}
+    return sorted(links, key=lambda sl: rank.get(sl[0].name, len(rank)))
+
+def autofill_linked(
+    engine: MatchEngine,
+    col_links: dict[str, str],
+    cuts: dict[str, bool],
+    country_default_value: str,
+    key_col: str | list[str] | None = None,
+    rows: list | None = None,
+    progress: Callable[[int, int], None] | None = None,
+    priority: dict[str, list[str]] | None = None,
+) -> dict[str, int]:
+    # col_links gilt für die Haupt-Quelle (und Quellen ohne eigene Kopplungen), siehe Source.links.
+    # priority: T1-Spalte -> Quellnamen in Vorrang-Reihenfolge; je Zelle gewinnt die erste Quelle mit Wert.
+    # progress(erledigte Spalten, Spalten gesamt) zwischen den Spalten; eine Exception dort bricht ab,
+    # bereits gefüllte Spalten bleiben gefüllt (und dirty)
+    df1 = engine.df1
+    priority = priority or {}
+    # KEY-Spalten (auch zusammengesetzt) werden nie befüllt
+    key_cols = set(engine.key1_cols if key_col is None else [key_col] if isinstance(key_col, str) else key_col)
+
+    # rows: nur diese T1-Zeilen und aus den Quellen nur die Gruppen ihrer KEYs (Einzelzeile im UI-Thread)
+    scope = None if rows is None else df1.index[df1.index.isin(rows)]
+
+    def col(c: str) -> pd.Series:
+        return df1[c] if scope is None else df1.loc[scope, c]
+
+    keys = col("_KEY_").fillna("").astype(str)
+    valid = keys != ""
+    wanted = None if scope is None else set(keys[valid])
+    links = [(src, src.links(col_links)) for src in engine.sources]
+    frames = {src.name: src.df if wanted is None else _source_rows(src, wanted) for src, _ in links}
+    # Treffer über die Gruppen-Indizes der Quellen (dict-Lookup statt isin gegen alle KEYs)
+    found = np.zeros(len(keys), dtype=bool)
+    for src, _ in links:
+        indices = src.groups.indices
+        found |= np.fromiter((k in indices for k in keys), dtype=bool, count=len(keys))
+    has_match = valid & found
+    t1_cols = list(dict.fromkeys(c for _, l in links for c in l))
+
+    filled: dict[str, int] = {}
+    for n, t1_col in enumerate(t1_cols):
+        if progress:
+            progress(n, len(t1_cols))
+        if t1_col == "_KEY_" or t1_col in key_cols or t1_col not in df1.columns:
+            continue
+
+        # alle Quellen in einem Durchgang: je Quelle erster Wert je KEY, dann nach Vorrang zusammenführen
+        chosen = None
+        for src, l in _by_priority(links, priority.get(t1_col)):
+            t2_col = l.get(t1_col)
+            if t2_col is None or t2_col not in src.df.columns:
+                continue
+            vals = keys.map(first_values_by_key(frames[src.name], t2_col))
+            chosen = vals if chosen is None else chosen.combine_first(vals)
+        if chosen is None:
+            continue
+        target = valid & missing_mask_series(col(t1_col)) & chosen.notna()
+        if not target.any():
+            continue
+        chosen = chosen[target]
+        labels = chosen.index
+
+        if cuts.get("normalize_phone", True) and t1_col.lower() in PHONE_COLS:
+            chosen = normalize_phone_series(chosen)
+
+        if cuts.get("split_street_house", True) and t1_col.lower() in STREET_COLS:
+            chosen, house = split_street_house_series(chosen)
+            for cand in HOUSE_COLS:
+                if cand in df1.columns:
+                    m = missing_mask_series(df1.loc[labels, cand]) & (house != "")
+                    df1.loc[m[m].index, cand] = house[m]
+                    engine.mark_dirty(m[m].index, cand)
+
+        df1.loc[labels, t1_col] = chosen
+        engine.mark_dirty(labels, t1_col)
+        filled[t1_col] = len(labels)
+
+    if cuts.get("fill_country_default", False) and "country" in df1.columns:
+        m = has_match & missing_mask_series(col("country"))
+        df1.loc[m[m].index, "country"] = country_default_value
+        engine.mark_dirty(m[m].index, "country")
+
+    if cuts.get("infer_state_from_zip", False) and "state" in df1.columns:
+        zip_col = next((c for c in ZIP_COLS if c in df1.columns), None)
+        m = has_match & missing_mask_series(col("state"))
+        if zip_col and m.any():
+            states = states_from_zip_de(df1.loc[m[m].index, zip_col]).dropna()
+            df1.loc[states.index, "state"] = states
+            engine.mark_dirty(states.index, "state")
+
+    return filled
@@ -0,0 +1,130 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from .settings import settings_path
+
+_CHUNK = 1024 * 1024
+_TS_FORMAT = "%Y-%m-%d_%H%M%S"
+
+@dataclass
+class BackupVersion:
+    ts: str  # _TS_FORMAT
+    sha256: str
+    size: int
+    mtime_ns: int
+
+def default_backup_dir() -> Path:
+    return settings_path().parent / "backups"
+
+class BackupStore:
+    # Inhalt liegt einmal unter objects/<sha256>; manifest.json: Quellpfad -> Versionen (alt -> neu)
+    def __init__(self, root: str | Path | None = None, keep_last: int = 20, max_age_days: int = 0):
+        self.root = Path(root) if root else default_backup_dir()
+        self.keep_last = keep_last
+        self.max_age_days = max_age_days
+
+    # ---------------- manifest ----------------
+    def _manifest_path(self) -> Path:
+        return self.root / "manifest.json"
+
+    def _read_manifest(self) -> dict[str, list[dict]]:
+        try:
+            return json.loads(self._manifest_path().read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    def _write_manifest(self, manifest: dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self._manifest_path().with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self._manifest_path())
+
+    def _object_path(self, sha256: str) -> Path:
+        return self.root / "objects" / sha256
+
+    @staticmethod
+    def _key(path: str | Path) -> str:
+        return str(Path(path).resolve())
+
+    # ---------------- API ----------------
+    def versions(self, path: str | Path) -> list[BackupVersion]:
+        return [BackupVersion(**v) for v in self._read_manifest().get(self._key(path), [])]
+
+    def backup(self, path: str | Path) -> BackupVersion:
+        path = Path(path)
+        st = path.stat()
+        manifest = self._read_manifest()
+        entries = manifest.setdefault(self._key(path), [])
+
+        # unverändert seit der letzten Sicherung: Inhalt nicht erneut lesen
+        last = entries[-1] if entries else None
+        if last and last["size"] == st.st_size and last["mtime_ns"] == st.st_mtime_ns and self._object_path(last["sha256"]).exists():
+            sha256 = last["sha256"]
+        else:
+            sha256 = self._store_object(path)
+
+        version = BackupVersion(datetime.now().strftime(_TS_FORMAT), sha256, st.st_size, st.st_mtime_ns)
+        entries.append(asdict(version))
+        self._apply_retention(manifest)
+        self._write_manifest(manifest)
+        self._collect_garbage(manifest)
+        return version
+
+    def restore(self, path: str | Path, version: BackupVersion, dest: str | Path | None = None) -> Path:
+        dest = Path(dest) if dest else Path(path)
+        src = self._object_path(version.sha256)
+        if not src.exists():
+            raise FileNotFoundError(f"Backup-Inhalt fehlt: {version.sha256}")
+        fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix=".restore")
+        with os.fdopen(fd, "wb") as out, open(src, "rb") as f:
+            shutil.copyfileobj(f, out, _CHUNK)
+        os.replace(tmp, dest)
+        return dest
+
+    # ---------------- internals ----------------
+    def _store_object(self, path: Path) -> str:
+        # in einem Durchgang kopieren und hashen; bekannter Inhalt wird verworfen
+        objects = self.root / "objects"
+        objects.mkdir(parents=True, exist_ok=True)
+        h = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(dir=objects, suffix=".partial")
+        try:
+            with os.fdopen(fd, "wb") as out, open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(_CHUNK), b""):
+                    h.update(chunk)
+                    out.write(chunk)
+            target = self._object_path(h.hexdigest())
+            if target.exists():
+                os.remove(tmp)
+            else:
+                os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return h.hexdigest()
+
+    def _apply_retention(self, manifest: dict) -> None:
+        cutoff = datetime.now() - timedelta(days=self.max_age_days) if self.max_age_days > 0 else None
+        for key, entries in manifest.items():
+            if self.keep_last > 0:
+                entries[:] = entries[-self.keep_last:]
+            if cutoff is not None:
+                # die jüngste Version bleibt immer erhalten
+                entries[:] = [e for e in entries[:-1] if datetime.strptime(e["ts"], _TS_FORMAT) >= cutoff] + entries[-1:]
+
+    def _collect_garbage(self, manifest: dict) -> None:
+        used = {e["sha256"] for entries in manifest.values() for e in entries}
+        objects = self.root / "objects"
+        if not objects.exists():
+            return
+        for f in objects.iterdir():
+            if f.name not in used and not f.name.endswith(".partial"):
+                f.unlink(missing_ok=True)
@@ -0,0 +1,262 @@
+from __future__ import annotations
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+import numpy as np
+import pandas as pd
+
+from .normalize import missing_mask_series
+
+# Kandidatensuche für T1-Zeilen ohne exakten KEY-Treffer in T2:
+# Blocking (PLZ, Namenspräfix, Telefon-Endziffern) + Trigramm-Index über den Namen,
+# Bewertung vektorisiert je Anfrage, große Läufe verteilt auf mehrere Prozesse.
+
+FIELDS = ("name", "street", "zip", "phone")
+WEIGHTS = {"name": 0.45, "street": 0.2, "zip": 0.15, "phone": 0.2}
+
+# Spaltennamen je Feld (klein geschrieben), falls keine Kopplung existiert
+FIELD_ALIASES = {
+    "name": ("uniquename", "kundenname", "name", "firma", "lastname", "nachname"),
+    "street": ("street", "straße", "strasse"),
+    "zip": ("zipcode", "plz", "postalcode"),
+    "phone": ("phonegeneral", "telefon", "phone", "festnetz", "mobilegeneral", "mobil"),
+}
+
+TOP_K = 5
+MIN_SCORE = 0.5
+NGRAM_CANDIDATES = 50  # je Anfrage: so viele T2-Zeilen mit den meisten gemeinsamen Trigrammen
+BLOCK_CAP = 200  # größere Blöcke (z. B. eine PLZ mit 5000 Zeilen) tragen nichts zur Auswahl bei
+PARALLEL_MIN_ROWS = 2000
+_CHUNK_ROWS = 1000
+
+_FOLD = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss", "é": "e", "è": "e"})
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_NAME_STOP_RE = re.compile(r"\b(?:dr|med|prof|dipl|herr|frau|praxis|gmbh|mbh|co|kg|ag|ug|und|e ?k|e ?v)\b")
+_STREET_RE = re.compile(r"(?:strasse|str)\b")
+_HOUSE_NO_RE = re.compile(r"\b\d+\s*[a-z]?\b")
+_PHONE_PREFIX_RE = re.compile(r"^(?:0049|49(?=\d{9,}))")
+
+# ---------------- Felder / Normalisierung ----------------
+def resolve_fields(t1_cols, t2_cols, col_links: dict[str, str] | None = None, key1: str | None = None, key2: str | None = None) -> dict[str, tuple[str, str]]:
+    # Feld -> (T1-Spalte, T2-Spalte); Kopplungen haben Vorrang vor Namensgleichheit
+    col_links = col_links or {}
+    lower2 = {str(c).lower(): c for c in t2_cols}
+    out: dict[str, tuple[str, str]] = {}
+    for field, aliases in FIELD_ALIASES.items():
+        c1 = next((c for c in t1_cols if str(c).lower() in aliases and c in col_links and col_links[c] in t2_cols), None)
+        if c1 is not None:
+            out[field] = (c1, col_links[c1])
+            continue
+        c1 = next((c for c in t1_cols if str(c).lower() in aliases), None)
+        c2 = next((lower2[a] for a in aliases if a in lower2), None)
+        if c1 is not None and c2 is not None:
+            out[field] = (c1, c2)
+    # Name: notfalls die KEY-Spalten (oft ist der KEY der Kundenname)
+    if "name" not in out and key1 and key2:
+        out["name"] = (key1, key2)
+    return out
+
+def _text(s: pd.Series) -> pd.Series:
+    s = s.where(~missing_mask_series(s), "").fillna("").astype(str).str.lower().str.translate(_FOLD)
+    return s.str.replace(_NON_ALNUM_RE, " ", regex=True)
+
+def _squash(s: pd.Series) -> pd.Series:
+    return s.str.replace(r"\s+", " ", regex=True).str.strip()
+
+def normalize_fields(df: pd.DataFrame, cols: dict[str, str]) -> pd.DataFrame:
+    # cols: Feld -> Spalte in df; fehlende Felder bleiben leer (name/street "", zip/phone -1)
+    empty = pd.Series("", index=df.index, dtype=object)
+    name = _squash(_text(df[cols["name"]]).str.replace(_NAME_STOP_RE, " ", regex=True)) if "name" in cols else empty
+    street = _squash(_text(df[cols["street"]]).str.replace(_STREET_RE, "str", regex=True).str.replace(_HOUSE_NO_RE, " ", regex=True)) if "street" in cols else empty
+
+    zip_ = pd.Series(-1, index=df.index, dtype=np.int64)
+    if "zip" in cols:
+        z = _text(df[cols["zip"]]).str.extract(r"(\d{5})", expand=False)
+        zip_ = pd.to_numeric(z, errors="coerce").fillna(-1).astype(np.int64)
+
+    phone = pd.Series(-1, index=df.index, dtype=np.int64)
+    if "phone" in cols:
+        d = _text(df[cols["phone"]]).str.replace(r"\D", "", regex=True)
+        d = d.str.replace(_PHONE_PREFIX_RE, "", regex=True).str.lstrip("0")
+        tail = d.str[-7:].where(d.str.len() >= 6)
+        phone = pd.to_numeric(tail, errors="coerce").fillna(-1).astype(np.int64)
+
+    return pd.DataFrame({"name": name.astype(object), "street": street.astype(object), "zip": zip_, "phone": phone}, index=df.index)
+
+def _grams(s: str) -> set[str]:
+    if not s:
+        return set()
+    s = f" {s} "
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+def _dice(a: set, b: set) -> float:
+    return 2.0 * len(a & b) / (len(a) + len(b)) if a and b else 0.0
+
+# ---------------- Index über T2 ----------------
+class CandidateIndex:
+    # Trigramm-Postings über den T2-Namen + Blöcke (PLZ, Namenspräfix, Telefon-Endziffern).
+    # Häufige Trigramme (über max_df der Zeilen) werden nicht indiziert.
+    def __init__(self, norm: pd.DataFrame, max_df: float = 0.02):
+        self.n = len(norm)
+        self.names = norm["name"].tolist()
+        self.streets = norm["street"].tolist()
+        self.zip = norm["zip"].to_numpy(dtype=np.int64)
+        self.phone = norm["phone"].to_numpy(dtype=np.int64)
+
+        vocab: dict[str, int] = {}
+        postings: list[list[int]] = []
+        gram_len = np.zeros(self.n, dtype=np.int32)
+        prefix: dict[str, list[int]] = {}
+        for row, name in enumerate(self.names):
+            grams = _grams(name)
+            gram_len[row] = len(grams)
+            for g in grams:
+                gid = vocab.get(g)
+                if gid is None:
+                    gid = vocab[g] = len(postings)
+                    postings.append([])
+                postings[gid].append(row)
+            if len(name) >= 4:
+                prefix.setdefault(name[:4], []).append(row)
+
+        cap = max(50, int(self.n * max_df))
+        self.vocab = {g: gid for g, gid in vocab.items() if len(postings[gid]) <= cap}
+        self.postings = {gid: np.asarray(postings[gid], dtype=np.int32) for gid in self.vocab.values()}
+        self.gram_len = gram_len
+        self.prefix = {k: np.asarray(v, dtype=np.int32) for k, v in prefix.items() if len(v) <= BLOCK_CAP}
+        self.by_zip = _blocks(self.zip)
+        self.by_phone = _blocks(self.phone)
+
+    @classmethod
+    def build(cls, df2: pd.DataFrame, cols: dict[str, str], max_df: float = 0.02) -> "CandidateIndex":
+        return cls(normalize_fields(df2, cols), max_df)
+
+    def query(self, name: str, street: str, zip_: int, phone: int, top_k: int = TOP_K, min_score: float = MIN_SCORE) -> list[tuple[int, float, float, float, float, float]]:
+        # -> [(t2_pos, score, name_sim, street_sim, zip_sim, phone_sim)], bestes zuerst
+        q_grams = _grams(name)
+        parts = [self.postings[self.vocab[g]] for g in q_grams if g in self.vocab]
+        if parts:
+            hits, shared = np.unique(np.concatenate(parts), return_counts=True)
+            if len(hits) > NGRAM_CANDIDATES:
+                keep = np.argpartition(-shared, NGRAM_CANDIDATES)[:NGRAM_CANDIDATES]
+                cand = [hits[keep]]
+            else:
+                cand = [hits]
+        else:
+            hits = shared = np.empty(0, dtype=np.int32)
+            cand = []
+        for block, k in ((self.by_zip, zip_), (self.by_phone, phone), (self.prefix, name[:4] if len(name) >= 4 else None)):
+            rows = block.get(k) if k is not None and k != -1 else None
+            if rows is not None:
+                cand.append(rows)
+        if not cand:
+            return []
+        cand = np.unique(np.concatenate(cand))
+
+        # Name: Dice über die gemeinsamen (indizierten) Trigramme
+        common = np.zeros(len(cand))
+        if len(hits):
+            pos = np.minimum(np.searchsorted(hits, cand), len(hits) - 1)
+            found = hits[pos] == cand
+            common[found] = shared[pos[found]]
+        c_len = self.gram_len[cand]
+        name_sim = np.where(c_len > 0, 2.0 * common / np.maximum(len(q_grams) + c_len, 1), 0.0)
+        name_ok = (c_len > 0) & bool(q_grams)
+
+        c_zip = self.zip[cand]
+        zip_ok = (c_zip >= 0) & (zip_ >= 0)
+        zip_sim = np.where(c_zip == zip_, 1.0, np.where(c_zip // 100 == zip_ // 100, 0.5, 0.0))
+        c_phone = self.phone[cand]
+        phone_ok = (c_phone >= 0) & (phone >= 0)
+        phone_sim = (c_phone == phone).astype(float)
+
+        w = WEIGHTS
+        num = w["name"] * name_sim * name_ok + w["zip"] * zip_sim * zip_ok + w["phone"] * phone_sim * phone_ok
+        den = w["name"] * name_ok + w["zip"] * zip_ok + w["phone"] * phone_ok
+
+        # Vorauswahl vektorisiert (Name nur über indizierte Trigramme); für die besten dann
+        # Name exakt und Straße per Python-Sets nachrechnen
+        pre = np.where(den > 0, num / np.maximum(den, 1e-9), 0.0)
+        top = np.argsort(-pre, kind="stable")[: top_k * 4]
+        q_street = _grams(street)
+        out = []
+        for i in top:
+            c = int(cand[i])
+            n, d = num[i] - w["name"] * name_sim[i] * name_ok[i], den[i]
+            name_exact = _dice(q_grams, _grams(self.names[c])) if name_ok[i] else 0.0
+            n += w["name"] * name_exact
+            street_sim = 0.0
+            c_street = self.streets[c]
+            if q_street and c_street:
+                street_sim = _dice(q_street, _grams(c_street))
+                n += w["street"] * street_sim
+                d += w["street"]
+            # nur ein Feld vorhanden (z. B. nur PLZ) reicht nicht für einen Kandidaten
+            if d < 0.3:
+                continue
+            score = n / d
+            if score >= min_score:
+                out.append((c, round(float(score), 4), round(name_exact, 4), round(street_sim, 4), float(zip_sim[i] * zip_ok[i]), float(phone_sim[i] * phone_ok[i])))
+        out.sort(key=lambda t: -t[1])
+        return out[:top_k]
+
+def _blocks(codes: np.ndarray) -> dict[int, np.ndarray]:
+    order = np.argsort(codes, kind="stable")
+    keys, starts, counts = np.unique(codes[order], return_index=True, return_counts=True)
+    return {int(k): order[s:s + c].astype(np.int32) for k, s, c in zip(keys, starts, counts) if k != -1 and c <= BLOCK_CAP}
+
+# ---------------- Suche (ein- oder mehrprozessig) ----------------
+CANDIDATE_COLUMNS = ["t1_label", "t2_pos", "score", "name", "street", "zip", "phone"]
+
+_worker_index: CandidateIndex | None = None
+
+def _init_worker(index: CandidateIndex) -> None:
+    global _worker_index
+    _worker_index = index
+
+def _query_rows(idx: CandidateIndex, labels, rows, top_k: int, min_score: float) -> list[tuple]:
+    out = []
+    for label, (name, street, zip_, phone) in zip(labels, rows):
+        out.extend((label, *hit) for hit in idx.query(name, street, int(zip_), int(phone), top_k, min_score))
+    return out
+
+def _query_chunk(args) -> list[tuple]:
+    # nur im Worker-Prozess: Index kommt über _init_worker, nicht mit jedem Chunk
+    return _query_rows(_worker_index, *args)
+
+def find_candidates(
+    index: CandidateIndex,
+    queries: pd.DataFrame,
+    top_k: int = TOP_K,
+    min_score: float = MIN_SCORE,
+    workers: int | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> pd.DataFrame:
+    # queries: normalize_fields(...) der T1-Zeilen; Ergebnis im Langformat (CANDIDATE_COLUMNS)
+    labels = queries.index.tolist()
+    rows = list(queries[list(FIELDS)].itertuples(index=False, name=None))
+    chunks = [(labels[i:i + _CHUNK_ROWS], rows[i:i + _CHUNK_ROWS], top_k, min_score) for i in range(0, len(rows), _CHUNK_ROWS)]
+    workers = workers or os.cpu_count() or 1
+    out: list[tuple] = []
+
+    if workers <= 1 or len(rows) < PARALLEL_MIN_ROWS:
+        for n, chunk in enumerate(chunks):
+            if progress:
+                progress(n * _CHUNK_ROWS, len(rows))
+            out.extend(_query_rows(index, *chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_init_worker, initargs=(index,)) as ex:
+            futures = [ex.submit(_query_chunk, c) for c in chunks]
+            try:
+                for n, f in enumerate(futures):
+                    if progress:
+                        progress(n * _CHUNK_ROWS, len(rows))
+                    out.extend(f.result())
+            except BaseException:
+                for f in futures:
+                    f.cancel()
+                raise
+    if progress:
+        progress(len(rows), len(rows))
+    return pd.DataFrame(out, columns=CANDIDATE_COLUMNS)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+from .autofill import PHONE_COLS
+from .matcher import MatchEngine
+from .normalize import missing_mask_series
+
+REPORT_COLUMNS = ["key", "label", "t1_col", "source", "t2_col", "n_values", "values"]
+
+@dataclass
+class ConflictReport:
+    table: pd.DataFrame  # REPORT_COLUMNS, eine Zeile je (KEY, Quelle, Spalte)
+    keys: list[str]  # KEYs mit Konflikten, meiste Konflikte zuerst
+
+    def columns_by_key(self) -> dict[str, list[str]]:
+        return self.table.groupby("key", sort=False)["t1_col"].agg(lambda s: list(dict.fromkeys(s))).to_dict()
+
+def _normalized(s: pd.Series, t1_col: str) -> pd.Series:
+    # Vergleichsform: fehlend -> NaN, Telefon nur Ziffern, sonst ohne Groß/klein und Mehrfach-Leerzeichen
+    txt = s.astype(object).where(~missing_mask_series(s)).astype("string")
+    if t1_col.lower() in PHONE_COLS:
+        txt = txt.str.replace(r"\D+", "", regex=True)
+    else:
+        txt = txt.str.strip().str.replace(r"\s+", " ", regex=True).str.lower()
+    return txt.where(txt != "")
+
+def _labels(engine: MatchEngine, keys: pd.Series) -> pd.Series:
+    # wie engine.key_label, aber in einem Schritt für alle KEYs (Rohwerte der ersten T1-Zeile)
+    if not engine.composite:
+        return keys
+    first = engine.df1.drop_duplicates("_KEY_").set_index("_KEY_")[engine.key1_cols]
+    raw = first.astype(object).where(first.notna(), "").astype(str).agg(" | ".join, axis=1)
+    return keys.map(raw).fillna(keys)
+
+def _join_distinct(keys: np.ndarray, values: np.ndarray) -> pd.Series:
+    # je KEY die verschiedenen Werte als "a | b" (Reihenfolge des ersten Auftretens), ohne Python-groupby
+    pairs = pd.DataFrame({"k": keys, "v": values}).drop_duplicates()
+    codes, uniq = pd.factorize(pairs["k"])
+    order = np.argsort(codes, kind="stable")
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    chunks = np.split(pairs["v"].to_numpy(object)[order], bounds)
+    return pd.Series([" | ".join(c) for c in chunks], index=uniq)
+
+def find_conflicts(engine: MatchEngine, col_links: dict[str, str], keys: list[str] | None = None) -> ConflictReport:
+    # je Quelle ein groupby-nunique über alle gekoppelten Spalten; nur KEYs, die in T1 vorkommen (oder keys)
+    wanted = pd.Index(keys if keys is not None else engine.df1["_KEY_"].dropna().unique(), dtype=object)
+    wanted = wanted[wanted != ""]
+    parts = []
+    for src in engine.sources:
+        links = {t1: t2 for t1, t2 in src.links(col_links).items() if t2 in src.df.columns and t1 not in engine.key1_cols}
+        if not links:
+            continue
+        df = src.df[src.df["_KEY_"].astype(object).isin(wanted)]
+        if df.empty:
+            continue
+        norm = pd.DataFrame({t1: _normalized(df[t2], t1) for t1, t2 in links.items()}, index=df.index)
+        key_obj = df["_KEY_"].astype(object)
+        norm["_KEY_"] = key_obj
+        counts = norm.groupby("_KEY_", sort=False).nunique()
+        hit = counts.stack()
+        hit = hit[hit > 1]
+        if hit.empty:
+            continue
+
+        # Rohwerte nur für die Konfliktfälle einsammeln (je Spalte ein groupby über die betroffenen KEYs)
+        for t1, keys_hit in hit.groupby(level=1, sort=False):
+            n = keys_hit.droplevel(1)
+            sel = (key_obj.isin(n.index) & norm[t1].notna()).to_numpy()
+            raw = df[links[t1]].astype(str).str.strip().to_numpy(object)
+            values = _join_distinct(key_obj.to_numpy()[sel], raw[sel])
+            parts.append(pd.DataFrame({"key": n.index, "t1_col": t1, "source": src.name, "t2_col": links[t1],
+                                       "n_values": n.to_numpy().astype(int), "values": values.reindex(n.index).to_numpy()}))
+
+    if not parts:
+        return ConflictReport(pd.DataFrame(columns=REPORT_COLUMNS), [])
+    table = pd.concat(parts, ignore_index=True)
+    per_key = table.groupby("key", sort=False).size().sort_values(ascending=False, kind="stable")
+    table.insert(1, "label", _labels(engine, table["key"]))
+    order = pd.Series(np.arange(len(per_key)), index=per_key.index)
+    table = table.iloc[np.lexsort((table.index.to_numpy(), table["key"].map(order).to_numpy()))].reset_index(drop=True)
+    return ConflictReport(table, per_key.index.tolist())
+
+def conflicts_first(queue: list[str], conflict_keys: list[str]) -> list[str]:
+    # Konflikt-KEYs nach vorn, sonst Reihenfolge der Queue unverändert
+    bad = set(conflict_keys)
+    return [k for k in queue if k in bad] + [k for k in queue if k not in bad]
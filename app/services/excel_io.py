@@ -1,25 +1,127 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 import pandas as pd
+from .table_cache import SidecarCache
+from .workbook_cache import RawWorkbook, WorkbookCache, frame_from_grid
+
+# Reihenfolge = Priorität; calamine (Rust) ist um ein Vielfaches schneller als openpyxl
+READ_ENGINES = ("calamine", "openpyxl")
 
 @dataclass
 class ExcelTable:
     path: Path
     sheet: str
     df: pd.DataFrame
+    header_row: int = 1
+    # Spalten wie in der Datei (Position i -> Excel-Spalte i+1); später ergänzte Spalten fehlen hier
+    source_columns: list[str] = field(default_factory=list)
+
+def available_read_engines() -> list[str]:
+    engines = []
+    try:
+        import python_calamine  # noqa: F401
+        engines.append("calamine")
+    except ImportError:
+        pass
+    try:
+        import openpyxl  # noqa: F401
+        engines.append("openpyxl")
+    except ImportError:
+        pass
+    return engines
+
+def _engines_for(engine: str | None) -> list[str]:
+    if engine:
+        if engine not in READ_ENGINES:
+            raise ValueError(f"Unbekannte Excel-Engine: {engine!r} (erlaubt: {', '.join(READ_ENGINES)})")
+        return [engine]
+    engines = available_read_engines()
+    if not engines:
+        raise ImportError("Weder python-calamine noch openpyxl ist installiert.")
+    return engines
+
+def _with_fallback(engine: str | None, fn):
+    # explizite Engine: Fehler direkt durchreichen; sonst nächste Engine versuchen
+    engines = _engines_for(engine)
+    for i, eng in enumerate(engines):
+        try:
+            return fn(eng)
+        except Exception:
+            if i == len(engines) - 1:
+                raise
+
+def _sheet_names(path: str, engine: str) -> list[str]:
+    # nur Workbook-Metadaten lesen, keine Zellen
+    if engine == "calamine":
+        from python_calamine import CalamineWorkbook
+        return list(CalamineWorkbook.from_path(str(path)).sheet_names)
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
 
-def list_sheets(path: str) -> list[str]:
-    xls = pd.ExcelFile(path, engine="openpyxl")
-    return xls.sheet_names
+def _drop_trailing_empty_columns(df: pd.DataFrame) -> pd.DataFrame:
+    # calamine liefert formatierte, aber leere Randspalten mit; openpyxl nicht
+    n = len(df.columns)
+    while n > 0 and str(df.columns[n - 1]).startswith("Unnamed: ") and df.iloc[:, n - 1].isna().all():
+        n -= 1
+    return df if n == len(df.columns) else df.iloc[:, :n]
 
-def load_table(path: str, sheet: str, header_row_1based: int) -> ExcelTable:
-    df = pd.read_excel(
+def _parse_workbook(path: str, engine: str | None) -> RawWorkbook:
+    # alle Sheets in einem Durchgang als Rohraster; Header wird erst beim Zugriff gewählt
+    return _with_fallback(engine, lambda eng: pd.read_excel(
         path,
-        sheet_name=sheet,
-        engine="openpyxl",
-        header=header_row_1based - 1,
+        sheet_name=None,
+        engine=eng,
+        header=None,
         dtype=str,  # wichtig: Kundennummer etc. als TEXT
-    )
+        keep_default_na=False,
+        na_values=[""],
+    ))
+
+def _read_workbook(path: str, engine: str | None) -> RawWorkbook:
+    # Sidecar-Snapshot ist nur Beschleunigung: Fehler dort dürfen das Laden nie verhindern
+    try:
+        wb = sidecar_cache.load(path)
+    except OSError:
+        wb = None
+    if wb is not None:
+        return wb
+    wb = _parse_workbook(path, engine)
+    try:
+        sidecar_cache.store(path, wb)
+    except OSError:
+        pass
+    return wb
+
+sidecar_cache = SidecarCache()
+workbook_cache = WorkbookCache(_read_workbook)
+
+def list_sheets(path: str, engine: str | None = None) -> list[str]:
+    # explizite Engine (z. B. Benchmark) liest immer selbst
+    cached = workbook_cache.peek(path) if engine is None else None
+    if cached is not None:
+        return list(cached)
+    return _with_fallback(engine, lambda eng: _sheet_names(path, eng))
+
+def load_table(path: str, sheet: str, header_row_1based: int, engine: str | None = None, use_cache: bool = True) -> ExcelTable:
+    # Cache nur ohne explizite Engine: ein Treffer sagt nichts darüber, womit gelesen wurde
+    if use_cache and engine is None:
+        wb = workbook_cache.get(path, engine)
+        if sheet not in wb:
+            raise ValueError(f"Worksheet named '{sheet}' not found")
+        df = frame_from_grid(wb[sheet], header_row_1based)
+    else:
+        df = _with_fallback(engine, lambda eng: pd.read_excel(
+            path,
+            sheet_name=sheet,
+            engine=eng,
+            header=header_row_1based - 1,
+            dtype=str,
+        ))
+    df = _drop_trailing_empty_columns(df)
     df.columns = [str(c).strip() for c in df.columns]
-    return ExcelTable(Path(path), sheet, df)
+    return ExcelTable(Path(path), sheet, df, header_row_1based, list(df.columns))
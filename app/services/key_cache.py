@@ -0,0 +1,113 @@
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+import pandas as pd
+
+from .matcher import MatchEngine
+
+DEFAULT_CAPACITY = 64
+DEFAULT_LOOKAHEAD = 8
+
+@dataclass
+class KeyView:
+    key: str
+    t1_labels: list  # alle T1-Zeilen mit diesem KEY (Tabellenreihenfolge)
+    t2_rows: pd.DataFrame
+    # Anzeige-Arrays je Spaltenposition von t2_rows (object), im Prefetch vorbereitet; das T2-Model
+    # übernimmt sie beim Binden, statt die Spalten beim ersten Zeichnen aus dem Frame zu holen
+    t2_arrays: dict[int, object]
+
+    @property
+    def t1_idx(self):
+        return self.t1_labels[0] if self.t1_labels else None
+
+class KeyViewCache:
+    # LRU über vorbereitete KEY-Ansichten; prefetch() bereitet die nächsten Keys der Queue in einem
+    # Hintergrund-Thread vor. KEY-Änderungen in T1 verwerfen die betroffenen Einträge (engine.on_keys_changed).
+    def __init__(self, engine: MatchEngine, capacity: int = DEFAULT_CAPACITY, lookahead: int = DEFAULT_LOOKAHEAD):
+        self.engine = engine
+        self.capacity = capacity
+        self.lookahead = lookahead
+        self._entries: OrderedDict[str, KeyView] = OrderedDict()
+        self._lock = threading.Lock()
+        self._gen = 0  # steigt bei jeder Invalidierung; ältere Prefetch-Ergebnisse werden verworfen
+        self._wanted: list[str] = []
+        self._wake = threading.Condition(self._lock)
+        self._closed = False
+        self._worker: threading.Thread | None = None
+        engine.on_keys_changed = self.invalidate
+        engine.t2_groups.indices  # Gruppen-Cache einmal im aufrufenden Thread anlegen, nicht parallel im Prefetch
+
+    def _build(self, key: str) -> KeyView:
+        t2 = self.engine.t2_rows_for_key(key)
+        arrays = {pos: t2.iloc[:, pos].to_numpy(dtype=object, copy=True) for pos in range(t2.shape[1])}
+        return KeyView(key, self.engine.t1_rows_for_key(key), t2, arrays)
+
+    def _put(self, view: KeyView) -> None:
+        self._entries[view.key] = view
+        self._entries.move_to_end(view.key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> KeyView:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None:
+                self._entries.move_to_end(key)
+                return hit
+            gen = self._gen
+        view = self._build(key)
+        with self._lock:
+            if gen == self._gen:
+                self._put(view)
+        return view
+
+    def invalidate(self, keys=None) -> None:
+        # keys=None: alles (z. B. Index neu aufgebaut)
+        with self._lock:
+            self._gen += 1
+            if keys is None:
+                self._entries.clear()
+            else:
+                for k in keys:
+                    self._entries.pop(k, None)
+
+    # ---------------- prefetch ----------------
+    def prefetch(self, queue: list[str], pos: int) -> None:
+        # die nächsten `lookahead` Keys ab pos (plus den vorigen) im Hintergrund vorbereiten
+        wanted = queue[pos + 1:pos + 1 + self.lookahead] + queue[max(pos - 1, 0):pos]
+        with self._lock:
+            self._wanted = [k for k in wanted if k not in self._entries]
+            if not self._wanted:
+                return
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="key-prefetch", daemon=True)
+                self._worker.start()
+            self._wake.notify()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._wanted = []
+            self._wake.notify()
+        self.engine.on_keys_changed = None
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._wanted and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+                key = self._wanted.pop(0)
+                if key in self._entries:
+                    continue
+                gen = self._gen
+            try:
+                view = self._build(key)
+            except Exception:
+                continue  # Prefetch ist nur Beschleunigung; get() baut bei Bedarf selbst
+            with self._lock:
+                if gen == self._gen and key not in self._entries:
+                    self._put(view)
@@ -1,37 +1,223 @@
 from __future__ import annotations
+from dataclasses import dataclass, field
+import threading
+import numpy as np
 import pandas as pd
-from .normalize import norm_key, is_missing
+from .normalize import KEY_MODES, norm_key, norm_key_series
+from .scanner import MissingScan, scan_missing
+
+@dataclass(frozen=True)
+class KeyPart:
+    col: str
+    mode: str = "text"  # siehe normalize.KEY_MODES
+
+KeySpec = str | list  # "Spalte", "PLZ,Nachname:lower" oder [str | KeyPart, ...]
+
+def parse_key_spec(spec: KeySpec) -> list[KeyPart]:
+    # "PLZ, Nachname:lower, Kundennr:digits" -> [KeyPart("PLZ"), KeyPart("Nachname", "lower"), ...]
+    items = spec.split(",") if isinstance(spec, str) else list(spec)
+    parts = []
+    for item in items:
+        if isinstance(item, KeyPart):
+            parts.append(item)
+            continue
+        col, sep, mode = str(item).strip().rpartition(":")
+        if not sep or mode not in KEY_MODES:
+            col, mode = str(item).strip(), "text"
+        parts.append(KeyPart(col.strip(), mode))
+    if not parts or any(not p.col for p in parts):
+        raise ValueError(f"Ungültige KEY-Angabe: {spec!r}")
+    return parts
+
+def build_keys(df: pd.DataFrame, parts: list[KeyPart], keep_zeros: bool = True) -> pd.Series:
+    # eine Spalte (text): wie bisher norm_key je Wert; sonst Teile einzeln normalisieren.
+    # Mehrere Teile -> 64-bit-Hash als 16 Hex-Zeichen (kompakt, schnelles groupby).
+    # Ein leerer Teil -> "" (kein KEY): sonst träfen sich z. B. alle Zeilen mit gleicher PLZ und ohne Nachnamen
+    if len(parts) == 1 and parts[0].mode == "text":
+        return df[parts[0].col].map(lambda x: norm_key(x, keep_zeros))
+    norm = pd.DataFrame({i: norm_key_series(df[p.col], p.mode, keep_zeros) for i, p in enumerate(parts)}, index=df.index)
+    if len(parts) == 1:
+        return norm[0]
+    empty = (norm == "").any(axis=1)
+    hashed = pd.util.hash_pandas_object(norm, index=False).to_numpy()
+    keys = pd.Series([f"{h:016x}" for h in hashed], index=df.index, dtype=object)
+    keys[empty.to_numpy()] = ""
+    return keys
+
+@dataclass
+class Source:
+    # eine Quelltabelle; col_links=None -> Kopplungen der Haupt-Quelle (soweit die Spalten existieren)
+    name: str
+    df: pd.DataFrame
+    key_parts: list[KeyPart]
+    col_links: dict[str, str] | None = None
+    groups: object = field(default=None, repr=False)
+
+    def links(self, default_links: dict[str, str]) -> dict[str, str]:
+        if self.col_links is not None:
+            return self.col_links
+        return {t1: t2 for t1, t2 in default_links.items() if t2 in self.df.columns}
 
 class MatchEngine:
-    def __init__(self, df1: pd.DataFrame, key1: str, df2: pd.DataFrame, key2: str, keep_zeros=True):
+    # key1/key2: eine Spalte oder zusammengesetzter KEY (siehe parse_key_spec); beide Seiten gleich viele Teile.
+    # df2 ist die Haupt-Quelle (sources[0]); weitere Quellen über add_source().
+    # dirty: schon vorhandene ungespeicherte Änderungen an df1 (z. B. vom vorigen Scan), gehen sonst beim Patch-Speichern verloren
+    def __init__(self, df1: pd.DataFrame, key1: KeySpec, df2: pd.DataFrame, key2: KeySpec, keep_zeros=True, source_name: str = "T2", dirty=None):
         self.df1 = df1
         self.df2 = df2
-        self.key1 = key1
-        self.key2 = key2
+        self.key1_parts = parse_key_spec(key1)
+        self.key2_parts = parse_key_spec(key2)
+        if len(self.key1_parts) != len(self.key2_parts):
+            raise ValueError("KEY in Tabelle 1 und Tabelle 2 braucht gleich viele Spalten.")
+        self.key1_cols = [p.col for p in self.key1_parts]
+        self.key2_cols = [p.col for p in self.key2_parts]
+        # erste KEY-Spalte (bei einfachem KEY die KEY-Spalte selbst)
+        self.key1 = self.key1_cols[0]
+        self.key2 = self.key2_cols[0]
         self.keep_zeros = keep_zeros
 
-        self.df1["_KEY_"] = self.df1[key1].map(lambda x: norm_key(x, keep_zeros))
-        self.df2["_KEY_"] = self.df2[key2].map(lambda x: norm_key(x, keep_zeros))
+        self.df1["_KEY_"] = build_keys(self.df1, self.key1_parts, keep_zeros)
+        self.df2["_KEY_"] = build_keys(self.df2, self.key2_parts, keep_zeros)
 
         self.t2_groups = self.df2.groupby("_KEY_", dropna=False)
+        self.sources: list[Source] = [Source(source_name, self.df2, self.key2_parts, None, self.t2_groups)]
+        # on_keys_changed(keys | None): KEY-Zuordnung in T1 geändert (None = alle), z. B. für KeyViewCache
+        self.on_keys_changed = None
+        # _t1_index wird lazy auch aus dem Prefetch-Thread (KeyViewCache) gefüllt, Änderungen kommen aus dem UI-Thread
+        self._t1_lock = threading.RLock()
+        self.rebuild_t1_index()
+
+        # seit dem Laden/Speichern geänderte T1-Zellen (Index-Label, Spalte) -> Grundlage für save_in_place
+        self.dirty: set[tuple] = set(dirty or ())
+
+    def add_source(self, name: str, df: pd.DataFrame, key: KeySpec, col_links: dict[str, str] | None = None) -> Source:
+        parts = parse_key_spec(key)
+        if len(parts) != len(self.key1_parts):
+            raise ValueError(f"KEY in Tabelle 1 und {name} braucht gleich viele Spalten.")
+        if any(s.name == name for s in self.sources):
+            raise ValueError(f"Quelle '{name}' ist bereits vorhanden.")
+        df["_KEY_"] = build_keys(df, parts, self.keep_zeros)
+        src = Source(name, df, parts, col_links, df.groupby("_KEY_", dropna=False))
+        self.sources.append(src)
+        return src
+
+    def source(self, name: str) -> Source:
+        return next(s for s in self.sources if s.name == name)
+
+    # ---------------- T1 key index ----------------
+    def rebuild_t1_index(self) -> None:
+        # KEY -> alle Index-Labels in T1 (Reihenfolge wie in der Tabelle). Nur Arrays (nach KEY sortierte
+        # Labels + Startpositionen); die Liste je KEY entsteht erst beim ersten Zugriff (_t1_rows)
+        codes, uniq = pd.factorize(self.df1["_KEY_"].to_numpy(object), use_na_sentinel=False)
+        order = np.argsort(codes, kind="stable")
+        with self._t1_lock:
+            self._t1_keys = pd.Index(uniq, dtype=object)
+            self._t1_labels = self.df1.index.to_numpy()[order]
+            self._t1_starts = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(uniq)))))
+            self._t1_index: dict[str, list] = {}  # bereits angefragte bzw. geänderte KEYs
+            self._t1_index_len = len(self.df1)
+        if self.on_keys_changed:
+            self.on_keys_changed(None)
+
+    def _ensure_t1_index(self) -> None:
+        if self._t1_index_len != len(self.df1):
+            self.rebuild_t1_index()
+
+    def _t1_rows(self, key) -> list:
+        # veränderbare Liste des KEYs (leer, wenn unbekannt); wird im Index gemerkt. Nur unter _t1_lock aufrufen
+        rows = self._t1_index.get(key)
+        if rows is None:
+            try:
+                pos = self._t1_keys.get_loc(key)
+            except KeyError:
+                rows = []
+            else:
+                rows = self._t1_labels[self._t1_starts[pos]:self._t1_starts[pos + 1]].tolist()
+            self._t1_index[key] = rows
+        return rows
+
+    def update_t1_key(self, idx) -> str:
+        # nach Änderung der Key-Spalte in Zeile idx: _KEY_ und Index nachziehen
+        self._ensure_t1_index()
+        old = self.df1.at[idx, "_KEY_"]
+        new = build_keys(self.df1.loc[[idx]], self.key1_parts, self.keep_zeros).iat[0]
+        if new == old:
+            return new
+        self.df1.at[idx, "_KEY_"] = new
+
+        pos = self.df1.index.get_loc
+        with self._t1_lock:
+            rows = self._t1_rows(old)
+            if idx in rows:
+                rows.remove(idx)
+            rows = self._t1_rows(new)
+            rows.append(idx)
+            rows.sort(key=pos)
+        if self.on_keys_changed:
+            self.on_keys_changed([old, new])
+        return new
+
+    # ---------------- T1 edits ----------------
+    def set_t1_value(self, idx, col: str, value) -> None:
+        self.df1.at[idx, col] = value
+        self.dirty.add((idx, col))
+        if col in self.key1_cols:
+            self.update_t1_key(idx)
+
+    def set_t1_values(self, cells: list[tuple]) -> None:
+        # Block-Update (Drag/Paste): cells = [(Index-Label, Spalte, Wert)], je Spalte eine Zuweisung
+        by_col: dict[str, tuple[list, list]] = {}
+        for idx, col, value in cells:
+            labels, values = by_col.setdefault(col, ([], []))
+            labels.append(idx)
+            values.append(value)
+        for col, (labels, values) in by_col.items():
+            self.df1.loc[labels, col] = values
+            self.mark_dirty(labels, col)
+        for idx in dict.fromkeys(idx for idx, col, _ in cells if col in self.key1_cols):
+            self.update_t1_key(idx)
+
+    def mark_dirty(self, labels, col: str) -> None:
+        self.dirty.update((idx, col) for idx in labels)
+
+    def scan_missing(self, columns_to_check: list[str]) -> MissingScan:
+        return scan_missing(self.df1, columns_to_check, "_KEY_")
 
     def keys_with_missing(self, columns_to_check: list[str]) -> list[str]:
-        keys = []
-        for _, row in self.df1.iterrows():
-            k = row["_KEY_"]
-            if not k:
-                continue
-            for col in columns_to_check:
-                if col in self.df1.columns and is_missing(row.get(col)):
-                    keys.append(k)
-                    break
-        return keys
+        return self.scan_missing(columns_to_check).keys
+
+    def t1_rows_for_key(self, key: str) -> list:
+        self._ensure_t1_index()
+        with self._t1_lock:
+            return list(self._t1_rows(key))
 
     def t1_row_index_for_key(self, key: str) -> int | None:
-        hit = self.df1.index[self.df1["_KEY_"] == key]
-        if len(hit) == 0:
-            return None
-        return int(hit[0])
+        self._ensure_t1_index()
+        with self._t1_lock:
+            hit = self._t1_rows(key)
+            return int(hit[0]) if hit else None
+
+    @property
+    def composite(self) -> bool:
+        return len(self.key1_parts) > 1
+
+    def key_label(self, key: str) -> str:
+        # Anzeige: bei zusammengesetztem KEY die Rohwerte der ersten Zeile statt des Hashs
+        if not self.composite:
+            return key
+        rows = self.t1_rows_for_key(key)
+        if rows:
+            vals = self.df1.loc[rows[0], self.key1_cols]
+        elif key in self.t2_groups.groups:
+            vals = self.df2.loc[self.t2_groups.groups[key][0], self.key2_cols]
+        else:
+            return key
+        return " | ".join("" if pd.isna(v) else str(v) for v in vals)
+
+    def t1_labels_without_match(self) -> list:
+        # T1-Zeilen, deren KEY in T2 nicht vorkommt (Kandidatensuche)
+        keys = self.df1["_KEY_"]
+        return self.df1.index[~keys.isin(self.t2_groups.groups.keys())].tolist()
 
     def t2_rows_for_key(self, key: str) -> pd.DataFrame:
         if key not in self.t2_groups.groups:
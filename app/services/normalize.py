@@ -1,10 +1,13 @@
 from __future__ import annotations
 import re
+import pandas as pd
+from pandas.api.types import is_scalar
 
 MISSING_TOKENS = {"", "nan", "none", "-", "n/a", "null"}
 
 def norm_text(v: str | None) -> str:
-    if v is None:
+    # NaN/pd.NA wie None (sonst würde ein leerer KEY zu "nan")
+    if v is None or (is_scalar(v) and pd.isna(v)):
         return ""
     s = str(v).strip()
     s = re.sub(r"\s+", " ", s)
@@ -16,6 +19,34 @@ def norm_key(v: str | None, keep_leading_zeros: bool = True) -> str:
         s = s.lstrip("0")
     return s
 
+KEY_MODES = ("text", "lower", "digits")
+
+def norm_key_series(s: pd.Series, mode: str = "text", keep_leading_zeros: bool = True) -> pd.Series:
+    # ein Teil eines zusammengesetzten KEYs: fehlend -> "", sonst wie norm_key;
+    # "lower": zusätzlich ohne Groß-/Kleinschreibung, "digits": nur Ziffern (z. B. "FIL-0042" -> "0042")
+    if mode not in KEY_MODES:
+        raise ValueError(f"Unbekannte KEY-Normalisierung: {mode}")
+    txt = s.astype(object).where(~missing_mask_series(s), "").astype(str)
+    txt = txt.str.strip().str.replace(r"\s+", " ", regex=True)
+    if mode == "lower":
+        txt = txt.str.lower()
+    elif mode == "digits":
+        txt = txt.str.replace(r"\D+", "", regex=True)
+    if not keep_leading_zeros:
+        txt = txt.str.lstrip("0")
+    return txt
+
 def is_missing(v: str | None) -> bool:
-    s = norm_text(v).lower()
-    return s in MISSING_TOKENS
+    # wie missing_mask_series: None/NaN/pd.NA/NaT oder ein Fehl-Token
+    # (innere Whitespaces sind für MISSING_TOKENS egal -> kein Regex nötig)
+    if v is None or (is_scalar(v) and pd.isna(v)):
+        return True
+    return str(v).strip().lower() in MISSING_TOKENS
+
+def missing_mask_series(s: pd.Series) -> pd.Series:
+    # spaltenweise Variante von is_missing (NaN/None -> fehlend)
+    txt = s.astype(str).str.strip().str.lower()
+    return s.isna() | txt.isin(MISSING_TOKENS)
+
+def missing_mask(df: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({c: missing_mask_series(df[c]) for c in df.columns}, index=df.index)
@@ -0,0 +1,20 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import pandas as pd
+from .normalize import missing_mask
+
+@dataclass
+class MissingScan:
+    keys: list[str]
+    row_counts: pd.Series  # fehlende Zellen je Zeile (Index wie df)
+    col_counts: pd.Series  # fehlende Zellen je Spalte
+
+def scan_missing(df: pd.DataFrame, columns: list[str], key_col: str = "_KEY_") -> MissingScan:
+    cols = [c for c in dict.fromkeys(columns) if c in df.columns]
+    mask = missing_mask(df[cols])
+    row_counts = mask.sum(axis=1)
+    col_counts = mask.sum(axis=0)
+
+    has_key = df[key_col].fillna("").astype(str) != ""
+    keys = df.loc[has_key & (row_counts > 0), key_col].tolist()
+    return MissingScan(keys, row_counts, col_counts)
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
+import tempfile
+import threading
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Dict, List
 
+SAVE_DELAY_S = 0.5
+
+log = logging.getLogger(__name__)
+
 @dataclass
 class AppSettings:
     col_links: Dict[str, str]
@@ -18,6 +26,12 @@ class AppSettings:
     t1_order: List[str]
     t2_order: List[str]
 
+    backup_keep_last: int  # 0 = unbegrenzt
+    backup_max_age_days: int  # 0 = unbegrenzt
+
+    source_priority: Dict[str, List[str]]  # T1-Spalte -> Quellnamen ("datei.xlsx [Sheet]") in Vorrang-Reihenfolge
+    conflicts_first: bool  # KEYs mit widersprüchlichen Quellwerten nach dem Scan zuerst
+
     @staticmethod
     def defaults() -> "AppSettings":
         return AppSettings(
@@ -35,6 +49,10 @@ class AppSettings:
             t2_colors={},
             t1_order=[],
             t2_order=[],
+            backup_keep_last=20,
+            backup_max_age_days=0,
+            source_priority={},
+            conflicts_first=False,
         )
 
 def settings_path() -> Path:
@@ -42,8 +60,15 @@ def settings_path() -> Path:
     base.mkdir(parents=True, exist_ok=True)
     return base / "settings.json"
 
-def load_settings() -> AppSettings:
-    p = settings_path()
+def _int_or(value, default: int) -> int:
+    # null, "" oder kaputte Werte in settings.json -> Standard statt Absturz beim Start
+    try:
+        return int(value if value not in (None, "") else default)
+    except (TypeError, ValueError):
+        return default
+
+def load_settings(path: str | Path | None = None) -> AppSettings:
+    p = Path(path) if path else settings_path()
     if not p.exists():
         return AppSettings.defaults()
     try:
@@ -62,8 +87,77 @@ def load_settings() -> AppSettings:
         t2_colors=dict(data.get("t2_colors", d.t2_colors) or {}),
         t1_order=list(data.get("t1_order", d.t1_order) or []),
         t2_order=list(data.get("t2_order", d.t2_order) or []),
+        backup_keep_last=_int_or(data.get("backup_keep_last"), d.backup_keep_last),
+        backup_max_age_days=_int_or(data.get("backup_max_age_days"), d.backup_max_age_days),
+        source_priority={k: list(v) for k, v in (data.get("source_priority", d.source_priority) or {}).items()},
+        conflicts_first=bool(data.get("conflicts_first", d.conflicts_first)),
     )
 
-def save_settings(s: AppSettings) -> None:
-    p = settings_path()
-    p.write_text(json.dumps(asdict(s), ensure_ascii=False, indent=2), encoding="utf-8")
+def _write_atomic(p: Path, data: dict) -> None:
+    # erst Temp-Datei im selben Verzeichnis, dann umbenennen: settings.json ist nie halb geschrieben
+    fd, tmp = tempfile.mkstemp(dir=p.parent, prefix=f".{p.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, p)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+def save_settings(s: AppSettings, path: str | Path | None = None) -> None:
+    _write_atomic(Path(path) if path else settings_path(), asdict(s))
+
+class SettingsStore:
+    # Änderungen nur vormerken; ein Timer-Thread schreibt nach delay_s gebündelt den jeweils letzten Stand.
+    # Header ziehen über 40 Positionen = ein Schreibvorgang statt 40, und nicht im UI-Thread.
+    def __init__(self, path: str | Path | None = None, delay_s: float = SAVE_DELAY_S):
+        self.path = Path(path) if path else settings_path()
+        self.delay_s = delay_s
+        self._pending: dict | None = None
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def mark_dirty(self, s: AppSettings) -> None:
+        snapshot = asdict(s)  # tiefe Kopie, spätere Änderungen im UI betreffen sie nicht
+        with self._lock:
+            self._pending = snapshot
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay_s, self._write_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+
+    @property
+    def dirty(self) -> bool:
+        return self._pending is not None
+
+    def flush(self) -> None:
+        # synchron, z. B. in closeEvent
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._write_pending()
+
+    def _write_in_background(self) -> None:
+        # Fehler nicht im Timer-Thread versanden lassen; der Stand bleibt vorgemerkt (nächstes mark_dirty/flush)
+        try:
+            self._write_pending()
+        except Exception:
+            log.exception("Einstellungen konnten nicht gespeichert werden: %s", self.path)
+
+    def _write_pending(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                data, self._pending = self._pending, None
+                self._timer = None
+            if data is None:
+                return
+            try:
+                _write_atomic(self.path, data)
+            except BaseException:
+                with self._lock:
+                    if self._pending is None:  # neuerer Stand hat Vorrang
+                        self._pending = data
+                raise
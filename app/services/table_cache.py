@@ -0,0 +1,140 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from threading import Lock
+import pandas as pd
+
+from .settings import settings_path
+from .workbook_cache import RawWorkbook, file_signature
+
+DEFAULT_DISK_BUDGET_BYTES = 1024 * 1024 * 1024
+_HASH_CHUNK = 1024 * 1024
+
+def default_cache_dir() -> Path:
+    return settings_path().parent / "table_cache"
+
+def arrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def content_hash(path: str | Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+class SidecarCache:
+    # Feather-Snapshots der Rohraster je Sheet, Verzeichnis = SHA-256 des Dateiinhalts.
+    # index.json merkt sich (Pfad, mtime, Größe) -> Hash, damit unveränderte Dateien nicht neu gehasht werden.
+    def __init__(self, root: str | Path | None = None, budget_bytes: int = DEFAULT_DISK_BUDGET_BYTES):
+        self.root = Path(root) if root else default_cache_dir()
+        self.budget_bytes = budget_bytes
+        self._lock = Lock()
+
+    # ---------------- index ----------------
+    def _index_path(self) -> Path:
+        return self.root / "index.json"
+
+    def _read_index(self) -> dict:
+        try:
+            return json.loads(self._index_path().read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    def _write_index(self, index: dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self._index_path().with_suffix(".tmp")
+        tmp.write_text(json.dumps(index, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self._index_path())
+
+    def _hash_for(self, path: str | Path) -> str:
+        p, mtime, size = file_signature(path)
+        with self._lock:
+            hit = self._read_index().get(p)
+        if hit and hit.get("mtime_ns") == mtime and hit.get("size") == size:
+            return hit["sha256"]
+
+        digest = content_hash(path)
+        with self._lock:
+            index = self._read_index()
+            old = index.get(p, {}).get("sha256")
+            index[p] = {"mtime_ns": mtime, "size": size, "sha256": digest}
+            self._write_index(index)
+            # veralteter Snapshot: weg, sofern keine andere Datei denselben Inhalt hat
+            if old and old != digest and all(e.get("sha256") != old for e in index.values()):
+                shutil.rmtree(self.root / old, ignore_errors=True)
+        return digest
+
+    # ---------------- load / store ----------------
+    def load(self, path: str | Path) -> RawWorkbook | None:
+        if not arrow_available():
+            return None
+        snap = self.root / self._hash_for(path)
+        manifest = snap / "manifest.json"
+        if not manifest.exists():
+            return None
+        try:
+            sheets = json.loads(manifest.read_text(encoding="utf-8"))["sheets"]
+            wb: RawWorkbook = {}
+            for i, name in enumerate(sheets):
+                grid = pd.read_feather(snap / f"{i}.feather")
+                grid.columns = range(len(grid.columns))
+                wb[name] = grid
+        except Exception:
+            shutil.rmtree(snap, ignore_errors=True)
+            return None
+        os.utime(snap)  # für LRU-Aufräumen
+        return wb
+
+    def store(self, path: str | Path, wb: RawWorkbook) -> None:
+        if not arrow_available():
+            return
+        digest = self._hash_for(path)
+        snap = self.root / digest
+        tmp = self.root / f"{digest}.partial"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        try:
+            for i, grid in enumerate(wb.values()):
+                out = grid.copy(deep=False)
+                out.columns = [str(c) for c in range(len(out.columns))]
+                out.reset_index(drop=True).to_feather(tmp / f"{i}.feather")
+            (tmp / "manifest.json").write_text(json.dumps({"source": str(path), "sheets": list(wb)}, ensure_ascii=False), encoding="utf-8")
+            shutil.rmtree(snap, ignore_errors=True)
+            os.replace(tmp, snap)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        self.prune()
+
+    # ---------------- size bound ----------------
+    def _snapshots(self) -> list[tuple[float, int, Path]]:
+        out = []
+        if not self.root.exists():
+            return out
+        for d in self.root.iterdir():
+            if d.is_dir() and not d.name.endswith(".partial"):
+                size = sum(f.stat().st_size for f in d.iterdir() if f.is_file())
+                out.append((d.stat().st_mtime, size, d))
+        return out
+
+    def size_bytes(self) -> int:
+        return sum(size for _, size, _ in self._snapshots())
+
+    def prune(self) -> None:
+        snaps = sorted(self._snapshots())
+        total = sum(size for _, size, _ in snaps)
+        while len(snaps) > 1 and total > self.budget_bytes:
+            _, size, d = snaps.pop(0)
+            shutil.rmtree(d, ignore_errors=True)
+            total -= size
+
+    def clear(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
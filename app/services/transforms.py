@@ -1,48 +1,96 @@
+import csv
 import re
+from pathlib import Path
 from typing import Optional, Tuple
 
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_scalar
+
+_STREET_HOUSE_RE = re.compile(r"^(.*?)(?:\s+)(\d+[a-zA-Z]?(?:[-/]\d+[a-zA-Z]?)?)\s*$")
+_NON_DIGITS_RE = re.compile(r"\D+")
+
+def _is_na(value) -> bool:
+    # None/NaN/pd.NA wie in den Series-Varianten (fillna("")) als leer behandeln
+    return value is None or (is_scalar(value) and pd.isna(value))
+
 def split_street_house(value: str) -> Tuple[str, str]:
-    if value is None:
+    if _is_na(value):
         return "", ""
     s = str(value).strip()
     if not s:
         return "", ""
-    m = re.match(r"^(.*?)(?:\s+)(\d+[a-zA-Z]?(?:[-/]\d+[a-zA-Z]?)?)\s*$", s)
+    m = _STREET_HOUSE_RE.match(s)
     if not m:
         return s, ""
     return m.group(1).strip(), m.group(2).strip()
 
+def split_street_house_series(values: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    # spaltenweise Variante von split_street_house (NaN wie None)
+    s = values.fillna("").astype(str).str.strip()
+    parts = s.str.extract(_STREET_HOUSE_RE)
+    matched = parts[1].notna()
+    street = parts[0].str.strip().where(matched, s)
+    house = parts[1].str.strip().where(matched, "")
+    return street, house
+
 def normalize_phone(value: str) -> str:
-    if value is None:
+    if _is_na(value):
         return ""
     s = str(value).strip()
     if not s:
         return ""
     plus = s.startswith("+")
-    digits = re.sub(r"\D+", "", s)
+    digits = _NON_DIGITS_RE.sub("", s)
     return ("+" + digits) if plus else digits
 
-def state_from_zip_de(zip_code: str) -> Optional[str]:
-    try:
-        import pgeocode
-    except Exception:
-        return None
+def normalize_phone_series(values: pd.Series) -> pd.Series:
+    # spaltenweise Variante von normalize_phone (NaN wie None)
+    s = values.fillna("").astype(str).str.strip()
+    digits = s.str.replace(_NON_DIGITS_RE, "", regex=True)
+    return digits.where(~s.str.startswith("+"), "+" + digits)
+
+PLZ_TABLE_PATH = Path(__file__).resolve().parent.parent / "data" / "plz_bundesland.csv"
+
+_plz_table: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+def _load_plz_table() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # PLZ-Bereiche (sortiert, nicht überlappend) -> Bundesland; einmal pro Prozess laden.
+    # An Landesgrenzen sind die Bereiche je PLZ aufgeteilt (z. B. 88131 Lindau = Bayern mitten in 88xxx)
+    global _plz_table
+    if _plz_table is None:
+        with open(PLZ_TABLE_PATH, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        _plz_table = (
+            np.array([int(r["plz_from"]) for r in rows], dtype=np.int64),
+            np.array([int(r["plz_to"]) for r in rows], dtype=np.int64),
+            np.array([r["state"] for r in rows], dtype=object),
+        )
+    return _plz_table
 
+def states_from_zip_de(zip_codes: pd.Series) -> pd.Series:
+    starts, ends, states = _load_plz_table()
+    digits = zip_codes.astype(str).str.replace(_NON_DIGITS_RE, "", regex=True)
+    valid = zip_codes.notna() & (digits.str.len() == 5)
+    z = pd.to_numeric(digits.where(valid), errors="coerce").fillna(-1).to_numpy(dtype=np.int64)
+
+    pos = np.searchsorted(starts, z, side="right") - 1
+    pos_c = pos.clip(0)
+    hit = valid.to_numpy() & (pos >= 0) & (z <= ends[pos_c])
+
+    out = np.full(len(z), None, dtype=object)
+    out[hit] = states[pos_c[hit]]
+    return pd.Series(out, index=zip_codes.index, dtype=object)
+
+def state_from_zip_de(zip_code: str) -> Optional[str]:
     if not zip_code:
         return None
-    z = re.sub(r"\D+", "", str(zip_code))
+    z = _NON_DIGITS_RE.sub("", str(zip_code))
     if len(z) != 5:
         return None
 
-    nomi = pgeocode.Nominatim("de")
-    r = nomi.query_postal_code(z)
-
-    state = getattr(r, "state_name", None)
-    if isinstance(state, str) and state.strip():
-        return state.strip()
-
-    state2 = getattr(r, "state", None)
-    if isinstance(state2, str) and state2.strip():
-        return state2.strip()
-
-    return None
+    starts, ends, states = _load_plz_table()
+    i = int(np.searchsorted(starts, int(z), side="right")) - 1
+    if i < 0 or int(z) > ends[i]:
+        return None
+    return states[i]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Callable
+import pandas as pd
+
+DEFAULT_BUDGET_BYTES = 512 * 1024 * 1024
+
+# Standard-NA-Werte von pd.read_excel (keep_default_na=True), damit Cache und Direktlesen dieselben Zellen
+# als NaN liefern. Bewusst nicht normalize.MISSING_TOKENS: "-" o. ä. bleibt beim Laden Text.
+READ_NA_VALUES = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+
+# sheet -> Rohraster (header=None, dtype=str, nur leere Zellen als NaN), so wie es aus der Datei kommt
+RawWorkbook = dict[str, pd.DataFrame]
+
+def file_signature(path: str | Path) -> tuple[str, int, int]:
+    p = Path(path).resolve()
+    st = p.stat()
+    return str(p), st.st_mtime_ns, st.st_size
+
+def _grid_bytes(grid: pd.DataFrame) -> int:
+    return int(grid.memory_usage(index=True, deep=True).sum())
+
+def _dedup_names(names: list) -> list:
+    # gleiche Regel wie pandas: "a", "a" -> "a", "a.1"
+    counts: dict = {}
+    out = []
+    for col in names:
+        cur = counts.get(col, 0)
+        while cur > 0:
+            counts[col] = cur + 1
+            col = f"{col}.{cur}"
+            cur = counts.get(col, 0)
+        out.append(col)
+        counts[col] = cur + 1
+    return out
+
+def frame_from_grid(grid: pd.DataFrame, header_row_1based: int) -> pd.DataFrame:
+    h = header_row_1based - 1
+    if h < 0 or (h >= len(grid) and len(grid.columns) > 0):
+        raise ValueError(f"Header-Zeile {header_row_1based} liegt außerhalb des Sheets ({len(grid)} Zeilen).")
+    if len(grid.columns) == 0:
+        return pd.DataFrame()
+
+    header = grid.iloc[h].tolist()
+    names = [f"Unnamed: {i}" if pd.isna(v) else v for i, v in enumerate(header)]
+    df = grid.iloc[h + 1:].reset_index(drop=True)
+    # pandas wertet "nan", "NULL", "n/a" ... nur unterhalb des Headers als NaN
+    df = df.mask(df.isin(READ_NA_VALUES))
+    df.columns = _dedup_names(names)
+    return df
+
+class WorkbookCache:
+    # LRU über geparste Workbooks, Schlüssel = (Pfad, mtime, Größe), begrenzt per Speicherbudget
+    def __init__(self, loader: Callable[[str, str | None], RawWorkbook], budget_bytes: int = DEFAULT_BUDGET_BYTES):
+        self._loader = loader
+        self.budget_bytes = budget_bytes
+        self._entries: OrderedDict[tuple, tuple[RawWorkbook, int]] = OrderedDict()
+        self._used = 0
+        self._lock = Lock()
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used
+
+    def peek(self, path: str | Path) -> RawWorkbook | None:
+        sig = file_signature(path)
+        with self._lock:
+            hit = self._entries.get(sig)
+            if hit is None:
+                return None
+            self._entries.move_to_end(sig)
+            return hit[0]
+
+    def get(self, path: str | Path, engine: str | None = None) -> RawWorkbook:
+        hit = self.peek(path)
+        if hit is not None:
+            return hit
+
+        sig = file_signature(path)
+        wb = self._loader(str(path), engine)
+        size = sum(_grid_bytes(g) for g in wb.values())
+
+        with self._lock:
+            # ältere Stände derselben Datei verwerfen
+            for old in [k for k in self._entries if k[0] == sig[0]]:
+                self._drop(old)
+            self._entries[sig] = (wb, size)
+            self._used += size
+            while self._used > self.budget_bytes and len(self._entries) > 1:
+                self._drop(next(iter(self._entries)))
+        return wb
+
+    def invalidate(self, path: str | Path) -> None:
+        p = str(Path(path).resolve())
+        with self._lock:
+            for old in [k for k in self._entries if k[0] == p]:
+                self._drop(old)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._used = 0
+
+    def _drop(self, sig: tuple) -> None:
+        _, size = self._entries.pop(sig)
+        self._used -= size
@@ -1,10 +1,14 @@
 from __future__ import annotations
 from dataclasses import dataclass
+import pandas as pd
 from PySide6.QtWidgets import (
-    QDialog, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
-    QHBoxLayout, QPushButton, QComboBox, QCheckBox, QLineEdit, QMessageBox
+    QDialog, QVBoxLayout, QLabel, QTableView, QHBoxLayout, QPushButton, QComboBox,
+    QMessageBox, QStyledItemDelegate, QAbstractItemView
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtGui import QBrush, QColor
+
+from app.ui.table_models import DataFrameModel
 
 @dataclass
 class ProposedChange:
@@ -14,6 +18,129 @@ class ProposedChange:
     new_value: str
     source_info: str
 
+# Layout je T2-Spalte: Use | Value | Target | Mode | Manual
+_KINDS = ("use", "value", "target", "mode", "manual")
+_MODES = ["1:1", "manuell"]
+_MANUAL_HINT = "nur bei 'manuell' relevant"
+
+_USE_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+_VALUE_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+_CHOICE_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+class _ChoiceModel(QAbstractTableModel):
+    # T2-Werte einmal als Strings; Auswahl (Use/Ziel/Modus/Manuell) nur für angefasste Zellen gespeichert.
+    # Zelle (r, i) = Zeile r, i-te T2-Spalte.
+    def __init__(self, t2_df: pd.DataFrame, parent=None):
+        super().__init__(parent)
+        self.t2_cols = [c for c in t2_df.columns if c != "_KEY_"]
+        vals = t2_df[self.t2_cols].astype(object)
+        self._values = vals.where(vals.notna(), "").astype(str).to_numpy()
+        self.use: set[tuple[int, int]] = set()
+        self.target: dict[tuple[int, int], str] = {}
+        self.mode: dict[tuple[int, int], str] = {}
+        self.manual: dict[tuple[int, int], str] = {}
+
+    @staticmethod
+    def kind(col: int) -> str:
+        return _KINDS[col % 5]
+
+    def value(self, r: int, i: int) -> str:
+        return self._values[r, i]
+
+    def longest_value(self, i: int) -> str:
+        col = self._values[:, i]
+        return max(col, key=len) if len(col) else ""
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._values)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else 5 * len(self.t2_cols)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        kind, cell = self.kind(index.column()), (index.row(), index.column() // 5)
+        if kind == "use":
+            return (Qt.Checked if cell in self.use else Qt.Unchecked) if role == Qt.CheckStateRole else None
+        if role not in (Qt.DisplayRole, Qt.EditRole):
+            if kind == "manual" and cell not in self.manual:
+                if role == Qt.ForegroundRole:
+                    return QBrush(QColor("#808080"))
+                if role == Qt.ToolTipRole:
+                    return _MANUAL_HINT
+            return None
+        if kind == "value":
+            return self._values[cell]
+        if kind == "target":
+            return self.target.get(cell, "")
+        if kind == "mode":
+            return self.mode.get(cell, _MODES[0])
+        text = self.manual.get(cell)
+        return text if text is not None or role == Qt.EditRole else _MANUAL_HINT
+
+    def setData(self, index: QModelIndex, value, role=Qt.EditRole) -> bool:
+        if not index.isValid():
+            return False
+        kind, cell = self.kind(index.column()), (index.row(), index.column() // 5)
+        if kind == "use" and role == Qt.CheckStateRole:
+            if Qt.CheckState(value) == Qt.Checked:
+                self.use.add(cell)
+            else:
+                self.use.discard(cell)
+        elif kind in ("target", "mode", "manual") and role == Qt.EditRole:
+            store = getattr(self, kind)
+            text = "" if value is None else str(value)
+            if text:
+                store[cell] = text
+            else:
+                store.pop(cell, None)
+        else:
+            return False
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        kind = self.kind(index.column())
+        return _USE_FLAGS if kind == "use" else _VALUE_FLAGS if kind == "value" else _CHOICE_FLAGS
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Vertical:
+            return str(section + 1)
+        t2c = self.t2_cols[section // 5]
+        return {"use": f"Use {t2c}", "value": f"Value {t2c}", "target": "→ T1-Spalte", "mode": "Mode", "manual": "Manuell"}[self.kind(section)]
+
+class _ChoiceDelegate(QStyledItemDelegate):
+    # Combo-Editoren erst beim Bearbeiten einer Zelle; Manuell nutzt den Standard-Editor (QLineEdit)
+    def __init__(self, t1_columns: list[str], parent=None):
+        super().__init__(parent)
+        self._items = {"target": [""] + list(t1_columns), "mode": _MODES}
+
+    def createEditor(self, parent, option, index):
+        items = self._items.get(_ChoiceModel.kind(index.column()))
+        if items is None:
+            return super().createEditor(parent, option, index)
+        dd = QComboBox(parent)
+        dd.addItems(items)
+        dd.activated.connect(lambda _=0, dd=dd: (self.commitData.emit(dd), self.closeEditor.emit(dd)))
+        return dd
+
+    def setEditorData(self, editor, index):
+        if isinstance(editor, QComboBox):
+            editor.setCurrentIndex(max(editor.findText(index.data(Qt.EditRole) or ""), 0))
+        else:
+            super().setEditorData(editor, index)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QComboBox):
+            model.setData(index, editor.currentText(), Qt.EditRole)
+        else:
+            super().setModelData(editor, model, index)
+
 class DetailDialog(QDialog):
     def __init__(self, key: str, t1_row_index: int, t1_row: dict, t2_df, t1_columns: list[str], parent=None):
         super().__init__(parent)
@@ -28,16 +155,17 @@ class DetailDialog(QDialog):
         root = QVBoxLayout(self)
 
         root.addWidget(QLabel("Tabelle 1 – aktuelle Zeile"))
-        self.t1_table = QTableWidget(1, len(t1_columns))
-        self.t1_table.setHorizontalHeaderLabels(t1_columns)
-        for c, col in enumerate(t1_columns):
-            v = "" if t1_row.get(col) is None else str(t1_row.get(col))
-            self.t1_table.setItem(0, c, QTableWidgetItem(v))
-        self.t1_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.t1_model = DataFrameModel(hidden_columns=(), editable=False, parent=self)
+        self.t1_model.set_frame(pd.DataFrame([[t1_row.get(c) for c in t1_columns]], columns=t1_columns, dtype=object))
+        self.t1_table = QTableView()
+        self.t1_table.setModel(self.t1_model)
+        self.t1_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         root.addWidget(self.t1_table)
 
         root.addWidget(QLabel("Tabelle 2 – passende Zeile(n) (pro Zelle auswählbar)"))
-        self.t2_table = QTableWidget(0, 0)
+        self.t2_table = QTableView()
+        self.t2_table.setItemDelegate(_ChoiceDelegate(t1_columns, self.t2_table))
+        self.t2_table.setEditTriggers(QAbstractItemView.CurrentChanged | QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed)
         root.addWidget(self.t2_table)
 
         self.btn_apply = QPushButton("Auswahl in Änderungs-Liste übernehmen")
@@ -53,92 +181,51 @@ class DetailDialog(QDialog):
         self.build_t2_table()
 
     def build_t2_table(self):
-        # Spalten: pro T2-Spalte ein Block: [Use?] [T2 value] [Target(T1)] [Mode] [ManualValue]
-        t2_cols = [c for c in self.t2_df.columns if c != "_KEY_"]
-
-        headers = []
-        self.col_meta = []  # (t2_col, kind)
-        # Layout je T2-Spalte: Use | Value | Target | Mode | Manual
-        for t2c in t2_cols:
-            headers += [f"Use {t2c}", f"Value {t2c}", f"→ T1-Spalte", "Mode", "Manuell"]
-            self.col_meta += [(t2c, "use"), (t2c, "value"), (t2c, "target"), (t2c, "mode"), (t2c, "manual")]
-
-        self.t2_table.setColumnCount(len(headers))
-        self.t2_table.setHorizontalHeaderLabels(headers)
-        self.t2_table.setRowCount(len(self.t2_df))
-
-        for r in range(len(self.t2_df)):
-            row = self.t2_df.iloc[r]
-            for c, (t2c, kind) in enumerate(self.col_meta):
-                if kind == "use":
-                    cb = QCheckBox()
-                    cb.setChecked(False)
-                    cb.setStyleSheet("margin-left:6px;")
-                    self.t2_table.setCellWidget(r, c, cb)
-
-                elif kind == "value":
-                    v = "" if row.get(t2c) is None else str(row.get(t2c))
-                    item = QTableWidgetItem(v)
-                    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                    self.t2_table.setItem(r, c, item)
-
-                elif kind == "target":
-                    dd = QComboBox()
-                    dd.addItem("")  # leer = noch kein Ziel
-                    dd.addItems(self.t1_columns)
-                    self.t2_table.setCellWidget(r, c, dd)
-
-                elif kind == "mode":
-                    dd = QComboBox()
-                    dd.addItems(["1:1", "manuell"])
-                    self.t2_table.setCellWidget(r, c, dd)
-
-                elif kind == "manual":
-                    le = QLineEdit()
-                    le.setPlaceholderText("nur bei 'manuell' relevant")
-                    self.t2_table.setCellWidget(r, c, le)
-
-        self.t2_table.resizeColumnsToContents()
+        # ein Model statt fünf Widgets je Zelle; Editoren entstehen erst beim Bearbeiten
+        self.t2_model = _ChoiceModel(self.t2_df, self)
+        self.t2_table.setModel(self.t2_model)
+        self._fit_columns()
+
+    def _fit_columns(self):
+        # Breite je Spalte aus dem längsten Text statt resizeColumnsToContents (fragt jede Zelle ab)
+        m, fm = self.t2_model, self.t2_table.fontMetrics()
+        pad = 3 * fm.horizontalAdvance("M")
+        longest_t1 = max(self.t1_columns, key=len, default="")
+        for col in range(m.columnCount()):
+            kind, texts = m.kind(col), [m.headerData(col, Qt.Horizontal)]
+            if kind == "value":
+                texts.append(m.longest_value(col // 5))
+            elif kind == "target":
+                texts.append(longest_t1)
+            elif kind == "manual":
+                texts.append(_MANUAL_HINT)
+            self.t2_table.setColumnWidth(col, min(max(fm.horizontalAdvance(t) for t in texts) + pad, 300))
 
     def collect_changes(self):
         changes: list[ProposedChange] = []
-        t2_cols = [c for c in self.t2_df.columns if c != "_KEY_"]
-
-        for r in range(self.t2_table.rowCount()):
-            # jede T2-Spalte prüfen
-            for i, t2c in enumerate(t2_cols):
-                base = i * 5
-                cb: QCheckBox = self.t2_table.cellWidget(r, base)  # use
-                if not cb.isChecked():
-                    continue
-
-                value_item = self.t2_table.item(r, base + 1)
-                source_value = "" if value_item is None else value_item.text()
-
-                target_dd: QComboBox = self.t2_table.cellWidget(r, base + 2)
-                target_col = target_dd.currentText().strip()
-                if not target_col:
-                    QMessageBox.warning(self, "Fehlt", f"Zielspalte fehlt für T2-Spalte '{t2c}' in Zeile {r+1}.")
-                    return
-
-                mode_dd: QComboBox = self.t2_table.cellWidget(r, base + 3)
-                mode = mode_dd.currentText()
-
-                manual_le: QLineEdit = self.t2_table.cellWidget(r, base + 4)
-                manual_value = manual_le.text().strip()
-
-                new_value = source_value if mode == "1:1" else manual_value
-                if mode == "manuell" and new_value == "":
-                    QMessageBox.warning(self, "Fehlt", f"Manueller Wert ist leer für Ziel '{target_col}' (Zeile {r+1}).")
-                    return
-
-                changes.append(ProposedChange(
-                    key=self.key,
-                    t1_row_index=self.t1_row_index,
-                    target_col=target_col,
-                    new_value=new_value,
-                    source_info=f"T2[{r}]:{t2c} ({mode})"
-                ))
+        m = self.t2_model
+
+        # nur angehakte Zellen, in Tabellenreihenfolge (Zeile, dann Spalte)
+        for r, i in sorted(m.use):
+            t2c = m.t2_cols[i]
+            target_col = m.target.get((r, i), "").strip()
+            if not target_col:
+                QMessageBox.warning(self, "Fehlt", f"Zielspalte fehlt für T2-Spalte '{t2c}' in Zeile {r+1}.")
+                return
+
+            mode = m.mode.get((r, i), _MODES[0])
+            new_value = m.value(r, i) if mode == "1:1" else m.manual.get((r, i), "").strip()
+            if mode == "manuell" and new_value == "":
+                QMessageBox.warning(self, "Fehlt", f"Manueller Wert ist leer für Ziel '{target_col}' (Zeile {r+1}).")
+                return
+
+            changes.append(ProposedChange(
+                key=self.key,
+                t1_row_index=self.t1_row_index,
+                target_col=target_col,
+                new_value=new_value,
+                source_info=f"T2[{r}]:{t2c} ({mode})"
+            ))
 
         self.changes = changes
         QMessageBox.information(self, "OK", f"{len(changes)} Änderungen gesammelt. Du kannst jetzt im Hauptfenster übernehmen.")
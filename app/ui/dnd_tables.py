@@ -1,40 +1,98 @@
 from __future__ import annotations
 
-from PySide6.QtWidgets import QTableWidget, QTableWidgetItem, QMenu, QInputDialog
-from PySide6.QtCore import Qt, QMimeData
-from PySide6.QtGui import QDrag, QAction
+import json
+from dataclasses import dataclass
 
-MIME = "application/x-excel-filler-cell"
-
-def _is_missing_local(v: str | None) -> bool:
-    if v is None:
-        return True
-    s = str(v).strip()
-    if s == "":
-        return True
-    return s.lower() in {"nan", "none", "null", "-", "n/a"}
-
-class SourceTable(QTableWidget):
-    def startDrag(self, supportedActions):
-        items = self.selectedItems()
-        if not items:
-            item = self.currentItem()
-            if not item:
-                return
-            items = [item]
+from PySide6.QtWidgets import QTableView, QMenu, QInputDialog, QApplication
+from PySide6.QtCore import Qt, QMimeData, Signal
+from PySide6.QtGui import QDrag, QAction, QKeySequence
 
-        cells = sorted([(it.row(), it.column(), it.text()) for it in items], key=lambda x: (x[0], x[1]))
-        parts = [t for _, _, t in cells if not _is_missing_local(t)]
-        text = "\n".join(parts)  # Multi-Zellen standardmäßig zeilenweise
+from app.services.normalize import is_missing
 
-        mime = QMimeData()
-        mime.setData(MIME, text.encode("utf-8"))
+MIME = "application/x-excel-filler-cell"
+# rechteckiger Block: {"columns": [Quellspalten], "rows": [[Wert | null, …], …]}; null = nicht ausgewählt/leer
+BLOCK_MIME = "application/x-excel-filler-block"
+
+@dataclass
+class Block:
+    columns: list[str] | None  # Spaltennamen der Quelle (None bei Text aus der Zwischenablage)
+    rows: list[list[str | None]]
+
+    @property
+    def cells(self) -> int:
+        return sum(v is not None for row in self.rows for v in row)
+
+def _block_from_view(view: QTableView, indexes) -> Block:
+    # Auswahl als Rechteck in sichtbarer Reihenfolge (verschobene Spalten wie angezeigt, ausgeblendete fehlen)
+    header = view.horizontalHeader()
+    indexes = [ix for ix in indexes if not view.isColumnHidden(ix.column())]
+    rows = sorted({ix.row() for ix in indexes})
+    cols = sorted({ix.column() for ix in indexes}, key=header.visualIndex)
+    r_pos = {r: i for i, r in enumerate(rows)}
+    c_pos = {c: i for i, c in enumerate(cols)}
+    grid: list[list[str | None]] = [[None] * len(cols) for _ in rows]
+    for ix in indexes:
+        t = ix.data(Qt.DisplayRole) or ""
+        if not is_missing(t):
+            grid[r_pos[ix.row()]][c_pos[ix.column()]] = t
+    model = view.model()
+    return Block([str(model.headerData(c, Qt.Horizontal)) for c in cols], grid)
+
+def block_mime(view: QTableView, indexes) -> QMimeData:
+    block = _block_from_view(view, indexes)
+    mime = QMimeData()
+    # bisheriges Einzelzellen-Format (zeilenweise) für Ersetzen/Anhängen in eine Zelle
+    mime.setData(MIME, "\n".join(v for row in block.rows for v in row if v is not None).encode("utf-8"))
+    mime.setData(BLOCK_MIME, json.dumps({"columns": block.columns, "rows": block.rows}, ensure_ascii=False).encode("utf-8"))
+    # Tab-getrennt für Excel & Co.
+    mime.setText("\n".join("\t".join(v or "" for v in row) for row in block.rows))
+    return mime
+
+def read_block(mime: QMimeData) -> Block | None:
+    if mime.hasFormat(BLOCK_MIME):
+        data = json.loads(bytes(mime.data(BLOCK_MIME)).decode("utf-8"))
+        return Block(data.get("columns"), data.get("rows") or [])
+    if mime.hasText():
+        # z. B. aus Excel kopiert: Zeilen per Zeilenumbruch, Spalten per Tab
+        lines = mime.text().replace("\r\n", "\n").rstrip("\n").split("\n")
+        return Block(None, [[None if is_missing(v) else v for v in line.split("\t")] for line in lines])
+    return None
+
+class SourceTable(QTableView):
+    def _selection(self):
+        indexes = self.selectedIndexes()
+        if not indexes:
+            idx = self.currentIndex()
+            indexes = [idx] if idx.isValid() else []
+        return indexes
 
+    def startDrag(self, supportedActions):
+        indexes = self._selection()
+        if not indexes:
+            return
         drag = QDrag(self)
-        drag.setMimeData(mime)
+        drag.setMimeData(block_mime(self, indexes))
         drag.exec(Qt.CopyAction)
 
-class TargetTable(QTableWidget):
+    def keyPressEvent(self, e):
+        if e.matches(QKeySequence.Copy) and self._selection():
+            QApplication.clipboard().setMimeData(block_mime(self, self._selection()))
+            return
+        super().keyPressEvent(e)
+
+class TargetTable(QTableView):
+    # Block (mehr als eine Zelle) per Drop oder Einfügen: block_dropped(Anker-Index, Block);
+    # das Hauptfenster ordnet die Spalten zu und schreibt gebündelt
+    block_dropped = Signal(object, object)
+
+    def keyPressEvent(self, e):
+        if e.matches(QKeySequence.Paste) and self.currentIndex().isValid() and self.acceptDrops():
+            block = read_block(QApplication.clipboard().mimeData())
+            if block is not None and block.cells:
+                self.block_dropped.emit(self.currentIndex(), block)
+                return
+        super().keyPressEvent(e)
+
     def dragEnterEvent(self, e):
         if e.mimeData().hasFormat(MIME):
             e.acceptProposedAction()
@@ -51,17 +109,20 @@ class TargetTable(QTableWidget):
         if not e.mimeData().hasFormat(MIME):
             return super().dropEvent(e)
 
-        text = bytes(e.mimeData().data(MIME)).decode("utf-8")
         idx = self.indexAt(e.position().toPoint())
         if not idx.isValid():
             e.ignore()
             return
+        block = read_block(e.mimeData()) if e.mimeData().hasFormat(BLOCK_MIME) else None
+        if block is not None and block.cells > 1:
+            self.block_dropped.emit(idx, block)
+            e.acceptProposedAction()
+            return
 
-        row, col = idx.row(), idx.column()
+        text = bytes(e.mimeData().data(MIME)).decode("utf-8")
 
-        existing_item = self.item(row, col)
-        existing_text = existing_item.text() if existing_item else ""
-        existing_is_missing = _is_missing_local(existing_text)
+        existing_text = idx.data(Qt.EditRole) or ""
+        existing_is_missing = is_missing(existing_text)
 
         if not existing_is_missing:
             menu = QMenu(self)
@@ -107,19 +168,10 @@ class TargetTable(QTableWidget):
         else:
             new_text = text
 
-        self.blockSignals(True)
-        item = self.item(row, col)
-        if item is None:
-            item = QTableWidgetItem()
-            self.setItem(row, col, item)
-        item.setText(new_text)
-        self.blockSignals(False)
-
-        self.setCurrentCell(row, col)
-        self.editItem(self.item(row, col))
+        # Model schreibt direkt in den DataFrame
+        self.model().setData(idx, new_text, Qt.EditRole)
 
-        mw = self.window()
-        if hasattr(mw, "on_t1_cell_dropped"):
-            mw.on_t1_cell_dropped(self, row, col, new_text)
+        self.setCurrentIndex(idx)
+        self.edit(idx)
 
         e.acceptProposedAction()
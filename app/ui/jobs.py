@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtWidgets import QProgressBar, QPushButton, QLabel
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobSignals(QObject):
+    # lebt im UI-Thread; Emits aus dem Pool kommen dort als Queued-Aufrufe an
+    progress = Signal(int, int, str)  # done, total (0 = unbestimmt), Text
+    done = Signal(object)
+    failed = Signal(object)  # Exception
+    cancelled = Signal()
+    finished = Signal()  # immer, nach done/failed/cancelled
+
+
+class Job(QRunnable):
+    # fn(job, *args, **kwargs) läuft im Thread-Pool. job.report(...) meldet Fortschritt
+    # und wirft JobCancelled, sobald abgebrochen wurde – Services brechen so an der nächsten Meldung ab.
+    def __init__(self, title: str, fn: Callable, *args, **kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.title = title
+        self.signals = JobSignals()
+        self._fn, self._args, self._kwargs = fn, args, kwargs
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def report(self, done: int, total: int = 0, text: str = "") -> None:
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self.signals.progress.emit(int(done), int(total), text)
+
+    def run(self) -> None:
+        try:
+            if self._cancel.is_set():
+                raise JobCancelled()
+            result = self._fn(self, *self._args, **self._kwargs)
+        except JobCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            self.signals.done.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+
+class JobRunner(QObject):
+    # Startet Jobs im QThreadPool und zeigt sie in der Statusleiste (Text, Fortschritt, Abbrechen).
+    # exclusive=True: Job verändert Engine/Datei – busy_changed sperrt solange die betroffenen Aktionen.
+    busy_changed = Signal(bool)
+
+    def __init__(self, label: QLabel, bar: QProgressBar, btn_cancel: QPushButton, pool: QThreadPool | None = None, parent=None):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self._label, self._bar, self._btn_cancel = label, bar, btn_cancel
+        self._active: list[tuple[Job, bool]] = []
+        self._btn_cancel.clicked.connect(self.cancel_all)
+        self._update_widgets()
+
+    @property
+    def busy(self) -> bool:
+        return any(excl for _, excl in self._active)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._active)
+
+    def submit(
+        self,
+        title: str,
+        fn: Callable,
+        *args,
+        on_done: Callable[[object], None] | None = None,
+        on_failed: Callable[[Exception], None] | None = None,
+        on_cancelled: Callable[[], None] | None = None,
+        exclusive: bool = True,
+        **kwargs,
+    ) -> Job:
+        job = Job(title, fn, *args, **kwargs)
+        s = job.signals
+        q = Qt.QueuedConnection
+        s.progress.connect(lambda d, t, txt, j=job: self._on_progress(j, d, t, txt), q)
+        if on_done is not None:
+            s.done.connect(on_done, q)
+        if on_failed is not None:
+            s.failed.connect(on_failed, q)
+        if on_cancelled is not None:
+            s.cancelled.connect(on_cancelled, q)
+        s.finished.connect(lambda j=job: self._on_finished(j), q)
+
+        was_busy = self.busy
+        self._active.append((job, exclusive))
+        self._update_widgets(title)
+        if self.busy != was_busy:
+            self.busy_changed.emit(True)
+        self.pool.start(job)
+        return job
+
+    def cancel_all(self) -> None:
+        for job, _ in self._active:
+            job.cancel()
+        if self._active:
+            self._label.setText("Abbruch angefordert…")
+
+    def wait(self, msecs: int = -1) -> bool:
+        return self.pool.waitForDone(msecs)
+
+    # ---------------- internals ----------------
+    def _on_progress(self, job: Job, done: int, total: int, text: str) -> None:
+        if not self._active or self._active[-1][0] is not job:
+            return  # Anzeige folgt dem zuletzt gestarteten Job
+        self._bar.setRange(0, max(total, 0))
+        if total > 0:
+            self._bar.setValue(min(done, total))
+        self._label.setText(f"{job.title}: {text}" if text else job.title)
+
+    def _on_finished(self, job: Job) -> None:
+        was_busy = self.busy
+        self._active = [(j, e) for j, e in self._active if j is not job]
+        self._update_widgets(self._active[-1][0].title if self._active else "")
+        if self.busy != was_busy:
+            self.busy_changed.emit(False)
+
+    def _update_widgets(self, title: str = "") -> None:
+        running = bool(self._active)
+        self._bar.setVisible(running)
+        self._btn_cancel.setVisible(running)
+        self._label.setVisible(running)
+        if running:
+            self._bar.setRange(0, 0)  # unbestimmt, bis der Job Fortschritt meldet
+            self._label.setText(title)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from PySide6.QtCore import Signal
+from PySide6.QtGui import QAction, QActionGroup
+from PySide6.QtWidgets import QToolButton, QMenu
+
+from app.services.matcher import KeyPart
+from app.services.normalize import KEY_MODES
+
+_MODE_LABELS = {"text": "Text", "lower": "ohne Groß/klein", "digits": "nur Ziffern"}
+
+
+class KeyPicker(QToolButton):
+    # Auswahl einer oder mehrerer KEY-Spalten (Reihenfolge = Reihenfolge des Anhakens),
+    # je Teil mit Normalisierung. Ersetzt die frühere Einzel-ComboBox.
+    changed = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setPopupMode(QToolButton.InstantPopup)
+        self._columns: list[str] = []
+        self._parts: list[KeyPart] = []
+        self._menu = QMenu(self)
+        self._menu.aboutToShow.connect(self._rebuild_menu)
+        self.setMenu(self._menu)
+        self._update_text()
+
+    # ---------------- API ----------------
+    def clear(self) -> None:
+        self._columns, self._parts = [], []
+        self._update_text()
+
+    def addItems(self, columns: list[str]) -> None:
+        # wie bei der ComboBox: erste Spalte vorausgewählt, bestehende Auswahl bleibt, soweit vorhanden
+        self._columns.extend(c for c in columns if c not in self._columns)
+        self._parts = [p for p in self._parts if p.col in self._columns]
+        if not self._parts and self._columns:
+            self._parts = [KeyPart(self._columns[0])]
+        self._update_text()
+
+    def parts(self) -> list[KeyPart]:
+        return list(self._parts)
+
+    def columns(self) -> list[str]:
+        return [p.col for p in self._parts]
+
+    def set_parts(self, parts: list[KeyPart | str]) -> None:
+        self._parts = [p if isinstance(p, KeyPart) else KeyPart(p) for p in parts]
+        self._parts = [p for p in self._parts if p.col in self._columns]
+        self._update_text()
+        self.changed.emit()
+
+    def currentText(self) -> str:
+        return " + ".join(p.col for p in self._parts)
+
+    # ---------------- menu ----------------
+    def _rebuild_menu(self) -> None:
+        m = self._menu
+        m.clear()
+        selected = {p.col: p for p in self._parts}
+        for col in self._columns:
+            a = m.addAction(col)
+            a.setCheckable(True)
+            a.setChecked(col in selected)
+            a.toggled.connect(lambda on, c=col: self._toggle(c, on))
+        if self._parts:
+            m.addSeparator()
+            for i, part in enumerate(self._parts):
+                sub = m.addMenu(f"Normalisierung: {part.col}")
+                group = QActionGroup(sub)
+                for mode in KEY_MODES:
+                    a = QAction(_MODE_LABELS[mode], sub)
+                    a.setCheckable(True)
+                    a.setChecked(part.mode == mode)
+                    a.triggered.connect(lambda _=False, i=i, mode=mode: self._set_mode(i, mode))
+                    group.addAction(a)
+                    sub.addAction(a)
+
+    def _toggle(self, col: str, on: bool) -> None:
+        if on and col not in self.columns():
+            self._parts.append(KeyPart(col))
+        elif not on:
+            self._parts = [p for p in self._parts if p.col != col]
+        self._update_text()
+        self.changed.emit()
+
+    def _set_mode(self, i: int, mode: str) -> None:
+        self._parts[i] = KeyPart(self._parts[i].col, mode)
+        self._update_text()
+        self.changed.emit()
+
+    def _update_text(self) -> None:
+        label = " + ".join(p.col if p.mode == "text" else f"{p.col} ({_MODE_LABELS[p.mode]})" for p in self._parts)
+        self.setText(label or "—")
@@ -2,19 +2,25 @@ from __future__ import annotations
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-    QFileDialog, QComboBox, QSpinBox, QTableWidgetItem,
-    QMessageBox, QAbstractItemView,
-    QInputDialog, QDialog, QFormLayout, QCheckBox, QDockWidget, QMenu
+    QFileDialog, QComboBox, QSpinBox,
+    QMessageBox, QAbstractItemView, QHeaderView,
+    QInputDialog, QDialog, QFormLayout, QCheckBox, QDockWidget, QMenu, QProgressBar
 )
 from PySide6.QtCore import Qt, QPoint
 from PySide6.QtGui import QColor, QBrush, QAction
 
 from app.services.excel_io import list_sheets, load_table
 from app.services.matcher import MatchEngine
+from app.services.key_cache import KeyViewCache
+from app.services.candidates import CandidateIndex, find_candidates, normalize_fields, resolve_fields
+from app.services.autofill import autofill_linked
+from app.services.conflicts import conflicts_first, find_conflicts
 from app.services.normalize import is_missing
-from app.services.transforms import split_street_house, normalize_phone, state_from_zip_de
-from app.services.settings import AppSettings, load_settings, save_settings
+from app.services.settings import AppSettings, SettingsStore, load_settings
 from app.ui.dnd_tables import SourceTable, TargetTable
+from app.ui.jobs import JobRunner
+from app.ui.key_picker import KeyPicker
+from app.ui.table_models import DataFrameModel
 
 
 def _pick_text_color_for_bg(hex_color: str) -> QColor:
@@ -46,6 +52,17 @@ class MainWindow(QMainWindow):
         self.t1 = None
         self.t2 = None
         self.engine: MatchEngine | None = None
+        self.key_cache: KeyViewCache | None = None
+        # weitere Quelltabellen: {"name", "table", "key"}; eigene Kopplungen je Quellname
+        self.extra_sources: list[dict] = []
+        self.source_links: dict[str, dict[str, str]] = {}
+        # Kandidaten für T1-Zeilen ohne KEY-Treffer: Ergebnis (Langformat) + T1-Label -> Positionen darin
+        self.candidates = None
+        self._candidate_rows: dict = {}
+        self._cand_gen = 0
+        # widersprüchliche Quellwerte je KEY (letzter Konflikt-Bericht)
+        self.conflicts = None
+        self._conflict_cols: dict[str, list[str]] = {}
 
         self.keys_queue: list[str] = []
         self.current_pos = -1
@@ -53,18 +70,24 @@ class MainWindow(QMainWindow):
 
         self._t1_sheet_slot = None
         self._t2_sheet_slot = None
+        # Ladevorgänge laufen parallel; nur das Ergebnis des jeweils letzten zählt
+        self._load_gen = {"t1": 0, "t2": 0}
 
         # Settings
         self.settings: AppSettings = load_settings()
+        self.settings_store = SettingsStore()
         self.col_links = dict(self.settings.col_links)
         self.cuts = dict(self.settings.cuts)
         self.country_default_value = self.settings.country_default_value
 
-        # For 2-line split
-        self._t1_cols_top: list[str] = []
-        self._t1_cols_bottom: list[str] = []
-        self._t2_cols_top: list[str] = []
-        self._t2_cols_bottom: list[str] = []
+        # For 2-line split (T2): beide Views teilen ein Model, jede blendet die Spalten der anderen aus
+        self._t2_cols_top: set[str] = set()
+        self._t2_cols_bottom: set[str] = set()
+
+        # Header-Prefs: Plan je (Spalten, Settings) und zuletzt angewandte Signatur je View
+        self._prefs_plans: dict[tuple, tuple] = {}
+        self._prefs_applied: dict[int, tuple] = {}
+        self._applying_prefs = False
 
         central = QWidget(self)
         self.setCentralWidget(central)
@@ -78,7 +101,7 @@ class MainWindow(QMainWindow):
         self.sp_t1_header = QSpinBox()
         self.sp_t1_header.setMinimum(1)
         self.sp_t1_header.setValue(1)
-        self.cb_t1_key = QComboBox()
+        self.kp_t1_key = KeyPicker()
 
         row1.addWidget(self.btn_t1)
         row1.addWidget(self.lbl_t1)
@@ -87,7 +110,7 @@ class MainWindow(QMainWindow):
         row1.addWidget(QLabel("Header"))
         row1.addWidget(self.sp_t1_header)
         row1.addWidget(QLabel("KEY"))
-        row1.addWidget(self.cb_t1_key)
+        row1.addWidget(self.kp_t1_key)
         layout.addLayout(row1)
 
         row2 = QHBoxLayout()
@@ -97,7 +120,7 @@ class MainWindow(QMainWindow):
         self.sp_t2_header = QSpinBox()
         self.sp_t2_header.setMinimum(1)
         self.sp_t2_header.setValue(1)
-        self.cb_t2_key = QComboBox()
+        self.kp_t2_key = KeyPicker()
 
         row2.addWidget(self.btn_t2)
         row2.addWidget(self.lbl_t2)
@@ -106,9 +129,21 @@ class MainWindow(QMainWindow):
         row2.addWidget(QLabel("Header"))
         row2.addWidget(self.sp_t2_header)
         row2.addWidget(QLabel("KEY"))
-        row2.addWidget(self.cb_t2_key)
+        row2.addWidget(self.kp_t2_key)
         layout.addLayout(row2)
 
+        # --------- weitere Quellen (füllen zusätzlich zu T2, Vorrang je Spalte) ----------
+        row3 = QHBoxLayout()
+        self.btn_add_source = QPushButton("Weitere Quelle…")
+        self.lbl_sources = QLabel("—")
+        self.btn_clear_sources = QPushButton("Quellen entfernen")
+        self.btn_priority = QPushButton("Quellen-Vorrang…")
+        row3.addWidget(self.btn_add_source)
+        row3.addWidget(self.lbl_sources, 1)
+        row3.addWidget(self.btn_clear_sources)
+        row3.addWidget(self.btn_priority)
+        layout.addLayout(row3)
+
         self.btn_start = QPushButton("Start (fehlende Kundennummern)")
         layout.addWidget(self.btn_start)
 
@@ -119,44 +154,48 @@ class MainWindow(QMainWindow):
         self.btn_cuts = QPushButton("Cuts")
         self.btn_fill_row = QPushButton("Plausibel füllen (Zeile)")
         self.btn_fill_all = QPushButton("Plausibel füllen (Gesamt)")
+        self.btn_conflicts = QPushButton("Konflikte…")
         self.btn_prev = QPushButton("◀ Zurück")
         self.btn_next = QPushButton("Nächste ▶")
         self.btn_save_as = QPushButton("Speichern unter…")
         self.btn_save_inplace = QPushButton("Speichern (gleiche Datei)")
         self.btn_save = QPushButton("Speichern (neu)")
+        self.btn_restore = QPushButton("Backup wiederherstellen…")
 
         nav.addWidget(self.btn_add_col)
         nav.addWidget(self.btn_links)
         nav.addWidget(self.btn_cuts)
         nav.addWidget(self.btn_fill_row)
         nav.addWidget(self.btn_fill_all)
+        nav.addWidget(self.btn_conflicts)
         nav.addWidget(self.btn_prev)
         nav.addWidget(self.btn_next)
         nav.addWidget(self.btn_save_as)
         nav.addWidget(self.btn_save_inplace)
         nav.addWidget(self.btn_save)
+        nav.addWidget(self.btn_restore)
         layout.addLayout(nav)
 
-        # --------- T1 container: two rows ----------
-        self.t1_container = QWidget()
-        t1_layout = QVBoxLayout(self.t1_container)
-        t1_layout.setContentsMargins(0, 0, 0, 0)
-
-        self.t1_view_top = TargetTable(1, 0)
-        self.t1_view_bottom = TargetTable(1, 0)
-
-        for v in (self.t1_view_top, self.t1_view_bottom):
-            v.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked | QAbstractItemView.EditKeyPressed)
-            v.setDragDropMode(QAbstractItemView.DropOnly)
-            v.horizontalHeader().setSectionsMovable(True)
-            v.horizontalHeader().setContextMenuPolicy(Qt.CustomContextMenu)
-            v.horizontalHeader().customContextMenuRequested.connect(lambda pos, view=v: self._header_menu(view, "t1", pos))
-            v.horizontalHeader().sectionMoved.connect(lambda *_: self._persist_order_from_views("t1"))
-            v.itemChanged.connect(self.on_t1_item_changed_any)
-
-        t1_layout.addWidget(self.t1_view_top)
-        t1_layout.addWidget(self.t1_view_bottom)
-        layout.addWidget(self.t1_container)
+        # --------- T1: ganze Tabelle als Model/View ----------
+        self.t1_model = DataFrameModel(on_edit=self.on_t1_value_edited, parent=self)
+        self.t1_view = TargetTable()
+        self.t1_view.setModel(self.t1_model)
+        self.t1_view.block_dropped.connect(self.on_t1_block_dropped)
+
+        v = self.t1_view
+        v.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked | QAbstractItemView.EditKeyPressed)
+        v.setDragDropMode(QAbstractItemView.DropOnly)
+        v.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        v.setWordWrap(False)
+        # feste Zeilenhöhe: Qt muss bei 500k Zeilen nichts vermessen
+        v.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        v.verticalHeader().setDefaultSectionSize(v.fontMetrics().height() + 8)
+        v.horizontalHeader().setSectionsMovable(True)
+        v.horizontalHeader().setContextMenuPolicy(Qt.CustomContextMenu)
+        v.horizontalHeader().customContextMenuRequested.connect(lambda pos: self._header_menu(self.t1_view, "t1", pos))
+        v.horizontalHeader().sectionMoved.connect(lambda *_: self._persist_order_from_views("t1"))
+
+        layout.addWidget(self.t1_view, 1)
 
         # --------- Status ----------
         self.status = QLabel(f"Settings geladen (Country default: {self.country_default_value})")
@@ -167,10 +206,13 @@ class MainWindow(QMainWindow):
         t2_layout = QVBoxLayout(self.t2_container)
         t2_layout.setContentsMargins(0, 0, 0, 0)
 
-        self.t2_view_top = SourceTable(0, 0)
-        self.t2_view_bottom = SourceTable(0, 0)
+        self.t2_model = DataFrameModel(editable=False, parent=self)
+        self.t2_view_top = SourceTable()
+        self.t2_view_bottom = SourceTable()
 
         for v in (self.t2_view_top, self.t2_view_bottom):
+            v.setModel(self.t2_model)
+            v.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
             v.setEditTriggers(QAbstractItemView.NoEditTriggers)
             v.setDragEnabled(True)
             v.setDragDropMode(QAbstractItemView.DragOnly)
@@ -180,7 +222,7 @@ class MainWindow(QMainWindow):
             v.horizontalHeader().setContextMenuPolicy(Qt.CustomContextMenu)
             v.horizontalHeader().customContextMenuRequested.connect(lambda pos, view=v: self._header_menu(view, "t2", pos))
             v.horizontalHeader().sectionMoved.connect(lambda *_: self._persist_order_from_views("t2"))
-            v.cellDoubleClicked.connect(lambda r, c, view=v: self.quick_copy_from_t2(view, r, c))
+            v.doubleClicked.connect(self.quick_copy_from_t2)
 
         t2_layout.addWidget(self.t2_view_top)
         t2_layout.addWidget(self.t2_view_bottom)
@@ -192,9 +234,23 @@ class MainWindow(QMainWindow):
         self.addDockWidget(Qt.RightDockWidgetArea, self.dock_t2)
         self.setDockOptions(QMainWindow.AllowTabbedDocks | QMainWindow.AllowNestedDocks)
 
+        # --------- Hintergrund-Jobs (Statusleiste) ----------
+        self.lbl_job = QLabel()
+        self.job_bar = QProgressBar()
+        self.job_bar.setMaximumWidth(220)
+        self.btn_cancel_job = QPushButton("Abbrechen")
+        for w in (self.lbl_job, self.job_bar, self.btn_cancel_job):
+            self.statusBar().addPermanentWidget(w)
+        self.jobs = JobRunner(self.lbl_job, self.job_bar, self.btn_cancel_job, parent=self)
+        self.jobs.busy_changed.connect(self._set_busy)
+        self._t1_edit_triggers = self.t1_view.editTriggers()
+
         # --------- Events ----------
         self.btn_t1.clicked.connect(self.pick_t1)
         self.btn_t2.clicked.connect(self.pick_t2)
+        # Header-Zeile wechseln: kommt aus dem Workbook-Cache, kein erneutes Einlesen
+        self.sp_t1_header.valueChanged.connect(lambda _=None: self._t1_sheet_slot and self._t1_sheet_slot())
+        self.sp_t2_header.valueChanged.connect(lambda _=None: self._t2_sheet_slot and self._t2_sheet_slot())
         self.btn_start.clicked.connect(self.start_scan)
 
         self.btn_prev.clicked.connect(self.prev_key)
@@ -203,15 +259,21 @@ class MainWindow(QMainWindow):
         self.btn_save.clicked.connect(self.save_new_file)
         self.btn_save_as.clicked.connect(self.save_as)
         self.btn_save_inplace.clicked.connect(self.save_inplace)
+        self.btn_restore.clicked.connect(self.restore_backup)
 
+        self.btn_add_source.clicked.connect(self.add_source)
+        self.btn_clear_sources.clicked.connect(self.clear_sources)
+        self.btn_priority.clicked.connect(self.open_priority_dialog)
         self.btn_add_col.clicked.connect(self.add_column_t1_global)
         self.btn_links.clicked.connect(self.open_links_dialog)
         self.btn_cuts.clicked.connect(self.open_cuts_dialog)
         self.btn_fill_row.clicked.connect(self.autofill_current_key_linked)
         self.btn_fill_all.clicked.connect(self.autofill_all_linked)
+        self.btn_conflicts.clicked.connect(self.find_conflicts_report)
 
     # ---------------- Settings persistence ----------------
-    def _save_settings_now(self):
+    def _save_settings(self):
+        # nur vormerken; SettingsStore schreibt gebündelt im Hintergrund
         self.settings = AppSettings(
             col_links=dict(self.col_links),
             cuts=dict(self.cuts),
@@ -222,12 +284,21 @@ class MainWindow(QMainWindow):
             t2_colors=dict(self.settings.t2_colors),
             t1_order=list(self.settings.t1_order),
             t2_order=list(self.settings.t2_order),
+            backup_keep_last=int(self.settings.backup_keep_last),
+            backup_max_age_days=int(self.settings.backup_max_age_days),
+            source_priority={k: list(v) for k, v in self.settings.source_priority.items()},
+            conflicts_first=bool(self.settings.conflicts_first),
         )
-        save_settings(self.settings)
+        self.settings_store.mark_dirty(self.settings)
 
     def closeEvent(self, event):
+        self.jobs.cancel_all()
+        self.jobs.wait()
+        if self.key_cache is not None:
+            self.key_cache.close()
         try:
-            self._save_settings_now()
+            self._save_settings()
+            self.settings_store.flush()
         except Exception:
             pass
         super().closeEvent(event)
@@ -238,10 +309,9 @@ class MainWindow(QMainWindow):
         logical_index = header.logicalIndexAt(pos)
         if logical_index < 0:
             return
-        col_item = table.horizontalHeaderItem(logical_index)
-        if not col_item:
+        col_name = self._header_name(table, logical_index)
+        if not col_name:
             return
-        col_name = col_item.text()
 
         menu = QMenu(self)
 
@@ -280,14 +350,14 @@ class MainWindow(QMainWindow):
         if col_name not in hidden:
             hidden.append(col_name)
         self._apply_table_prefs(table_key)
-        self._save_settings_now()
+        self._save_settings()
 
     def _show_column(self, table_key: str, col_name: str):
         hidden = self.settings.t1_hidden if table_key == "t1" else self.settings.t2_hidden
         if col_name in hidden:
             hidden.remove(col_name)
         self._apply_table_prefs(table_key)
-        self._save_settings_now()
+        self._save_settings()
 
     def _show_all(self, table_key: str):
         if table_key == "t1":
@@ -295,29 +365,34 @@ class MainWindow(QMainWindow):
         else:
             self.settings.t2_hidden = []
         self._apply_table_prefs(table_key)
-        self._save_settings_now()
+        self._save_settings()
 
     def _set_col_color(self, table_key: str, col_name: str, hex_color: str):
         colors = self.settings.t1_colors if table_key == "t1" else self.settings.t2_colors
         colors[col_name] = hex_color
         self._apply_table_prefs(table_key)
-        self._save_settings_now()
+        self._save_settings()
 
     def _clear_col_color(self, table_key: str, col_name: str):
         colors = self.settings.t1_colors if table_key == "t1" else self.settings.t2_colors
         if col_name in colors:
             del colors[col_name]
         self._apply_table_prefs(table_key)
-        self._save_settings_now()
+        self._save_settings()
 
     def _persist_order_from_views(self, table_key: str):
+        if self._applying_prefs:
+            return
         if table_key == "t1":
-            order = self._get_visual_order(self.t1_view_top) + self._get_visual_order(self.t1_view_bottom)
+            order = self._get_visual_order(self.t1_view)
             self.settings.t1_order = [c for c in order if c]
         else:
-            order = self._get_visual_order(self.t2_view_top) + self._get_visual_order(self.t2_view_bottom)
+            order = (
+                [c for c in self._get_visual_order(self.t2_view_top) if c in self._t2_cols_top]
+                + [c for c in self._get_visual_order(self.t2_view_bottom) if c in self._t2_cols_bottom]
+            )
             self.settings.t2_order = [c for c in order if c]
-        self._save_settings_now()
+        self._save_settings()
 
     def _reset_order(self, table_key: str):
         if table_key == "t1":
@@ -325,21 +400,56 @@ class MainWindow(QMainWindow):
         else:
             self.settings.t2_order = []
         self._apply_table_prefs(table_key)
-        self._save_settings_now()
+        self._save_settings()
+
+    @staticmethod
+    def _header_name(table, logical: int) -> str:
+        # funktioniert für QTableWidget und Model/View gleichermaßen
+        model = table.model()
+        name = model.headerData(logical, Qt.Horizontal, Qt.DisplayRole) if model is not None else None
+        return "" if name is None else str(name)
 
     def _get_visual_order(self, table) -> list[str]:
         header = table.horizontalHeader()
         names = []
         for visual in range(header.count()):
             logical = header.logicalIndex(visual)
-            it = table.horizontalHeaderItem(logical)
-            if it:
-                names.append(it.text())
+            name = self._header_name(table, logical)
+            if name:
+                names.append(name)
         return names
 
+    def _view_shows(self, table, name: str) -> bool:
+        if table is self.t2_view_top:
+            return name in self._t2_cols_top
+        if table is self.t2_view_bottom:
+            return name in self._t2_cols_bottom
+        return True
+
+    def _prefs_plan(self, cols: tuple, shown: tuple, hidden: tuple, colors: tuple, order: tuple) -> tuple:
+        # einmal je Spalten-Layout + Settings: Ausblend-Flags, Kopf-Farben, Ziel-Permutation (logische Indizes)
+        key = (cols, shown, hidden, colors, order)
+        plan = self._prefs_plans.get(key)
+        if plan is not None:
+            return plan
+        hidden_set, color_map = set(hidden), dict(colors)
+        hide_flags = tuple(c in hidden_set or not sh for c, sh in zip(cols, shown))
+        brushes = tuple(
+            (QBrush(QColor(color_map[c])), QBrush(_pick_text_color_for_bg(color_map[c]))) if c in color_map else None
+            for c in cols
+        )
+        pos = {c: i for i, c in enumerate(cols)}
+        front = [pos[c] for c in dict.fromkeys(order) if c in pos and shown[pos[c]]]
+        taken = set(front)
+        perm = tuple(front + [i for i in range(len(cols)) if i not in taken]) if front else ()
+        if len(self._prefs_plans) > 64:
+            self._prefs_plans.clear()
+        plan = self._prefs_plans[key] = (hide_flags, brushes, perm)
+        return plan
+
     def _apply_table_prefs(self, table_key: str):
         if table_key == "t1":
-            views = (self.t1_view_top, self.t1_view_bottom)
+            views = (self.t1_view,)
             hidden = self.settings.t1_hidden
             colors = self.settings.t1_colors
             order = self.settings.t1_order
@@ -348,44 +458,42 @@ class MainWindow(QMainWindow):
             hidden = self.settings.t2_hidden
             colors = self.settings.t2_colors
             order = self.settings.t2_order
+        hidden, colors, order = tuple(hidden), tuple(sorted(colors.items())), tuple(order)
 
-        # Hide/show + colors
         for table in views:
-            for i in range(table.columnCount()):
-                it = table.horizontalHeaderItem(i)
-                if not it:
-                    continue
-                name = it.text()
-                table.setColumnHidden(i, name in hidden)
-                if name in colors:
-                    bg = QColor(colors[name])
-                    fg = _pick_text_color_for_bg(colors[name])
-                    it.setBackground(QBrush(bg))
-                    it.setForeground(QBrush(fg))
-                else:
-                    it.setBackground(QBrush())
-                    it.setForeground(QBrush())
-
-        # Order (best-effort, only within each view)
-        if order:
-            for table in views:
+            model = table.model()
+            cols = tuple(model.columns())
+            shown = tuple(self._view_shows(table, c) for c in cols)
+            # unverändertes Layout und unveränderte Settings (normale Navigation): nichts zu tun
+            sig = (model.layout_version, cols, shown, hidden, colors, order)
+            if self._prefs_applied.get(id(table)) == sig:
+                continue
+            hide_flags, brushes, perm = self._prefs_plan(cols, shown, hidden, colors, order)
+
+            # Hide/show + colors
+            for i, hide in enumerate(hide_flags):
+                if table.isColumnHidden(i) != hide:
+                    table.setColumnHidden(i, hide)
+                bg, fg = brushes[i] or (QBrush(), QBrush())
+                model.setHeaderData(i, Qt.Horizontal, bg, Qt.BackgroundRole)
+                model.setHeaderData(i, Qt.Horizontal, fg, Qt.ForegroundRole)
+
+            # Order: je Ziel-Position höchstens ein moveSection, visualIndex ist O(1)
+            if perm:
                 header = table.horizontalHeader()
-                existing = self._get_visual_order(table)
-                if not existing:
-                    continue
-                # subset order
-                desired = [c for c in order if c in existing]
-                for target_visual, name in enumerate(desired):
-                    for v in range(header.count()):
-                        logical = header.logicalIndex(v)
-                        it = table.horizontalHeaderItem(logical)
-                        if it and it.text() == name:
-                            header.moveSection(v, target_visual)
-                            break
+                self._applying_prefs = True
+                try:
+                    for target_visual, logical in enumerate(perm):
+                        current = header.visualIndex(logical)
+                        if current != target_visual:
+                            header.moveSection(current, target_visual)
+                finally:
+                    self._applying_prefs = False
+            self._prefs_applied[id(table)] = sig
 
     # ---------------- Load files ----------------
     def pick_t1(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Excel Datei 1", "", "Excel (*.xlsx)")
+        path, _ = QFileDialog.getOpenFileName(self, "Excel Datei 1", "", "Excel (*.xlsx *.xlsm *.xls)")
         if not path:
             return
         self.lbl_t1.setText(path)
@@ -403,12 +511,10 @@ class MainWindow(QMainWindow):
         self.load_t1(path)
 
     def load_t1(self, path: str):
-        self.t1 = load_table(path, self.cb_t1_sheet.currentText(), self.sp_t1_header.value())
-        self.cb_t1_key.clear()
-        self.cb_t1_key.addItems(self.t1.df.columns.tolist())
+        self._load("t1", path, self.cb_t1_sheet.currentText(), self.sp_t1_header.value())
 
     def pick_t2(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Excel Datei 2", "", "Excel (*.xlsx)")
+        path, _ = QFileDialog.getOpenFileName(self, "Excel Datei 2", "", "Excel (*.xlsx *.xlsm *.xls)")
         if not path:
             return
         self.lbl_t2.setText(path)
@@ -426,27 +532,245 @@ class MainWindow(QMainWindow):
         self.load_t2(path)
 
     def load_t2(self, path: str):
-        self.t2 = load_table(path, self.cb_t2_sheet.currentText(), self.sp_t2_header.value())
-        self.cb_t2_key.clear()
-        self.cb_t2_key.addItems(self.t2.df.columns.tolist())
+        self._load("t2", path, self.cb_t2_sheet.currentText(), self.sp_t2_header.value())
+
+    def _load(self, which: str, path: str, sheet: str, header: int):
+        # im Pool; T1 und T2 laden gleichzeitig
+        self._load_gen[which] += 1
+        gen = self._load_gen[which]
+        self.jobs.submit(
+            f"Lade {which.upper()} ({sheet})", lambda job: load_table(path, sheet, header),
+            on_done=lambda t: self._on_table_loaded(which, gen, t),
+            on_failed=lambda e: self._on_load_failed(which, gen, e),
+            exclusive=False,
+        )
+
+    def _on_table_loaded(self, which: str, gen: int, table):
+        if gen != self._load_gen[which]:
+            return  # inzwischen anderes Sheet/Header gewählt
+        setattr(self, which, table)
+        kp = self.kp_t1_key if which == "t1" else self.kp_t2_key
+        kp.clear()
+        kp.addItems(table.df.columns.tolist())
+
+    def _on_load_failed(self, which: str, gen: int, e: Exception):
+        if gen != self._load_gen[which]:
+            return
+        if isinstance(e, ValueError):
+            self.status.setText(str(e))
+        else:
+            QMessageBox.critical(self, "Fehler", f"Laden fehlgeschlagen:\n{e}")
+
+    # ---------------- Jobs ----------------
+    def _set_busy(self, busy: bool):
+        # solange ein Job Engine/Datei verändert: keine konkurrierenden Aktionen oder Edits
+        for b in (
+            self.btn_start, self.btn_add_source, self.btn_clear_sources, self.btn_priority, self.btn_add_col, self.btn_links, self.btn_cuts, self.btn_fill_row, self.btn_fill_all, self.btn_conflicts,
+            self.btn_prev, self.btn_next, self.btn_save_as, self.btn_save_inplace, self.btn_save, self.btn_restore,
+        ):
+            b.setEnabled(not busy)
+        self.t1_view.setEditTriggers(QAbstractItemView.NoEditTriggers if busy else self._t1_edit_triggers)
+        self.t1_view.setAcceptDrops(not busy)
+
+    def _on_job_failed(self, e: Exception):
+        QMessageBox.critical(self, "Fehler", str(e))
+
+    # ---------------- weitere Quellen ----------------
+    @staticmethod
+    def _source_name(table) -> str:
+        return f"{table.path.name} [{table.sheet}]"
+
+    def add_source(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Weitere Quelle", "", "Excel (*.xlsx *.xlsm *.xls)")
+        if not path:
+            return
+        sheet, ok = QInputDialog.getItem(self, "Weitere Quelle", "Sheet:", list_sheets(path), 0, False)
+        if not ok:
+            return
+        header, ok = QInputDialog.getInt(self, "Weitere Quelle", "Header-Zeile:", 1, 1, 1000)
+        if not ok:
+            return
+        self.jobs.submit(
+            f"Lade Quelle ({sheet})", lambda job: load_table(path, sheet, header),
+            on_done=self._on_source_loaded, on_failed=self._on_job_failed, exclusive=False,
+        )
+
+    def _on_source_loaded(self, table):
+        name = self._source_name(table)
+        if (self.t2 and name == self._source_name(self.t2)) or any(s["name"] == name for s in self.extra_sources):
+            QMessageBox.information(self, "Weitere Quelle", f"{name} ist bereits geladen.")
+            return
+        cols = table.df.columns.tolist()
+        main_key = self.kp_t2_key.columns()
+        current = cols.index(main_key[0]) if main_key and main_key[0] in cols else 0
+        key, ok = QInputDialog.getItem(
+            self, "Weitere Quelle", f"KEY-Spalte(n) in {name}\n(zusammengesetzt z. B. \"PLZ,Name:lower\"):", cols, current, True,
+        )
+        if not ok or not key.strip():
+            return
+        self.extra_sources.append({"name": name, "table": table, "key": key.strip()})
+        self._update_sources_label()
+        self.status.setText(f"Quelle {name} hinzugefügt – wirkt ab dem nächsten Start.")
+
+    def clear_sources(self):
+        self.extra_sources.clear()
+        self.source_links.clear()
+        self._update_sources_label()
+
+    def _update_sources_label(self):
+        self.lbl_sources.setText(", ".join(s["name"] for s in self.extra_sources) or "—")
+
+    def open_priority_dialog(self):
+        if not self.engine or len(self.engine.sources) < 2:
+            QMessageBox.information(self, "Quellen-Vorrang", "Erst weitere Quellen hinzufügen und Start ausführen.")
+            return
+        names = [src.name for src in self.engine.sources]
+        cols = list(dict.fromkeys(c for src in self.engine.sources for c in src.links(self.col_links)))
+
+        dlg = QDialog(self)
+        dlg.setWindowTitle("Quellen-Vorrang je Spalte")
+        layout = QVBoxLayout(dlg)
+        form = QFormLayout()
+        layout.addLayout(form)
+
+        combos: dict[str, QComboBox] = {}
+        for col in cols:
+            cb = QComboBox()
+            cb.addItem("")  # Standard: Reihenfolge T2, dann weitere Quellen
+            cb.addItems(names)
+            pref = self.settings.source_priority.get(col)
+            if pref and pref[0] in names:
+                cb.setCurrentText(pref[0])
+            combos[col] = cb
+            form.addRow(col, cb)
+
+        row = QHBoxLayout()
+        btn_ok = QPushButton("Speichern")
+        btn_cancel = QPushButton("Abbrechen")
+        row.addWidget(btn_ok)
+        row.addWidget(btn_cancel)
+        layout.addLayout(row)
+
+        def on_ok():
+            for col, cb in combos.items():
+                first = cb.currentText()
+                if first:
+                    self.settings.source_priority[col] = [first] + [n for n in names if n != first]
+                else:
+                    self.settings.source_priority.pop(col, None)
+            self._save_settings()
+            dlg.accept()
+
+        btn_ok.clicked.connect(on_ok)
+        btn_cancel.clicked.connect(dlg.reject)
+        dlg.exec()
 
     # ---------------- Scan ----------------
     def start_scan(self):
+        if self.jobs.running:
+            self.status.setText("Bitte warten, bis das Laden abgeschlossen ist.")
+            return
         if not self.t1 or not self.t2:
             QMessageBox.warning(self, "Fehlt", "Bitte beide Tabellen laden.")
             return
 
-        self.engine = MatchEngine(
-            self.t1.df, self.cb_t1_key.currentText(),
-            self.t2.df, self.cb_t2_key.currentText()
-        )
+        t1, t2 = self.t1, self.t2
+        extras = [(src["name"], src["table"].df, src["key"], self.source_links.get(src["name"])) for src in self.extra_sources]
+        key1, key2 = self.kp_t1_key.parts(), self.kp_t2_key.parts()
+        col_links = dict(self.col_links) if self.settings.conflicts_first else {}
+        if not key1 or len(key1) != len(key2):
+            QMessageBox.warning(self, "KEY", "Bitte in beiden Tabellen gleich viele KEY-Spalten wählen (zusammengesetzter KEY: Teile in gleicher Reihenfolge).")
+            return
 
-        cols = [c for c in self.engine.df1.columns if c not in ["_KEY_", self.cb_t1_key.currentText()]]
-        self.keys_queue = self.engine.keys_with_missing(cols)
+        # gleiche T1 wie beim letzten Scan -> deren ungespeicherte Änderungen übernehmen
+        dirty = set(self.engine.dirty) if self.engine is not None and self.engine.df1 is t1.df else None
+
+        def work(job):
+            # Engine auf Kopien: MatchEngine ergänzt _KEY_ in den Frames, die T1-Ansicht liest derweil t1.df;
+            # die Kopien werden erst in _on_scan_done (UI-Thread) übernommen
+            engine = MatchEngine(t1.df.copy(), key1, t2.df.copy(), key2, source_name=self._source_name(t2), dirty=dirty)
+            for name, df, key, links in extras:
+                engine.add_source(name, df.copy(), key, links)
+            job.report(0, 0, "Suche Lücken…")
+            cols = [c for c in engine.df1.columns if c != "_KEY_" and c not in engine.key1_cols]
+            scan = engine.scan_missing(cols)
+            if not col_links:
+                return engine, scan, None
+            job.report(0, 0, "Suche Konflikte…")
+            return engine, scan, find_conflicts(engine, col_links)
+
+        self.jobs.submit("Scan", work, on_done=self._on_scan_done, on_failed=self._on_job_failed)
+
+    def _on_scan_done(self, result):
+        self.engine, scan, conflicts = result
+        # Tabellen zeigen ab jetzt auf die Frames der Engine (Bearbeitungen bleiben beim nächsten Scan erhalten)
+        self.t1.df, self.t2.df = self.engine.df1, self.engine.df2
+        for src, engine_src in zip(self.extra_sources, self.engine.sources[1:]):
+            src["table"].df = engine_src.df
+        self._reset_key_cache()
+        self._rebind_t1()
+        self.keys_queue = scan.keys
         self.current_pos = -1
+        self._set_conflicts(conflicts)
+        if conflicts is not None:
+            self.keys_queue = conflicts_first(self.keys_queue, conflicts.keys)
 
-        self.status.setText(f"{len(self.keys_queue)} Kundennummern mit Lücken gefunden")
+        self.status.setText(f"{len(self.keys_queue)} Kundennummern mit Lücken gefunden ({int(scan.col_counts.sum())} leere Zellen)")
         self.next_key()
+        self._start_candidate_search()
+
+    # ---------------- Kandidaten (ohne exakten KEY) ----------------
+    def _start_candidate_search(self):
+        self._cand_gen += 1
+        gen = self._cand_gen
+        self.candidates, self._candidate_rows = None, {}
+        engine = self.engine
+        # zusammengesetzter KEY taugt nicht als Name
+        keys = (None, None) if engine.composite else (engine.key1, engine.key2)
+        fields = resolve_fields(engine.df1.columns, engine.df2.columns, self.col_links, *keys)
+        labels = engine.t1_labels_without_match()
+        if not labels or "name" not in fields:
+            return
+        # Schnappschuss im UI-Thread; der Job liest danach nichts mehr aus der Engine
+        t1_cols = {f: c[0] for f, c in fields.items()}
+        t2_cols = {f: c[1] for f, c in fields.items()}
+        q_df = engine.df1.loc[labels, list(dict.fromkeys(t1_cols.values()))].copy()
+        t2_df = engine.df2[list(dict.fromkeys(t2_cols.values()))].copy()
+
+        def work(job):
+            index = CandidateIndex.build(t2_df, t2_cols)
+            job.report(0, len(q_df), "Index aufgebaut")
+            return find_candidates(index, normalize_fields(q_df, t1_cols), progress=job.report)
+
+        self.jobs.submit(
+            "Kandidaten", work,
+            on_done=lambda r: self._on_candidates_done(gen, r),
+            on_failed=self._on_job_failed,
+            exclusive=False,
+        )
+
+    def _on_candidates_done(self, gen: int, result):
+        if gen != self._cand_gen:
+            return
+        self.candidates = result
+        self._candidate_rows = result.groupby("t1_label", sort=False).indices
+        if self.current_key is not None and not self.jobs.busy:
+            self.show_key(self.current_key)
+
+    def _candidate_frame(self, t1_idx):
+        # T2-Zeilen der Kandidaten (bestes zuerst) mit Score-Spalte vorn
+        pos = self._candidate_rows.get(t1_idx)
+        if pos is None or self.candidates is None:
+            return None
+        c = self.candidates.iloc[pos]
+        df = self.engine.df2.iloc[c["t2_pos"].to_numpy()].copy()
+        df.insert(0, "Score", [f"{v:.2f}" for v in c["score"]])
+        return df
+
+    def _reset_key_cache(self):
+        if self.key_cache is not None:
+            self.key_cache.close()
+        self.key_cache = KeyViewCache(self.engine) if self.engine else None
 
     # ---------------- Navigation ----------------
     def next_key(self):
@@ -464,113 +788,131 @@ class MainWindow(QMainWindow):
             self.current_pos -= 1
             self.show_key(self.keys_queue[self.current_pos])
 
-    # ---------------- Show key with 2-line split ----------------
+    # ---------------- Show key ----------------
     def show_key(self, key: str):
         self.current_key = key
-        idx = self.engine.t1_row_index_for_key(key)
-
-        all_t1_cols = [c for c in self.engine.df1.columns if c != "_KEY_"]
-        self._t1_cols_top = all_t1_cols[:20]
-        self._t1_cols_bottom = all_t1_cols[20:]
-
-        row = self.engine.df1.loc[idx]
-
-        def render_t1(view, cols):
-            view.blockSignals(True)
-            view.setColumnCount(len(cols))
-            view.setHorizontalHeaderLabels(cols)
-            view.setRowCount(1)
-            for i, col in enumerate(cols):
-                view.setItem(0, i, QTableWidgetItem("" if row.get(col) is None else str(row.get(col))))
-            view.blockSignals(False)
-
-        render_t1(self.t1_view_top, self._t1_cols_top)
-        if len(all_t1_cols) > 20:
-            self.t1_view_bottom.show()
-            render_t1(self.t1_view_bottom, self._t1_cols_bottom)
-        else:
-            self.t1_view_bottom.hide()
-
-        df2 = self.engine.t2_rows_for_key(key)
+        # vorbereitet (LRU/Prefetch) oder jetzt gebaut
+        view = self.key_cache.get(key)
+        idx = view.t1_idx
+
+        # T1: nur zur Zeile springen; das Model wird nach Änderungen neu eingelesen, nicht beim Navigieren
+        if idx is not None:
+            row = self.t1_model.row_for_label(idx)
+            col = max(self.t1_view.currentIndex().column(), 0)
+            target = self.t1_model.index(row, col)
+            self.t1_view.setCurrentIndex(target)
+            self.t1_view.scrollTo(target, QAbstractItemView.PositionAtCenter)
+
+        # T2: ein Model für beide Views; gezeichnet werden nur sichtbare Zellen
+        df2 = view.t2_rows
+        cand = self._candidate_frame(idx) if len(df2) == 0 and idx is not None else None
+        if cand is not None:
+            df2 = cand
+        self.dock_t2.setWindowTitle("Tabelle 2 – Kandidaten (kein exakter KEY)" if cand is not None else "Tabelle 2 (Quelle)")
         all_t2_cols = [c for c in df2.columns if c != "_KEY_"]
-        self._t2_cols_top = all_t2_cols[:20]
-        self._t2_cols_bottom = all_t2_cols[20:]
-
-        def render_t2(view, cols):
-            view.setColumnCount(len(cols))
-            view.setHorizontalHeaderLabels(cols)
-            view.setRowCount(len(df2))
-            for r in range(len(df2)):
-                for c, col in enumerate(cols):
-                    view.setItem(r, c, QTableWidgetItem("" if df2.iloc[r].get(col) is None else str(df2.iloc[r].get(col))))
-
-        render_t2(self.t2_view_top, self._t2_cols_top)
-        if len(all_t2_cols) > 20:
-            self.t2_view_bottom.show()
-            render_t2(self.t2_view_bottom, self._t2_cols_bottom)
-        else:
-            self.t2_view_bottom.hide()
-
-        self.status.setText(f"KEY {key} ({self.current_pos+1}/{len(self.keys_queue)})")
+        self._t2_cols_top = set(all_t2_cols[:20])
+        self._t2_cols_bottom = set(all_t2_cols[20:])
+        self.t2_model.set_frame(df2, row_offset=1, arrays=view.t2_arrays if cand is None else None)
+        self.t2_view_bottom.setVisible(len(all_t2_cols) > 20)
+
+        dup = len(view.t1_labels) - 1
+        dup_txt = f" – {dup} weitere T1-Zeile(n) mit gleichem KEY" if dup > 0 else ""
+        conflict = self._conflict_cols.get(key)
+        if conflict:
+            dup_txt += f" – Quellen widersprechen sich: {', '.join(conflict)}"
+        self.status.setText(f"KEY {self.engine.key_label(key)} ({self.current_pos+1}/{len(self.keys_queue)}){dup_txt}")
 
         self._apply_table_prefs("t1")
         self._apply_table_prefs("t2")
+        self.key_cache.prefetch(self.keys_queue, self.current_pos)
 
-        self.t1_view_top.setCurrentCell(0, 0)
 
     # ---------------- Sync edits / drops ----------------
-    def on_t1_item_changed_any(self, item: QTableWidgetItem):
-        if not self.engine or self.current_key is None:
+    def on_t1_value_edited(self, idx, col_name: str, text: str):
+        if not self.engine or self.jobs.busy:
             return
-        t1_idx = self.engine.t1_row_index_for_key(self.current_key)
-        if t1_idx is None:
+        was_current = self.current_key is not None and self.engine.df1.at[idx, "_KEY_"] == self.current_key
+        self.engine.set_t1_value(idx, col_name, text)
+        if col_name in self.engine.key1_cols and was_current:
+            self.current_key = self.engine.df1.at[idx, "_KEY_"]
+
+    def _block_targets(self, anchor_col: int, block) -> tuple[list, str]:
+        # Quellspalten alle gekoppelt -> gekoppelte T1-Spalten; sonst ab der Zielspalte in sichtbarer Reihenfolge
+        width = max((len(row) for row in block.rows), default=0)
+        if block.columns:
+            # Blöcke kommen aus der T2-Ansicht -> nur die Kopplungen der Hauptquelle
+            reverse: dict[str, str] = {}
+            for t1_col, t2_col in self.engine.sources[0].links(self.col_links).items():
+                reverse.setdefault(t2_col, t1_col)
+            linked = [reverse.get(c) for c in block.columns]
+            if all(linked):
+                return linked, "über Kopplungen"
+        header = self.t1_view.horizontalHeader()
+        logical = (header.logicalIndex(v) for v in range(header.visualIndex(anchor_col), header.count()))
+        cols = [self.t1_model.column_name(c) for c in logical if not header.isSectionHidden(c)][:width]
+        return cols + [None] * (width - len(cols)), "ab Zielspalte"
+
+    def on_t1_block_dropped(self, anchor, block):
+        # Block aus T2 (Drag) oder Zwischenablage: Form bleibt erhalten, ein gebündeltes Update
+        if not self.engine or self.jobs.busy:
+            return
+        model, df1 = self.t1_model, self.engine.df1
+        targets, how = self._block_targets(anchor.column(), block)
+        n_rows = min(len(block.rows), model.rowCount() - anchor.row())
+        cells = [
+            (model.row_label(anchor.row() + r), col, value)
+            for r in range(n_rows)
+            for value, col in zip(block.rows[r], targets)
+            if value is not None and col is not None
+        ]
+        if not cells:
             return
 
-        view = item.tableWidget()
-        if view == self.t1_view_top:
-            col_name = self._t1_cols_top[item.column()]
-        else:
-            col_name = self._t1_cols_bottom[item.column()]
-
-        self.engine.df1.at[t1_idx, col_name] = item.text()
-
-    def on_t1_cell_dropped(self, view, row: int, col: int, text: str):
-        if not self.engine or self.current_key is None:
+        filled = [c for c in cells if not is_missing(df1.at[c[0], c[1]])]
+        if filled:
+            box = QMessageBox(self)
+            box.setWindowTitle("Block einfügen")
+            box.setText(f"{len(filled)} von {len(cells)} Zielzellen sind bereits gefüllt.")
+            btn_empty = box.addButton("Nur leere füllen", QMessageBox.AcceptRole)
+            btn_replace = box.addButton("Ersetzen", QMessageBox.DestructiveRole)
+            box.addButton(QMessageBox.Cancel)
+            box.exec()
+            if box.clickedButton() is btn_empty:
+                skip = {(c[0], c[1]) for c in filled}
+                cells = [c for c in cells if (c[0], c[1]) not in skip]
+            elif box.clickedButton() is not btn_replace:
+                return
+
+        anchor_label = model.row_label(anchor.row())
+        was_current = self.current_key is not None and df1.at[anchor_label, "_KEY_"] == self.current_key
+        self.engine.set_t1_values(cells)
+        model.refresh()
+        if was_current:
+            self.current_key = df1.at[anchor_label, "_KEY_"]
+        self.status.setText(f"{len(cells)} Zellen eingefügt ({how}).")
+
+    def quick_copy_from_t2(self, index):
+        if not index.isValid() or not self.engine or self.current_key is None:
             return
         t1_idx = self.engine.t1_row_index_for_key(self.current_key)
         if t1_idx is None:
             return
 
-        if view == self.t1_view_top:
-            col_name = self._t1_cols_top[col]
-        else:
-            col_name = self._t1_cols_bottom[col]
-
-        self.engine.df1.at[t1_idx, col_name] = text
-
-    def quick_copy_from_t2(self, t2_view, r: int, c: int):
-        item = t2_view.item(r, c)
-        if not item:
-            return
-        text = item.text()
-
-        target_view = self.t1_view_top
-        target_col = target_view.currentColumn()
-        if target_col < 0:
-            target_col = 0
-
-        target_view.blockSignals(True)
-        target_view.setItem(0, target_col, QTableWidgetItem(text))
-        target_view.blockSignals(False)
-        self.on_t1_cell_dropped(target_view, 0, target_col, text)
+        row = self.t1_model.row_for_label(t1_idx)
+        col = max(self.t1_view.currentIndex().column(), 0)
+        self.t1_model.setData(self.t1_model.index(row, col), index.data(Qt.DisplayRole) or "", Qt.EditRole)
 
     # ---------------- Save buttons ----------------
     def save_new_file(self):
         if not self.engine or not self.t1:
             return
         from app.services.apply_changes import save_filled
-        out = save_filled(self.engine.df1, self.t1.path.parent, self.t1.path.stem)
-        QMessageBox.information(self, "Gespeichert", str(out))
+        df, t1 = self.engine.df1, self.t1
+        self.jobs.submit(
+            "Speichern", lambda job: save_filled(df, t1.path.parent, t1.path.stem, progress=job.report),
+            on_done=lambda out: QMessageBox.information(self, "Gespeichert", str(out)),
+            on_failed=self._on_job_failed,
+        )
 
     def save_as(self):
         if not self.engine:
@@ -582,43 +924,105 @@ class MainWindow(QMainWindow):
         path, _ = QFileDialog.getSaveFileName(self, "Speichern unter…", default, "Excel (*.xlsx)")
         if not path:
             return
-        out = save_to_path(self.engine.df1, path)
-        QMessageBox.information(self, "Gespeichert", str(out))
+        df = self.engine.df1
+        self.jobs.submit(
+            "Speichern", lambda job: save_to_path(df, path, progress=job.report),
+            on_done=lambda out: QMessageBox.information(self, "Gespeichert", str(out)),
+            on_failed=self._on_job_failed,
+        )
 
     def save_inplace(self):
         if not self.engine or not self.t1:
             return
         from app.services.apply_changes import save_in_place
-        try:
-            out = save_in_place(self.engine.df1, self.t1.path, self.t1.sheet, make_backup=True)
-            QMessageBox.information(self, "Gespeichert", f"In Datei gespeichert (Backup erstellt):\n{out}")
-        except PermissionError:
+        engine, t1, store = self.engine, self.t1, self._backup_store()
+        # Patch-Speichern ist nicht abbrechbar (Datei würde halb geschrieben)
+        self.jobs.submit(
+            "Speichern (gleiche Datei)",
+            lambda job: save_in_place(
+                engine.df1, t1.path, t1.sheet, make_backup=True,
+                dirty=engine.dirty, header_row_1based=t1.header_row, source_columns=t1.source_columns,
+                backup_store=store,
+            ),
+            on_done=self._on_saved_inplace,
+            on_failed=self._on_save_inplace_failed,
+        )
+
+    def _on_saved_inplace(self, out):
+        self.engine.dirty.clear()
+        self.t1.source_columns = [c for c in self.engine.df1.columns if c != "_KEY_"]
+        QMessageBox.information(self, "Gespeichert", f"In Datei gespeichert (Backup erstellt):\n{out}")
+
+    def _on_save_inplace_failed(self, e: Exception):
+        if isinstance(e, PermissionError):
             QMessageBox.critical(self, "Fehler", "Datei ist vermutlich in Excel geöffnet. Bitte schließen und erneut speichern.")
-        except Exception as e:
+        else:
             QMessageBox.critical(self, "Fehler", f"Speichern fehlgeschlagen:\n{e}")
 
+    def _backup_store(self):
+        from app.services.backup_store import BackupStore
+        return BackupStore(keep_last=self.settings.backup_keep_last, max_age_days=self.settings.backup_max_age_days)
+
+    def restore_backup(self):
+        if not self.t1:
+            QMessageBox.warning(self, "Fehlt", "Bitte zuerst Tabelle 1 laden.")
+            return
+        store = self._backup_store()
+        versions = list(reversed(store.versions(self.t1.path)))
+        if not versions:
+            QMessageBox.information(self, "Backups", "Für diese Datei gibt es keine Backups.")
+            return
+        labels = [f"{v.ts}  ({v.size // 1024} KB, {v.sha256[:10]})" for v in versions]
+        choice, ok = QInputDialog.getItem(self, "Backup wiederherstellen", f"Version für {self.t1.path.name}:", labels, 0, False)
+        if not ok:
+            return
+        try:
+            store.restore(self.t1.path, versions[labels.index(choice)])
+        except PermissionError:
+            QMessageBox.critical(self, "Fehler", "Datei ist vermutlich in Excel geöffnet. Bitte schließen und erneut versuchen.")
+            return
+        self.load_t1(str(self.t1.path))
+        self.engine = None
+        self._reset_key_cache()
+        self._cand_gen += 1
+        self.candidates, self._candidate_rows = None, {}
+        self._set_conflicts(None)
+        self.t1_model.set_frame(None)
+        QMessageBox.information(self, "Wiederhergestellt", f"{self.t1.path.name} auf Stand {choice} zurückgesetzt.\nBitte Start erneut ausführen.")
+
     # ---------------- Copplings ----------------
     def open_links_dialog(self):
         if not self.engine:
             QMessageBox.warning(self, "Fehlt", "Bitte erst Start ausführen.")
             return
 
+        # mehrere Quellen: erst wählen, für welche die Kopplungen gelten
+        src = self.engine.sources[0]
+        if len(self.engine.sources) > 1:
+            names = [s.name for s in self.engine.sources]
+            name, ok = QInputDialog.getItem(self, "Kopplungen", "Quelle:", names, 0, False)
+            if not ok:
+                return
+            src = self.engine.source(name)
+        main = src is self.engine.sources[0]
+        links = self.col_links if main else src.links(self.col_links)
+
         dlg = QDialog(self)
-        dlg.setWindowTitle("Spalten-Kopplungen (T1 → T2)")
+        dlg.setWindowTitle(f"Spalten-Kopplungen (T1 → {'T2' if main else src.name})")
         layout = QVBoxLayout(dlg)
         form = QFormLayout()
         layout.addLayout(form)
 
         t1_cols = [c for c in self.engine.df1.columns if c != "_KEY_"]
-        t2_cols = [c for c in self.engine.df2.columns if c != "_KEY_"]
+        t2_cols = [c for c in src.df.columns if c != "_KEY_"]
 
         combos: dict[str, QComboBox] = {}
         for t1 in t1_cols:
             cb = QComboBox()
             cb.addItem("")
             cb.addItems(t2_cols)
-            if t1 in self.col_links:
-                cb.setCurrentText(self.col_links[t1])
+            if t1 in links:
+                cb.setCurrentText(links[t1])
             combos[t1] = cb
             form.addRow(t1, cb)
 
@@ -630,9 +1034,15 @@ class MainWindow(QMainWindow):
         layout.addLayout(row)
 
         def on_ok():
-            self.col_links = {t1: combos[t1].currentText().strip() for t1 in t1_cols if combos[t1].currentText().strip()}
-            self.settings.col_links = dict(self.col_links)
-            self._save_settings_now()
+            chosen = {t1: combos[t1].currentText().strip() for t1 in t1_cols if combos[t1].currentText().strip()}
+            if main:
+                self.col_links = chosen
+                self.settings.col_links = dict(self.col_links)
+                self._save_settings()
+            else:
+                # gilt für diese Sitzung (Quellen werden nicht gespeichert)
+                src.col_links = chosen
+                self.source_links[src.name] = chosen
             dlg.accept()
 
         btn_ok.clicked.connect(on_ok)
@@ -679,7 +1089,7 @@ class MainWindow(QMainWindow):
             self.cuts["infer_state_from_zip"] = cb_state.isChecked()
             self.settings.cuts = dict(self.cuts)
             self.settings.country_default_value = self.country_default_value
-            self._save_settings_now()
+            self._save_settings()
             dlg.accept()
 
         btn_country.clicked.connect(on_country)
@@ -695,62 +1105,18 @@ class MainWindow(QMainWindow):
         if t1_idx is None:
             return
 
-        t2_df = self.engine.t2_rows_for_key(self.current_key)
-        if t2_df is None or len(t2_df) == 0:
-            QMessageBox.information(self, "Auto-Fill", "Keine passende Kundennummer in Tabelle 2 gefunden.")
+        # irgendeine Quelle (T2 oder weitere) muss den KEY kennen
+        if not any(self.current_key in src.groups.groups for src in self.engine.sources):
+            hint = "\nÄhnliche Einträge stehen als Kandidaten im T2-Dock." if self._candidate_rows.get(t1_idx) is not None else ""
+            QMessageBox.information(self, "Auto-Fill", f"Keine passende Kundennummer in Tabelle 2 gefunden.{hint}")
             return
 
-        display_cols = [c for c in self.engine.df1.columns if c != "_KEY_"]
-        key_col = self.cb_t1_key.currentText()
-
-        filled = 0
-
-        for t1_col in display_cols:
-            if t1_col == key_col:
-                continue
-            if not is_missing(self.engine.df1.at[t1_idx, t1_col]):
-                continue
-
-            t2_col = self.col_links.get(t1_col)
-            if not t2_col or t2_col not in t2_df.columns:
-                continue
-
-            chosen = None
-            for _, r in t2_df.iterrows():
-                v = r.get(t2_col)
-                if not is_missing(v):
-                    chosen = str(v).strip()
-                    if chosen:
-                        break
-            if not chosen:
-                continue
-
-            if self.cuts.get("split_street_house", True) and t1_col.lower() in ("street", "straße"):
-                street, house = split_street_house(chosen)
-                chosen = street
-                for cand in ("houseNumber", "hausnummer"):
-                    if cand in self.engine.df1.columns and is_missing(self.engine.df1.at[t1_idx, cand]) and house:
-                        self.engine.df1.at[t1_idx, cand] = house
-
-            if self.cuts.get("normalize_phone", True) and t1_col.lower() in ("phone", "phonegeneral", "telefon", "festnetz", "mobil", "mobilgeneral"):
-                chosen = normalize_phone(chosen)
-
-            self.engine.df1.at[t1_idx, t1_col] = chosen
-            filled += 1
-
-        if self.cuts.get("fill_country_default", False) and "country" in self.engine.df1.columns and is_missing(self.engine.df1.at[t1_idx, "country"]):
-            self.engine.df1.at[t1_idx, "country"] = self.country_default_value
-
-        if self.cuts.get("infer_state_from_zip", False) and "state" in self.engine.df1.columns and is_missing(self.engine.df1.at[t1_idx, "state"]):
-            z = None
-            for cand in ("zipCode", "plz", "postalCode"):
-                if cand in self.engine.df1.columns:
-                    z = self.engine.df1.at[t1_idx, cand]
-                    break
-            st = state_from_zip_de(z) if z else None
-            if st:
-                self.engine.df1.at[t1_idx, "state"] = st
+        filled = sum(autofill_linked(
+            self.engine, self.col_links, self.cuts, self.country_default_value,
+            rows=[t1_idx], priority=self.settings.source_priority,
+        ).values())
 
+        self.t1_model.refresh_row(self.t1_model.row_for_label(t1_idx))
         self.show_key(self.current_key)
         QMessageBox.information(self, "Auto-Fill", f"{filled} Felder (Zeile) plausibel gefüllt.")
 
@@ -763,66 +1129,105 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Fehlt", "Bitte erst Kopplungen definieren.")
             return
 
-        key_col = self.cb_t1_key.currentText()
-        total_filled = 0
+        engine, col_links, cuts, country = self.engine, dict(self.col_links), dict(self.cuts), self.country_default_value
+        priority = {k: list(v) for k, v in self.settings.source_priority.items()}
+        # der Job schreibt in engine.df1 -> Ansicht solange lösen, sonst liest das Model parallel mit
+        self.t1_model.set_frame(None)
+        self.jobs.submit(
+            "Plausibel füllen",
+            lambda job: autofill_linked(engine, col_links, cuts, country, progress=job.report, priority=priority),
+            on_done=self._on_fill_all_done,
+            on_failed=self._on_fill_all_failed,
+            on_cancelled=self._on_fill_all_cancelled,
+        )
 
-        for idx, row in self.engine.df1.iterrows():
-            key = row.get("_KEY_")
-            if not key:
-                continue
+    def _rebind_t1(self):
+        self.t1_model.set_frame(self.engine.df1, row_offset=self.t1.header_row + 1)
 
-            t2_df = self.engine.t2_rows_for_key(key)
-            if t2_df is None or len(t2_df) == 0:
-                continue
+    def _on_fill_all_done(self, filled: dict):
+        self._rebind_t1()
+        if self.current_key is not None:
+            self.show_key(self.current_key)
+        QMessageBox.information(self, "Auto-Fill Gesamt", f"{sum(filled.values())} Zellen in der gesamten Tabelle gefüllt.")
 
-            for t1_col, t2_col in self.col_links.items():
-                if t1_col in ("_KEY_", key_col):
-                    continue
-                if t1_col not in self.engine.df1.columns or t2_col not in t2_df.columns:
-                    continue
-                if not is_missing(self.engine.df1.at[idx, t1_col]):
-                    continue
-
-                chosen = None
-                for _, r2 in t2_df.iterrows():
-                    v = r2.get(t2_col)
-                    if not is_missing(v):
-                        chosen = str(v).strip()
-                        if chosen:
-                            break
-                if not chosen:
-                    continue
-
-                if self.cuts.get("normalize_phone", True) and t1_col.lower() in ("phone", "phonegeneral", "telefon", "festnetz", "mobil", "mobilgeneral"):
-                    chosen = normalize_phone(chosen)
-
-                self.engine.df1.at[idx, t1_col] = chosen
-                total_filled += 1
-
-                if self.cuts.get("split_street_house", True) and t1_col.lower() in ("street", "straße"):
-                    street, house = split_street_house(chosen)
-                    self.engine.df1.at[idx, t1_col] = street
-                    for cand in ("houseNumber", "hausnummer"):
-                        if cand in self.engine.df1.columns and is_missing(self.engine.df1.at[idx, cand]) and house:
-                            self.engine.df1.at[idx, cand] = house
-
-            if self.cuts.get("fill_country_default", False) and "country" in self.engine.df1.columns and is_missing(self.engine.df1.at[idx, "country"]):
-                self.engine.df1.at[idx, "country"] = self.country_default_value
-
-            if self.cuts.get("infer_state_from_zip", False) and "state" in self.engine.df1.columns and is_missing(self.engine.df1.at[idx, "state"]):
-                z = None
-                for cand in ("zipCode", "plz", "postalCode"):
-                    if cand in self.engine.df1.columns:
-                        z = self.engine.df1.at[idx, cand]
-                        break
-                st = state_from_zip_de(z) if z else None
-                if st:
-                    self.engine.df1.at[idx, "state"] = st
+    def _on_fill_all_failed(self, e: Exception):
+        self._rebind_t1()
+        if self.current_key is not None:
+            self.show_key(self.current_key)
+        self._on_job_failed(e)
 
+    def _on_fill_all_cancelled(self):
+        self._rebind_t1()
         if self.current_key is not None:
             self.show_key(self.current_key)
+        self.status.setText("Auto-Fill abgebrochen – bereits gefüllte Spalten bleiben erhalten.")
+
+    # ---------------- Konflikte ----------------
+    def _set_conflicts(self, report):
+        self.conflicts = report
+        self._conflict_cols = report.columns_by_key() if report is not None else {}
 
-        QMessageBox.information(self, "Auto-Fill Gesamt", f"{total_filled} Zellen in der gesamten Tabelle gefüllt.")
+    def find_conflicts_report(self):
+        if not self.engine:
+            QMessageBox.warning(self, "Fehlt", "Bitte erst Start ausführen.")
+            return
+        if not self.col_links:
+            QMessageBox.warning(self, "Fehlt", "Bitte erst Kopplungen definieren.")
+            return
+        engine, col_links = self.engine, dict(self.col_links)
+        self.jobs.submit(
+            "Konflikte", lambda job: find_conflicts(engine, col_links),
+            on_done=self._on_conflicts_done,
+            on_failed=self._on_job_failed,
+        )
+
+    def _on_conflicts_done(self, report):
+        self._set_conflicts(report)
+        if not report.keys:
+            QMessageBox.information(self, "Konflikte", "Keine widersprüchlichen Quellwerte zu gekoppelten Spalten gefunden.")
+            return
+
+        box = QMessageBox(self)
+        box.setWindowTitle("Konflikte")
+        box.setIcon(QMessageBox.Warning)
+        box.setText(
+            f"{len(report.keys)} KEY(s) mit widersprüchlichen Quellwerten ({len(report.table)} Spalten-Fälle).\n"
+            "Plausibel füllen übernimmt dort den ersten Wert der Quelle."
+        )
+        cb_first = QCheckBox("Konflikt-KEYs in der Reihenfolge nach vorn (auch nach künftigen Scans)")
+        cb_first.setChecked(self.settings.conflicts_first)
+        box.setCheckBox(cb_first)
+        btn_save = box.addButton("Bericht speichern…", QMessageBox.ActionRole)
+        box.addButton(QMessageBox.Close)
+        box.exec()
+
+        if cb_first.isChecked() != self.settings.conflicts_first:
+            self.settings.conflicts_first = cb_first.isChecked()
+            self._save_settings()
+        queue = conflicts_first(self.keys_queue, report.keys) if cb_first.isChecked() else self.keys_queue
+        if queue != self.keys_queue:
+            self.keys_queue, self.current_pos = queue, -1
+            self.next_key()
+        elif self.current_key is not None:
+            self.show_key(self.current_key)
+        if box.clickedButton() is btn_save:
+            self._save_conflict_report(report)
+
+    def _save_conflict_report(self, report):
+        from app.services.apply_changes import write_xlsx_streaming
+        default = "konflikte.xlsx"
+        if self.t1:
+            default = str(self.t1.path.with_name(self.t1.path.stem + "_konflikte.xlsx"))
+        path, _ = QFileDialog.getSaveFileName(self, "Konflikt-Bericht speichern", default, "Excel (*.xlsx)")
+        if not path:
+            return
+        table = report.table
+        self.jobs.submit(
+            "Bericht speichern", lambda job: write_xlsx_streaming(table, path, sheet_name="Konflikte", progress=job.report),
+            on_done=lambda out: QMessageBox.information(self, "Gespeichert", str(out)),
+            on_failed=self._on_job_failed,
+            exclusive=False,
+        )
 
     # ---------------- Add column ----------------
     def add_column_t1_global(self):
@@ -849,6 +1254,7 @@ class MainWindow(QMainWindow):
             return
 
         self.engine.df1[name] = default_value or ""
+        self.t1_model.refresh()
 
         if self.current_key is not None:
             self.show_key(self.current_key)
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from typing import Callable
+
+import pandas as pd
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtGui import QBrush
+
+
+# vorab berechnet: data()/flags() laufen für jede sichtbare Zelle und Rolle
+_DISPLAY_ROLES = (Qt.DisplayRole, Qt.EditRole)
+_EDIT_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable | Qt.ItemIsDropEnabled
+_SOURCE_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled
+
+
+def _display(v) -> str:
+    if v is None or v is pd.NA or (isinstance(v, float) and v != v):
+        return ""
+    return str(v)
+
+
+class DataFrameModel(QAbstractTableModel):
+    # Liest direkt aus dem DataFrame (kein Kopieren in Items); Qt fragt nur sichtbare Zellen ab.
+    # Edits laufen über on_edit(index_label, column, text), damit die Engine sie protokollieren kann.
+    # editable=False: reine Quelle (T2), Zellen nur auswählbar/ziehbar.
+    def __init__(self, on_edit: Callable[[object, str, str], None] | None = None, hidden_columns=("_KEY_",), editable: bool = True, parent=None):
+        super().__init__(parent)
+        self._df: pd.DataFrame | None = None
+        self._on_edit = on_edit
+        self._editable = editable
+        self._cell_flags = _EDIT_FLAGS if editable else _SOURCE_FLAGS
+        self._hidden = set(hidden_columns)
+        self._columns: list[str] = []
+        self._positions: list[int] = []
+        self._nrows = 0
+        # Spalten-Arrays werden erst beim ersten Zeichnen geholt; refresh() verwirft sie
+        self._arrays: dict[int, object] = {}
+        self._header_data: dict[tuple[int, int], object] = {}
+        self.row_offset = 1  # Zeilennummer im Kopf = Excel-Zeile
+        # zählt Model-Resets; danach hat der QHeaderView Reihenfolge/Ausblendung verloren
+        self.layout_version = 0
+
+    # ---------------- frame binding ----------------
+    def set_frame(self, df: pd.DataFrame | None, row_offset: int = 1, arrays: dict[int, object] | None = None) -> None:
+        # gleiche Spalten (z. B. nächster KEY in T2): nur Zeilen anpassen, kein Reset,
+        # damit Spaltenreihenfolge, Ausblendung und Kopf-Farben der Views erhalten bleiben.
+        # arrays: schon vorbereitete Spalten-Arrays (Position -> Werte), z. B. aus dem KEY-Cache
+        if df is not None and self._df is not None and [c for c in df.columns if c not in self._hidden] == self._columns:
+            self._swap_rows(df, arrays)
+            self.row_offset = row_offset
+            if self._nrows:
+                self.headerDataChanged.emit(Qt.Vertical, 0, self._nrows - 1)
+            return
+        self.beginResetModel()
+        self._df = df
+        self.row_offset = row_offset
+        self._sync_shape(arrays)
+        self._header_data.clear()
+        self.layout_version += 1
+        self.endResetModel()
+
+    def _swap_rows(self, df: pd.DataFrame, arrays: dict[int, object] | None = None) -> None:
+        old, new = self._nrows, len(df)
+        if new < old:
+            self.beginRemoveRows(QModelIndex(), new, old - 1)
+            self._df = df
+            self._sync_shape(arrays)
+            self.endRemoveRows()
+        elif new > old:
+            self.beginInsertRows(QModelIndex(), old, new - 1)
+            self._df = df
+            self._sync_shape(arrays)
+            self.endInsertRows()
+        else:
+            self._df = df
+            self._sync_shape(arrays)
+        if new and self._columns:
+            self.dataChanged.emit(self.index(0, 0), self.index(new - 1, len(self._columns) - 1))
+
+    def frame(self) -> pd.DataFrame | None:
+        return self._df
+
+    def columns(self) -> list[str]:
+        return list(self._columns)
+
+    def _sync_shape(self, arrays: dict[int, object] | None = None) -> None:
+        self._arrays.clear()
+        if arrays:
+            self._arrays.update(arrays)
+        if self._df is None:
+            self._columns, self._positions, self._nrows = [], [], 0
+            return
+        cols = list(self._df.columns)
+        self._positions = [i for i, c in enumerate(cols) if c not in self._hidden]
+        self._columns = [cols[i] for i in self._positions]
+        self._nrows = len(self._df)
+
+    def refresh(self) -> None:
+        # nach Änderungen am Frame von außen (Autofill, neue Spalte …)
+        if self._df is None:
+            return
+        cols = [c for c in self._df.columns if c not in self._hidden]
+        if cols != self._columns:
+            self.beginResetModel()
+            self._sync_shape()
+            self._header_data.clear()
+            self.layout_version += 1
+            self.endResetModel()
+            return
+        if len(self._df) != self._nrows:
+            self._swap_rows(self._df)
+            return
+        self._arrays.clear()
+        if self._nrows and self._columns:
+            self.dataChanged.emit(self.index(0, 0), self.index(self._nrows - 1, len(self._columns) - 1))
+
+    def refresh_row(self, row: int) -> None:
+        if 0 <= row < self._nrows and self._columns:
+            for pos, arr in self._arrays.items():
+                arr[row] = self._df.iat[row, pos]
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self._columns) - 1))
+
+    def row_label(self, row: int):
+        return self._df.index[row]
+
+    def row_for_label(self, label) -> int:
+        return int(self._df.index.get_loc(label))
+
+    def column_name(self, col: int) -> str:
+        return self._columns[col]
+
+    # ---------------- Qt model API ----------------
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._nrows
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+
+    def _array(self, col: int):
+        pos = self._positions[col]
+        arr = self._arrays.get(pos)
+        if arr is None:
+            arr = self._df.iloc[:, pos].to_numpy(dtype=object, copy=True)
+            self._arrays[pos] = arr
+        return arr
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if role not in _DISPLAY_ROLES or not index.isValid():
+            return None
+        return _display(self._array(index.column())[index.row()])
+
+    def setData(self, index: QModelIndex, value, role=Qt.EditRole) -> bool:
+        if not self._editable or not index.isValid() or role != Qt.EditRole:
+            return False
+        text = "" if value is None else str(value)
+        if self._on_edit is not None:
+            self._on_edit(self._df.index[index.row()], self._columns[index.column()], text)
+        else:
+            self._df.iat[index.row(), self._positions[index.column()]] = text
+        pos = self._positions[index.column()]
+        if pos in self._arrays:
+            self._arrays[pos][index.row()] = self._df.iat[index.row(), pos]
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.ItemIsDropEnabled if self._editable else Qt.NoItemFlags
+        return self._cell_flags
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            if role == Qt.DisplayRole:
+                return self._columns[section] if 0 <= section < len(self._columns) else None
+            return self._header_data.get((section, role))
+        if role == Qt.DisplayRole:
+            return str(section + self.row_offset)
+        return None
+
+    def setHeaderData(self, section: int, orientation, value, role=Qt.EditRole) -> bool:
+        if orientation != Qt.Horizontal or role not in (Qt.BackgroundRole, Qt.ForegroundRole):
+            return False
+        if value is None or (isinstance(value, QBrush) and value.style() == Qt.NoBrush):
+            self._header_data.pop((section, role), None)
+        else:
+            self._header_data[(section, role)] = value
+        self.headerDataChanged.emit(orientation, section, section)
+        return True
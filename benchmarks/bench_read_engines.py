@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import argparse
+import glob
+import time
+from pathlib import Path
+
+from app.services.excel_io import available_read_engines, list_sheets, load_table
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def bench_file(path: str, engines: list[str], repeat: int) -> dict[str, dict[str, float]]:
+    sheet = list_sheets(path)[0]
+    res: dict[str, dict[str, float]] = {}
+    for eng in engines:
+        res[eng] = {
+            "list_sheets": _best_of(lambda: list_sheets(path, engine=eng), repeat),
+            "load_table": _best_of(lambda: load_table(path, sheet, 1, engine=eng, use_cache=False), repeat),
+        }
+    return res
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Excel-Lese-Engines vergleichen (bestes von N Läufen).")
+    p.add_argument("files", nargs="*", help="Excel-Dateien (Standard: Kunden_*.xlsx im Repo)")
+    p.add_argument("-n", "--repeat", type=int, default=3)
+    args = p.parse_args(argv)
+
+    files = args.files or sorted(glob.glob(str(REPO_ROOT / "Kunden_*.xlsx")))
+    engines = available_read_engines()
+    print(f"Engines: {', '.join(engines)}")
+
+    for f in files:
+        res = bench_file(f, engines, args.repeat)
+        print(Path(f).name)
+        base = res.get("openpyxl", {}).get("load_table")
+        for eng, t in res.items():
+            speedup = f"  x{base / t['load_table']:.1f}" if base else ""
+            print(f"  {eng:<9} list_sheets {t['list_sheets'] * 1000:8.1f} ms   load_table {t['load_table'] * 1000:8.1f} ms{speedup}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from app.services import apply_changes
+from app.services.autofill import autofill_linked
+from app.services.excel_io import available_read_engines, load_table
+from app.services.matcher import MatchEngine
+from app.services.transforms import normalize_phone_series, split_street_house_series, states_from_zip_de
+from benchmarks.synthetic import COL_LINKS, FILL_COLUMNS, SHEET, T1_KEY, T2_KEY, make_tables, write_workbooks
+
+# feste Obergrenzen (Mikrosekunden je T1-Zeile, ab MIN_ROWS_FOR_LIMITS Zeilen), unabhängig von einer Baseline:
+# fangen z. B. einen KEY-Index, der wieder pro KEY über den pandas-Index geht (~12 µs/Zeile statt <1)
+LIMITS_US_PER_ROW = {"rebuild_t1_index": 3.0}
+MIN_ROWS_FOR_LIMITS = 10_000
+
+CUTS = {"split_street_house": True, "normalize_phone": True, "fill_country_default": True, "infer_state_from_zip": True}
+
+def _best_of(fn, repeat: int, setup=None) -> float:
+    # setup() läuft außerhalb der Messung; sein Ergebnis bekommt fn (z. B. frische Engine fürs Füllen)
+    best = float("inf")
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        t0 = time.perf_counter()
+        fn(arg) if setup else fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def bench_size(rows: int, args, work: Path) -> dict[str, float]:
+    df1, df2 = make_tables(rows, extra_cols=args.extra_cols, match_rate=args.match_rate, dup_rate=args.dup_rate, missing_rate=args.missing_rate, seed=args.seed)
+    p1, p2 = write_workbooks(work, df1, df2)
+    r = args.repeat
+    res: dict[str, float] = {}
+
+    res["load_table_t1"] = _best_of(lambda: load_table(str(p1), SHEET, 1, use_cache=False), r)
+    res["load_table_t2"] = _best_of(lambda: load_table(str(p2), SHEET, 1, use_cache=False), r)
+    load_table(str(p1), SHEET, 1)
+    res["load_table_t1_cached"] = _best_of(lambda: load_table(str(p1), SHEET, 1), r)
+    t1 = load_table(str(p1), SHEET, 1, use_cache=False)
+    t2 = load_table(str(p2), SHEET, 1, use_cache=False)
+
+    def fresh() -> MatchEngine:
+        return MatchEngine(t1.df.copy(), T1_KEY, t2.df.copy(), T2_KEY)
+
+    res["match_engine"] = _best_of(lambda frames: MatchEngine(frames[0], T1_KEY, frames[1], T2_KEY), r, setup=lambda: (t1.df.copy(), t2.df.copy()))
+    engine = fresh()
+    res["rebuild_t1_index"] = _best_of(engine.rebuild_t1_index, r)
+    sample = engine.df1[T1_KEY].drop_duplicates().sample(min(1000, len(engine.df1)), random_state=0).tolist()
+    keys = engine.df1.loc[engine.df1[T1_KEY].isin(sample), "_KEY_"].unique().tolist()
+    res["t1_rows_for_key_1000"] = _best_of(lambda e: [e.t1_rows_for_key(k) for k in keys], r, setup=lambda: (engine.rebuild_t1_index(), engine)[1])
+    res["keys_with_missing"] = _best_of(lambda: engine.keys_with_missing(FILL_COLUMNS), r)
+    res["autofill_linked"] = _best_of(lambda e: autofill_linked(e, COL_LINKS, CUTS, "Deutschland"), r, setup=fresh)
+
+    street, phone, zips = t2.df["Straße"], t2.df["Telefon"], t2.df["PLZ"]
+    res["split_street_house_series"] = _best_of(lambda: split_street_house_series(street), r)
+    res["normalize_phone_series"] = _best_of(lambda: normalize_phone_series(phone), r)
+    res["states_from_zip_de"] = _best_of(lambda: states_from_zip_de(zips), r)
+
+    # Speichern mit dem gefüllten Stand (dirty = tatsächlich geänderte Zellen)
+    autofill_linked(engine, COL_LINKS, CUTS, "Deutschland")
+    out = work / "out"
+    out.mkdir(exist_ok=True)
+    res["save_filled"] = _best_of(lambda: apply_changes.save_filled(engine.df1, out, p1.stem), r)
+    res["save_to_path"] = _best_of(lambda: apply_changes.save_to_path(engine.df1, out / "save_to_path.xlsx"), r)
+
+    def copy_t1() -> Path:
+        target = out / "in_place.xlsx"
+        shutil.copyfile(p1, target)
+        return target
+
+    res["save_in_place"] = _best_of(
+        lambda path: apply_changes.save_in_place(
+            engine.df1, path, SHEET, make_backup=False,
+            dirty=engine.dirty, header_row_1based=1, source_columns=t1.source_columns,
+        ),
+        r, setup=copy_t1,
+    )
+    return res
+
+def check_limits(results: dict) -> list[str]:
+    over = []
+    for size, metrics in results.items():
+        if int(size) < MIN_ROWS_FOR_LIMITS:
+            continue
+        for name, limit in LIMITS_US_PER_ROW.items():
+            us = metrics.get(name, 0.0) * 1e6 / int(size)
+            if us > limit:
+                print(f"  {size:>8} {name:<26} {us:.2f} µs/Zeile > Grenze {limit:.2f}")
+                over.append(f"{size}/{name}")
+    return over
+
+def compare(results: dict, baseline: dict, max_slowdown: float) -> list[str]:
+    # Metriken, die gegenüber der Baseline um mehr als max_slowdown langsamer sind
+    slower = []
+    for size, metrics in results.items():
+        base = baseline.get(size, {})
+        for name, t in metrics.items():
+            if name in base and base[name] > 0:
+                ratio = t / base[name]
+                flag = "  <-- langsamer" if ratio > max_slowdown else ""
+                print(f"  {size:>8} {name:<26} {base[name] * 1000:9.1f} -> {t * 1000:9.1f} ms  x{ratio:.2f}{flag}")
+                if flag:
+                    slower.append(f"{size}/{name}")
+    return slower
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Laden, Scan, Füllen, Transforms und Speichern auf synthetischen Kundentabellen messen (bestes von N Läufen).")
+    p.add_argument("--sizes", default="1000,10000,50000", help="Zeilen je Tabelle, kommagetrennt")
+    p.add_argument("-n", "--repeat", type=int, default=3)
+    p.add_argument("--extra-cols", type=int, default=10, help="zusätzliche Spalten je Tabelle")
+    p.add_argument("--match-rate", type=float, default=0.8, help="Anteil der T1-KEYs mit Treffer in T2")
+    p.add_argument("--dup-rate", type=float, default=0.05, help="Anteil doppelter KEYs in T2")
+    p.add_argument("--missing-rate", type=float, default=0.3, help="Anteil fehlender Zellen in T1")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("-o", "--out", help="Ergebnis als JSON (Standard: bench_<Zeitstempel>.json im aktuellen Verzeichnis)")
+    p.add_argument("--baseline", help="früheres JSON-Ergebnis zum Vergleich")
+    p.add_argument("--max-slowdown", type=float, default=1.25, help="Faktor, ab dem eine Metrik als langsamer gilt (Exit-Code 1)")
+    p.add_argument("--keep", help="Arbeitsverzeichnis für erzeugte Dateien behalten")
+    args = p.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    work = Path(args.keep) if args.keep else Path(tempfile.mkdtemp(prefix="excel_filler_bench_"))
+    results: dict[str, dict[str, float]] = {}
+    try:
+        for rows in sizes:
+            print(f"{rows} Zeilen …", flush=True)
+            results[str(rows)] = res = bench_size(rows, args, work / str(rows))
+            for name, t in res.items():
+                print(f"  {name:<26} {t * 1000:9.1f} ms")
+    finally:
+        if not args.keep:
+            shutil.rmtree(work, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "read_engines": available_read_engines(),
+            "args": {k: v for k, v in vars(args).items() if k not in ("out", "baseline", "keep")},
+        },
+        "results": results,
+    }
+    out = Path(args.out or f"bench_{datetime.now():%Y-%m-%d_%H%M%S}.json")
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Ergebnis: {out}")
+
+    failed = False
+    over = check_limits(results)
+    if over:
+        print(f"{len(over)} Metrik(en) über der festen Grenze: {', '.join(over)}")
+        failed = True
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        print(f"Vergleich mit {args.baseline}:")
+        slower = compare(results, baseline.get("results", {}), args.max_slowdown)
+        if slower:
+            print(f"{len(slower)} Metrik(en) langsamer als x{args.max_slowdown}: {', '.join(slower)}")
+            failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.services.apply_changes import write_xlsx_streaming
+
+# Synthetische Kundentabellen im Format der echten Dateien: T1 wie Kunden_*_filled.xlsx,
+# T2 wie die Kundendatenbank (deutsche Spaltennamen, Straße mit Hausnummer, Telefon in wechselnden Formaten).
+
+SHEET = "Kunden"
+T1_KEY = "customerNumber"
+T2_KEY = "Kundennummer"
+# T1-Spalte -> T2-Spalte, wie in settings.json (col_links)
+COL_LINKS = {
+    "street": "Straße",
+    "zipCode": "PLZ",
+    "city": "Ort",
+    "phoneGeneral": "Telefon",
+    "mobileGeneral": "Mobil",
+    "generalEmail": "Email",
+}
+FILL_COLUMNS = ["street", "houseNumber", "zipCode", "city", "state", "country", "phoneGeneral", "mobileGeneral", "generalEmail"]
+MISSING_TOKENS = np.array(["", "-", "n/a", "null", "nan"], dtype=object)
+
+_FIRST = ["Anna", "Thomas", "Julia", "Michael", "Sabine", "Stefan", "Katrin", "Andreas", "Monika", "Jürgen", "Birgit", "Uwe", "Petra", "Klaus", "Doris", "Özlem"]
+_LAST = ["Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker", "Schulz", "Hoffmann", "Koch", "Richter", "Klein", "Wolf", "Schröder", "Neumann", "Schwarz", "Zimmermann"]
+_TITLE = ["", "Dr. med.", "Dr. med. dent.", "Prof. Dr.", "Dipl.-Med."]
+_STREET = ["Hauptstraße", "Bahnhofstraße", "Am Markt", "Lindenweg", "Goethestraße", "Schillerplatz", "Mühlenstraße", "Ernst-Ludwig-Straße", "Dorfstr.", "Kirchgasse", "Hügelstraße", "Rosenweg"]
+_HOUSE_SUFFIX = ["", "", "", "", "a", "b", " D", "-3"]
+# (Ort, PLZ-Präfix, Vorwahl) – Präfixe mit führender Null für KEY-/PLZ-Normalisierung
+_CITY = [
+    ("Dresden", "01", "0351"), ("Leipzig", "04", "0341"), ("Berlin", "10", "030"), ("Hamburg", "20", "040"),
+    ("Hannover", "30", "0511"), ("Köln", "50", "0221"), ("Darmstadt", "64", "06151"), ("Wöllstein", "55", "06703"),
+    ("Stuttgart", "70", "0711"), ("München", "80", "089"), ("Nürnberg", "90", "0911"), ("Niederzier", "52", "02428"),
+]
+_MAIL_DOMAIN = ["gmx.de", "web.de", "t-online.de", "praxis-online.de", "gmail.com"]
+
+def _pick(rng: np.random.Generator, values, n: int) -> np.ndarray:
+    return np.asarray(values, dtype=object)[rng.integers(0, len(values), n)]
+
+def _digits(rng: np.random.Generator, n: int, width: int) -> np.ndarray:
+    return pd.Series(rng.integers(0, 10 ** width, n)).astype(str).str.zfill(width).to_numpy(object)
+
+def _phones(rng: np.random.Generator, area: np.ndarray, number: np.ndarray) -> np.ndarray:
+    # dieselbe Nummer in den Schreibweisen, die in den echten Daten vorkommen
+    area_nat = pd.Series(area, dtype=object).str[1:]
+    num = pd.Series(number, dtype=object)
+    formats = [
+        area + " " + num,
+        area + " - " + num.str[:3] + " " + num.str[3:],
+        area + "/" + num,
+        "+49 " + area_nat + " " + num,
+        "(" + area + ") " + num.str[:2] + " " + num.str[2:4] + " " + num.str[4:],
+        "0049-" + area_nat + "-" + num,
+    ]
+    choice = rng.integers(0, len(formats), len(area))
+    return np.choose(choice, [np.asarray(f, dtype=object) for f in formats])
+
+def _customers(rng: np.random.Generator, ids: np.ndarray) -> pd.DataFrame:
+    # vollständige "Wahrheit" je Kunde; T1 und T2 werden daraus abgeleitet
+    n = len(ids)
+    city = rng.integers(0, len(_CITY), n)
+    names, prefixes, areas = (np.array(col, dtype=object) for col in zip(*_CITY))
+    first, last = _pick(rng, _FIRST, n), _pick(rng, _LAST, n)
+    house = pd.Series(rng.integers(1, 200, n)).astype(str).to_numpy(object) + _pick(rng, _HOUSE_SUFFIX, n)
+    local = pd.Series(last, dtype=object).str.lower().str.replace("ü", "ue").str.replace("ö", "oe").str.replace("ä", "ae")
+    return pd.DataFrame({
+        "id": ids,
+        "title": _pick(rng, _TITLE, n),
+        "firstName": first,
+        "lastName": last,
+        "street": _pick(rng, _STREET, n),
+        "houseNumber": house,
+        "zipCode": prefixes[city] + _digits(rng, n, 3),
+        "city": names[city],
+        "phone": _phones(rng, areas[city], _digits(rng, n, 6)),
+        "mobile": _phones(rng, _pick(rng, ["0151", "0160", "0171", "0176"], n), _digits(rng, n, 7)),
+        "email": (local + "@" + _pick(rng, _MAIL_DOMAIN, n)).to_numpy(object),
+    })
+
+def make_tables(
+    rows: int = 10_000,
+    t2_rows: int | None = None,
+    extra_cols: int = 10,
+    match_rate: float = 0.8,
+    dup_rate: float = 0.05,
+    missing_rate: float = 0.3,
+    seed: int = 0,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """T1 (Ziel, mit Lücken) und T2 (Quelle) als DataFrames (alles Text, wie nach load_table).
+
+    match_rate: Anteil der T1-KEYs, die in T2 vorkommen; dup_rate: Anteil doppelter KEYs
+    (in T2 mit teils abweichenden Werten); missing_rate: Anteil fehlender Zellen in den
+    füllbaren T1-Spalten (verschiedene Fehl-Token)."""
+    rng = np.random.default_rng(seed)
+    t2_rows = rows if t2_rows is None else t2_rows
+    ids = _digits(rng, rows + t2_rows, 7)
+    ids = pd.unique(ids)  # Kundennummern mit führenden Nullen, eindeutig
+    t1_ids, spare = ids[:rows], ids[rows:]
+
+    # T1: doppelte KEYs (gleicher Kunde mehrfach erfasst)
+    t1_ids = t1_ids.copy()
+    n_dup1 = int(rows * dup_rate / 4)
+    t1_ids[rng.choice(rows, n_dup1, replace=False)] = t1_ids[rng.integers(0, rows, n_dup1)]
+    truth = _customers(rng, ids).set_index("id")
+
+    t1 = truth.loc[t1_ids].reset_index()
+    df1 = pd.DataFrame({
+        T1_KEY: t1["id"],
+        "uniqueName": t1["title"].where(t1["title"] == "", t1["title"] + " ") + t1["firstName"] + " " + t1["lastName"],
+        "title": t1["title"],
+        "firstName": t1["firstName"],
+        "lastName": t1["lastName"],
+        "street": t1["street"],
+        "houseNumber": t1["houseNumber"],
+        "zipCode": t1["zipCode"],
+        "city": t1["city"],
+        "state": "",
+        "country": "",
+        "phoneGeneral": t1["phone"],
+        "mobileGeneral": t1["mobile"],
+        "generalEmail": t1["email"],
+    })
+    for col in ("street", "houseNumber", "zipCode", "city", "phoneGeneral", "mobileGeneral", "generalEmail"):
+        gap = rng.random(rows) < missing_rate
+        df1.loc[gap, col] = _pick(rng, MISSING_TOKENS, int(gap.sum()))
+    # Straße fehlt -> Hausnummer meist auch (Autofill teilt "Straße Nr" auf)
+    df1.loc[df1["street"].isin(MISSING_TOKENS) & (rng.random(rows) < 0.8), "houseNumber"] = ""
+
+    # T2: match_rate der T1-Kunden, Rest fremde Kunden, dann Dubletten mit abweichenden Werten
+    n_match = min(int(len(pd.unique(t1_ids)) * match_rate), t2_rows)
+    matched = rng.choice(pd.unique(t1_ids), n_match, replace=False)
+    t2_ids = np.concatenate([matched, spare[:t2_rows - n_match]])
+    n_dup2 = int(t2_rows * dup_rate)
+    t2_ids[rng.choice(len(t2_ids), n_dup2, replace=False)] = t2_ids[rng.integers(0, len(t2_ids), n_dup2)]
+    rng.shuffle(t2_ids)
+    t2 = truth.loc[t2_ids].reset_index()
+    dup = t2["id"].duplicated().to_numpy() & (rng.random(len(t2)) < 0.5)
+    t2.loc[dup, "phone"] = _phones(rng, _pick(rng, ["030", "040", "089"], int(dup.sum())), _digits(rng, int(dup.sum()), 6))
+    df2 = pd.DataFrame({
+        "note": "",
+        "PLZ": t2["zipCode"],
+        "Ort": t2["city"],
+        "Straße": t2["street"] + " " + t2["houseNumber"],
+        "Kundenname": t2["lastName"],
+        "f": "Herr | " + t2["title"] + " | " + t2["firstName"] + " | " + t2["lastName"] + " | o",
+        T2_KEY: t2["id"],
+        "Telefon": t2["phone"],
+        "Mobil": t2["mobile"],
+        "Email": t2["email"],
+    })
+    gap = rng.random((len(df2), 4)) < missing_rate / 3
+    for j, col in enumerate(("Telefon", "Mobil", "Email", "Ort")):
+        df2.loc[gap[:, j], col] = "-"
+
+    for i in range(extra_cols):
+        df1[f"Notiz {i + 1}"] = np.where(rng.random(rows) < 0.2, _pick(rng, ["Rückruf", "Termin", "Mo/Di", "Vertrag"], rows), "")
+        df2[f"Feld {i + 1}"] = _digits(rng, len(df2), 4)
+    return df1.astype(object), df2.astype(object)
+
+def write_workbooks(out_dir: str | Path, df1: pd.DataFrame, df2: pd.DataFrame) -> tuple[Path, Path]:
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    p1 = write_xlsx_streaming(df1, out_dir / f"t1_{len(df1)}.xlsx", sheet_name=SHEET)
+    p2 = write_xlsx_streaming(df2, out_dir / f"t2_{len(df2)}.xlsx", sheet_name=SHEET)
+    return p1, p2
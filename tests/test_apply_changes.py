@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from app.services import apply_changes
+from app.services.apply_changes import write_xlsx_streaming
+
+def _frame(n: int = 25) -> pd.DataFrame:
+    # Text (auch Umlaute/führende Nullen), Zahlen und alle Arten von "leer", dazu die interne _KEY_-Spalte
+    df = pd.DataFrame({
+        "customerNumber": [f"{i:07d}" for i in range(n)],
+        "city": ["Köln", "", None, np.nan, pd.NA] * (n // 5),
+        "phone": ["0221 - 123 4", "+49 30 1234567"] * (n // 2) + ["0171/1234567"] * (n % 2),
+        "amount": np.arange(n) * 1.5,
+        "count": np.arange(n),
+        "note": ["Rückruf", None, "Mo/Di | Fr", None, "x"] * (n // 5),
+    })
+    df["_KEY_"] = df["customerNumber"]
+    return df
+
+def _read(path) -> list[list]:
+    ws = load_workbook(path, read_only=True).active
+    rows = [list(row) for row in ws.iter_rows(values_only=True)]
+    width = len(rows[0])
+    # "" und None gelten beide als leere Zelle; leere Zellen am Zeilenende werden teils nicht geschrieben
+    return [[None if v == "" else v for v in row] + [None] * (width - len(row)) for row in rows]
+
+@pytest.mark.parametrize("engine", ["xlsxwriter", "openpyxl"])
+def test_streaming_writer_matches_to_excel(tmp_path, monkeypatch, engine):
+    if engine == "xlsxwriter":
+        pytest.importorskip("xlsxwriter")
+    monkeypatch.setattr(apply_changes, "_write_engine", lambda: engine)
+    df = _frame()
+
+    old = tmp_path / "old.xlsx"
+    df.drop(columns=["_KEY_"]).to_excel(old, index=False, sheet_name="Sheet1", engine="openpyxl")
+    new = write_xlsx_streaming(df, tmp_path / "new.xlsx", progress=lambda done, total: None)
+
+    expected, actual = _read(old), _read(new)
+    assert actual[0] == expected[0] == [c for c in df.columns if c != "_KEY_"]
+    assert len(actual) == len(expected) == len(df) + 1
+    assert actual[1:] == expected[1:]
+    # leere Zellen (None/NaN/NA/"") bleiben leer, _KEY_ wird nicht geschrieben
+    city = actual[0].index("city")
+    assert [row[city] for row in actual[1:6]] == ["Köln", None, None, None, None]
+    assert "_KEY_" not in actual[0]
+
+@pytest.mark.parametrize("engine", ["xlsxwriter", "openpyxl"])
+def test_streaming_writer_keeps_formula_like_text(tmp_path, monkeypatch, engine):
+    if engine == "xlsxwriter":
+        pytest.importorskip("xlsxwriter")
+    monkeypatch.setattr(apply_changes, "_write_engine", lambda: engine)
+    df = pd.DataFrame({"note": ["=1+1", "-", "http://example.org"]})
+    rows = _read(write_xlsx_streaming(df, tmp_path / "f.xlsx"))
+    assert [r[0] for r in rows[1:]] == ["=1+1", "-", "http://example.org"]
+
+def test_save_in_place_keeps_edits_from_before_a_rescan(tmp_path):
+    from app.services.matcher import MatchEngine
+    path = tmp_path / "t1.xlsx"
+    t1 = pd.DataFrame({"id": ["1", "2", "3"], "city": ["", "", ""], "phone": ["", "", ""]}, dtype=object)
+    t1.to_excel(path, index=False, sheet_name="Kunden")
+    t2 = pd.DataFrame({"id": ["1"], "Ort": ["Köln"]}, dtype=object)
+
+    first = MatchEngine(t1.copy(), "id", t2.copy(), "id")
+    first.set_t1_value(0, "city", "Köln")
+    # neuer Start (z. B. nach "weitere Quelle"): Engine auf einer Kopie des bearbeiteten Frames
+    second = MatchEngine(first.df1.copy(), "id", t2.copy(), "id", dirty=first.dirty)
+    second.set_t1_value(2, "phone", "0221 1")
+
+    apply_changes.save_in_place(second.df1, path, "Kunden", make_backup=False, dirty=second.dirty,
+                                header_row_1based=1, source_columns=["id", "city", "phone"])
+    assert _read(path)[1:] == [["1", "Köln", None], ["2", None, None], ["3", None, "0221 1"]]
+
+def test_save_in_place_rejects_xls_before_backup(tmp_path):
+    path = tmp_path / "alt.xls"
+    path.write_bytes(b"\xd0\xcf\x11\xe0")
+
+    class Store:
+        def backup(self, p):
+            raise AssertionError("kein Backup für .xls")
+
+    with pytest.raises(ValueError, match="Speichern unter"):
+        apply_changes.save_in_place(pd.DataFrame({"a": [1]}), path, "Sheet1", backup_store=Store())
@@ -0,0 +1,100 @@
+import pandas as pd
+import pytest
+
+from app.services.autofill import autofill_linked
+from app.services.matcher import MatchEngine
+from app.services.normalize import is_missing
+from app.services.transforms import normalize_phone, split_street_house, state_from_zip_de
+from benchmarks.synthetic import COL_LINKS, T1_KEY, T2_KEY, make_tables
+
+CUTS = {"split_street_house": True, "normalize_phone": True, "fill_country_default": True, "infer_state_from_zip": True}
+
+def _old_row_fill(engine: MatchEngine, idx, col_links: dict, cuts: dict, country: str) -> None:
+    # frühere Einzelzeilen-Füllung (Zelle für Zelle über die T2-Gruppe) als Referenz
+    df1 = engine.df1
+    t2 = engine.t2_rows_for_key(df1.at[idx, "_KEY_"])
+    if len(t2) == 0:
+        return
+    for t1_col in [c for c in df1.columns if c not in ("_KEY_", T1_KEY)]:
+        t2_col = col_links.get(t1_col)
+        if not is_missing(df1.at[idx, t1_col]) or not t2_col:
+            continue
+        chosen = next((str(v).strip() for v in t2[t2_col] if not is_missing(v)), None)
+        if not chosen:
+            continue
+        if cuts["split_street_house"] and t1_col.lower() in ("street", "straße"):
+            chosen, house = split_street_house(chosen)
+            if is_missing(df1.at[idx, "houseNumber"]) and house:
+                df1.at[idx, "houseNumber"] = house
+        if cuts["normalize_phone"] and t1_col.lower() in ("phonegeneral", "mobilgeneral"):
+            chosen = normalize_phone(chosen)
+        df1.at[idx, t1_col] = chosen
+    if cuts["fill_country_default"] and is_missing(df1.at[idx, "country"]):
+        df1.at[idx, "country"] = country
+    if cuts["infer_state_from_zip"] and is_missing(df1.at[idx, "state"]):
+        st = state_from_zip_de(df1.at[idx, "zipCode"])
+        if st:
+            df1.at[idx, "state"] = st
+
+@pytest.fixture(scope="module")
+def tables():
+    return make_tables(400, extra_cols=1, seed=3)
+
+def test_single_row_fill_matches_old_per_row_fill(tables):
+    df1, df2 = tables
+    new = MatchEngine(df1.copy(), T1_KEY, df2.copy(), T2_KEY)
+    old = MatchEngine(df1.copy(), T1_KEY, df2.copy(), T2_KEY)
+    rows = list(range(0, len(df1), 7))
+    for idx in rows:
+        autofill_linked(new, COL_LINKS, CUTS, "Deutschland", rows=[idx])
+        _old_row_fill(old, idx, COL_LINKS, CUTS, "Deutschland")
+    pd.testing.assert_frame_equal(new.df1.loc[rows], old.df1.loc[rows])
+    # nur die angefragten Zeilen geändert
+    others = new.df1.index.difference(rows)
+    pd.testing.assert_frame_equal(new.df1.loc[others], df1.loc[others].assign(_KEY_=new.df1.loc[others, "_KEY_"]))
+    assert new.dirty and {idx for idx, _ in new.dirty} <= set(rows)
+
+def test_row_fill_equals_full_fill_for_those_rows(tables):
+    df1, df2 = tables
+    full = MatchEngine(df1.copy(), T1_KEY, df2.copy(), T2_KEY)
+    part = MatchEngine(df1.copy(), T1_KEY, df2.copy(), T2_KEY)
+    autofill_linked(full, COL_LINKS, CUTS, "Deutschland")
+    rows = list(range(1, len(df1), 5))
+    autofill_linked(part, COL_LINKS, CUTS, "Deutschland", rows=rows)
+    pd.testing.assert_frame_equal(part.df1.loc[rows], full.df1.loc[rows])
+
+def _priority_engine() -> MatchEngine:
+    # drei Quellen mit überlappenden Werten; "Alt" hat eigene Spaltennamen
+    df1 = pd.DataFrame({"nr": ["1", "2", "3", "4"], "city": [None] * 4, "email": [None, None, None, "x@t1.de"]})
+    t2 = pd.DataFrame({"nr": ["1", "2", "4"], "Ort": ["Köln", None, "Bonn"], "Email": ["a@t2.de", None, None]})
+    crm = pd.DataFrame({"nr": ["1", "2", "3"], "Ort": ["Cologne", "Aachen", None], "Email": ["a@crm.de", "b@crm.de", None]})
+    alt = pd.DataFrame({"id": ["1", "3"], "Stadt": ["Kölle", "Düren"], "Mail": [None, "c@alt.de"]})
+    engine = MatchEngine(df1, "nr", t2, "nr")
+    engine.add_source("CRM", crm, "nr")
+    engine.add_source("Alt", alt, "id", {"city": "Stadt", "email": "Mail"})
+    return engine
+
+NO_CUTS = {k: False for k in CUTS}
+PRIO_LINKS = {"city": "Ort", "email": "Email"}
+
+def test_autofill_default_priority_is_engine_order():
+    engine = _priority_engine()
+    autofill_linked(engine, PRIO_LINKS, NO_CUTS, "Deutschland")
+    assert engine.df1["city"].tolist() == ["Köln", "Aachen", "Düren", "Bonn"]
+    assert engine.df1["email"].tolist() == ["a@t2.de", "b@crm.de", "c@alt.de", "x@t1.de"]
+
+def test_autofill_priority_per_column():
+    engine = _priority_engine()
+    # city: Alt vor CRM, dann die nicht genannte Haupt-Quelle; email: unbekannte Quelle wird übergangen
+    priority = {"city": ["Alt", "CRM"], "email": ["Gibt es nicht", "CRM"]}
+    filled = autofill_linked(engine, PRIO_LINKS, NO_CUTS, "Deutschland", priority=priority)
+    assert engine.df1["city"].tolist() == ["Kölle", "Aachen", "Düren", "Bonn"]
+    assert engine.df1["email"].tolist() == ["a@crm.de", "b@crm.de", "c@alt.de", "x@t1.de"]
+    assert filled == {"city": 4, "email": 3}
+
+def test_autofill_priority_applies_to_single_rows():
+    engine = _priority_engine()
+    priority = {"city": ["Alt", "CRM"]}
+    autofill_linked(engine, PRIO_LINKS, NO_CUTS, "Deutschland", rows=[0, 3], priority=priority)
+    assert engine.df1["city"].tolist() == ["Kölle", None, None, "Bonn"]
+    assert engine.dirty == {(0, "city"), (3, "city"), (0, "email")}
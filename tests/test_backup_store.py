@@ -0,0 +1,80 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services import backup_store as backup_mod
+from app.services.backup_store import BackupStore
+
+def _write(path, data: bytes, mtime_ns: int | None = None):
+    path.write_bytes(data)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def _objects(store: BackupStore) -> set[str]:
+    return {f.name for f in (store.root / "objects").iterdir()}
+
+def test_backup_dedups_identical_content(tmp_path, monkeypatch):
+    store = BackupStore(tmp_path / "bk")
+    a, b = tmp_path / "a.xlsx", tmp_path / "b.xlsx"
+    _write(a, b"same")
+    _write(b, b"same")
+    va, vb = store.backup(a), store.backup(b)
+    assert va.sha256 == vb.sha256
+    assert _objects(store) == {va.sha256}
+
+    # unveränderte Datei (Größe + mtime) wird nicht erneut gelesen
+    monkeypatch.setattr(store, "_store_object", lambda p: pytest.fail("Inhalt erneut gelesen"))
+    again = store.backup(a)
+    assert again.sha256 == va.sha256
+    assert len(store.versions(a)) == 2
+
+def test_backup_retention_keep_last_and_garbage(tmp_path):
+    store = BackupStore(tmp_path / "bk", keep_last=2)
+    f = tmp_path / "t.xlsx"
+    shas = []
+    for i in range(4):
+        _write(f, f"v{i}".encode(), mtime_ns=(i + 1) * 10**9)
+        shas.append(store.backup(f).sha256)
+    assert [v.sha256 for v in store.versions(f)] == shas[-2:]
+    assert _objects(store) == set(shas[-2:])  # nicht mehr referenzierte Inhalte entfernt
+
+def test_backup_retention_max_age_keeps_newest(tmp_path):
+    store = BackupStore(tmp_path / "bk", keep_last=0, max_age_days=30)
+    f = tmp_path / "t.xlsx"
+    _write(f, b"alt", mtime_ns=10**9)
+    store.backup(f)
+    # ersten Eintrag künstlich altern lassen
+    manifest_path = store.root / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    old_ts = (datetime.now() - timedelta(days=40)).strftime(backup_mod._TS_FORMAT)
+    for entries in manifest.values():
+        entries[0]["ts"] = old_ts
+    manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+    # nur die jüngste (alte) Version: bleibt erhalten
+    store._apply_retention(manifest)
+    assert len(next(iter(manifest.values()))) == 1
+
+    _write(f, b"neu", mtime_ns=2 * 10**9)
+    v = store.backup(f)
+    assert [x.sha256 for x in store.versions(f)] == [v.sha256]
+
+def test_restore_roundtrip_and_missing_object(tmp_path):
+    store = BackupStore(tmp_path / "bk")
+    f = tmp_path / "t.xlsx"
+    _write(f, b"original", mtime_ns=10**9)
+    v1 = store.backup(f)
+    _write(f, b"geaendert", mtime_ns=2 * 10**9)
+    store.backup(f)
+
+    assert store.restore(f, v1) == f
+    assert f.read_bytes() == b"original"
+    copy = store.restore(f, v1, tmp_path / "kopie.xlsx")
+    assert copy.read_bytes() == b"original"
+    assert not list(tmp_path.glob("*.restore"))
+
+    (store.root / "objects" / v1.sha256).unlink()
+    with pytest.raises(FileNotFoundError):
+        store.restore(f, v1)
+    assert f.read_bytes() == b"original"
@@ -0,0 +1,32 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from app.services import candidates as cand_mod
+from app.services.candidates import CandidateIndex, find_candidates, normalize_fields, resolve_fields
+from benchmarks.synthetic import COL_LINKS, T1_KEY, T2_KEY, make_tables
+
+def _setup(seed: int):
+    df1, df2 = make_tables(300, extra_cols=0, match_rate=0.0, seed=seed)
+    fields = resolve_fields(df1.columns, df2.columns, COL_LINKS, T1_KEY, T2_KEY)
+    index = CandidateIndex.build(df2, {f: c2 for f, (_, c2) in fields.items()})
+    queries = normalize_fields(df1, {f: c1 for f, (c1, _) in fields.items()})
+    return index, queries
+
+def test_in_process_search_does_not_share_the_worker_global():
+    # zwei Suchen gleichzeitig in Threads (z. B. UI-Job und CLI-Aufruf) dürfen sich den Index nicht überschreiben
+    setups = [_setup(1), _setup(2)]
+    serial = [find_candidates(i, q, workers=1) for i, q in setups]
+    with ThreadPoolExecutor(2) as ex:
+        for _ in range(3):
+            parallel = list(ex.map(lambda s: find_candidates(*s, workers=1), setups))
+            for a, b in zip(serial, parallel):
+                pd.testing.assert_frame_equal(a, b)
+    assert not serial[0].equals(serial[1])
+    assert cand_mod._worker_index is None
+
+def test_worker_processes_match_in_process(monkeypatch):
+    index, queries = _setup(1)
+    monkeypatch.setattr(cand_mod, "PARALLEL_MIN_ROWS", 0)
+    monkeypatch.setattr(cand_mod, "_CHUNK_ROWS", 100)
+    pd.testing.assert_frame_equal(find_candidates(index, queries, workers=2), find_candidates(index, queries, workers=1))
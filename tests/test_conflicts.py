@@ -0,0 +1,44 @@
+import pandas as pd
+
+from app.services.conflicts import REPORT_COLUMNS, conflicts_first, find_conflicts
+from app.services.matcher import MatchEngine
+
+LINKS = {"city": "Ort", "phoneGeneral": "Telefon"}
+
+def _engine() -> MatchEngine:
+    df1 = pd.DataFrame({"nr": ["1", "2", "3", "4", "5"], "city": [None] * 5, "phoneGeneral": [None] * 5})
+    t2 = pd.DataFrame({
+        "nr": ["1", "1", "2", "2", "2", "3", "3", "4", "4", "9", "9"],
+        # 2: nur Groß/klein, Leerzeichen -> kein Konflikt bei Ort; "n/a" zählt nicht
+        "Ort": ["Köln", "Bonn", "Bonn", "bonn ", "Bonn", "Aachen", "Düren", "Jena", "Gera", "A", "B"],
+        # 1: gleiche Ziffern in anderer Schreibweise -> kein Konflikt
+        "Telefon": ["0221 1", "02211", "0228 1", "0228 2", "n/a", "0241 1", "0241 2", "1", "1", "1", "2"],
+    })
+    crm = pd.DataFrame({"nr": ["4", "4", "5", "5"], "Ort": ["Gera", "Jena", "Ulm", "Ulm"], "Telefon": ["1", "1", "2", "3"]})
+    engine = MatchEngine(df1, "nr", t2, "nr")
+    engine.add_source("CRM", crm, "nr")
+    return engine
+
+def test_find_conflicts_orders_keys_by_conflict_count():
+    report = find_conflicts(_engine(), LINKS)
+    # 3 und 4 je zwei Konflikte, Gleichstand in Reihenfolge des ersten Auftretens; KEY 9 fehlt in T1
+    assert report.keys == ["3", "4", "1", "2", "5"]
+    assert list(report.table.columns) == REPORT_COLUMNS
+    assert report.table[["key", "t1_col", "source"]].values.tolist() == [
+        ["3", "city", "T2"], ["3", "phoneGeneral", "T2"],
+        ["4", "city", "T2"], ["4", "city", "CRM"],
+        ["1", "city", "T2"], ["2", "phoneGeneral", "T2"], ["5", "phoneGeneral", "CRM"],
+    ]
+    assert report.table["values"].tolist()[:4] == ["Aachen | Düren", "0241 1 | 0241 2", "Jena | Gera", "Gera | Jena"]
+    assert report.columns_by_key() == {"3": ["city", "phoneGeneral"], "4": ["city"], "1": ["city"], "2": ["phoneGeneral"], "5": ["phoneGeneral"]}
+
+def test_find_conflicts_restricted_keys_and_empty_report():
+    engine = _engine()
+    assert find_conflicts(engine, LINKS, keys=["5", "9", ""]).keys == ["9", "5"]
+    empty = find_conflicts(engine, {"city": "Ort"}, keys=["2", "6"])
+    assert empty.keys == [] and empty.table.empty and list(empty.table.columns) == REPORT_COLUMNS
+
+def test_conflicts_first_is_stable():
+    queue = ["7", "1", "3", "8", "5", "2"]
+    assert conflicts_first(queue, ["3", "4", "1", "5"]) == ["1", "3", "5", "7", "8", "2"]
+    assert conflicts_first(queue, []) == queue
@@ -0,0 +1,68 @@
+import threading
+
+import pandas as pd
+
+from app.services.matcher import KeyPart, MatchEngine, build_keys, parse_key_spec
+
+def _engine(n: int = 2000) -> MatchEngine:
+    df1 = pd.DataFrame({"nr": [str(i % 50) for i in range(n)]})
+    df2 = pd.DataFrame({"nr": [str(i) for i in range(50)]})
+    return MatchEngine(df1, "nr", df2, "nr")
+
+def test_t1_index_stays_consistent_with_concurrent_reader():
+    # Prefetch-Thread liest (und füllt lazy), UI-Thread verschiebt Zeilen zwischen KEYs
+    engine = _engine()
+    stop = threading.Event()
+    errors = []
+
+    def reader():
+        try:
+            while not stop.is_set():
+                for k in range(50):
+                    engine.t1_rows_for_key(str(k))
+                    engine.t1_row_index_for_key(str(k))
+        except Exception as e:  # pragma: no cover - nur bei Race
+            errors.append(e)
+
+    t = threading.Thread(target=reader)
+    t.start()
+    try:
+        for i in range(0, 2000, 3):
+            engine.df1.at[i, "nr"] = str((i + 7) % 50)
+            engine.update_t1_key(i)
+    finally:
+        stop.set()
+        t.join()
+    assert not errors
+    expected = engine.df1.groupby("_KEY_").groups
+    for k in range(50):
+        assert engine.t1_rows_for_key(str(k)) == list(expected.get(str(k), []))
+
+def test_build_keys_composite_hashes_normalized_parts():
+    df = pd.DataFrame({"plz": ["01067", " 01067 ", "1067", "01067"], "name": ["Müller", "MÜLLER", "Müller", "Schmidt"]})
+    parts = parse_key_spec("plz, name:lower")
+    keys = build_keys(df, parts)
+    assert keys.str.fullmatch(r"[0-9a-f]{16}").all()
+    assert keys[0] == keys[1] != keys[3]
+    assert keys[2] != keys[0]  # führende Nullen zählen (keep_zeros)
+    no_zeros = build_keys(df, parts, keep_zeros=False)
+    assert no_zeros[2] == no_zeros[0]
+
+def test_build_keys_composite_with_empty_part_is_missing():
+    # ein leerer Teil macht den KEY leer, sonst träfen sich alle Zeilen mit gleicher PLZ ohne Namen
+    df = pd.DataFrame({"plz": ["01067", "01067", None, "", "01067"], "name": ["Müller", None, "Müller", "", "n/a"]})
+    keys = build_keys(df, parse_key_spec("plz, name"))
+    assert keys[0] != ""
+    assert keys[1:].tolist() == ["", "", "", ""]
+
+def test_composite_key_matches_across_dtypes():
+    # T1 als Text (read_excel dtype=str), T2 mit Zahlen; "digits" holt die Nummer aus "FIL-0042"
+    df1 = pd.DataFrame({"plz": ["10115", "80331", "80331"], "fil": ["FIL-0042", "7", None]})
+    df2 = pd.DataFrame({"PLZ": [10115, 80331, 80331], "Filiale": ["0042", "7", "8"], "Ort": ["Berlin", "München", "Pasing"]})
+    engine = MatchEngine(df1, [KeyPart("plz"), KeyPart("fil", "digits")], df2, "PLZ, Filiale:digits")
+    assert engine.composite
+    assert engine.t2_rows_for_key(df1.at[0, "_KEY_"])["Ort"].tolist() == ["Berlin"]
+    assert engine.t2_rows_for_key(df1.at[1, "_KEY_"])["Ort"].tolist() == ["München"]
+    assert df1.at[2, "_KEY_"] == ""
+    assert engine.t1_labels_without_match() == [2]
+    assert engine.key_label(df1.at[0, "_KEY_"]) == "10115 | FIL-0042"
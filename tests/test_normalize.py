@@ -0,0 +1,10 @@
+import numpy as np
+import pandas as pd
+
+from app.services.normalize import is_missing, missing_mask_series
+
+def test_is_missing_matches_series_mask():
+    values = [None, np.nan, pd.NA, pd.NaT, "", " - ", "N/A", "null", "x", 0, "0", "Köln"]
+    mask = missing_mask_series(pd.Series(values, dtype=object)).tolist()
+    assert [is_missing(v) for v in values] == mask
+    assert mask == [True] * 8 + [False] * 4
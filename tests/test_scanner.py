@@ -0,0 +1,31 @@
+import pandas as pd
+
+from app.services.matcher import MatchEngine
+from app.services.scanner import scan_missing
+
+def _df() -> pd.DataFrame:
+    return pd.DataFrame({
+        "_KEY_": ["A", "B", "", None, "C", "A"],
+        "city": ["Köln", None, "n/a", "", "Bonn", " - "],
+        "phone": [float("nan"), "0221 1", pd.NA, "0228", "NULL", "030 2"],
+        "email": ["a@x.de", "b@x.de", "c@x.de", None, "c@y.de", ""],
+    }, index=[10, 11, 12, 13, 14, 15])
+
+def test_scan_missing_counts_rows_and_columns():
+    scan = scan_missing(_df(), ["city", "phone", "email"])
+    assert scan.row_counts.to_dict() == {10: 1, 11: 1, 12: 2, 13: 2, 14: 1, 15: 2}
+    assert scan.col_counts.to_dict() == {"city": 4, "phone": 3, "email": 2}
+    # Zeilen ohne KEY zählen mit, liefern aber keinen KEY; doppelte KEYs bleiben je Zeile erhalten
+    assert scan.keys == ["A", "B", "C", "A"]
+
+def test_scan_missing_ignores_unknown_and_duplicate_columns():
+    scan = scan_missing(_df(), ["city", "city", "fax"])
+    assert scan.col_counts.to_dict() == {"city": 4}
+    assert scan.row_counts.to_dict() == {10: 0, 11: 1, 12: 1, 13: 1, 14: 0, 15: 1}
+    assert scan.keys == ["B", "A"]
+
+def test_engine_keys_with_missing_uses_built_keys():
+    df1 = pd.DataFrame({"nr": [" 7 ", "8", None, "9"], "city": ["", "Bonn", "", None]})
+    df2 = pd.DataFrame({"nr": ["7"], "city": ["Köln"]})
+    engine = MatchEngine(df1, "nr", df2, "nr")
+    assert engine.keys_with_missing(["city"]) == ["7", "9"]
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from app.services import settings as settings_mod
+from app.services.settings import AppSettings, SettingsStore
+
+def test_store_keeps_snapshot_when_write_fails(tmp_path, monkeypatch):
+    path = tmp_path / "settings.json"
+    store = SettingsStore(path, delay_s=60)
+    s = AppSettings.defaults()
+    s.country_default_value = "Österreich"
+    store.mark_dirty(s)
+
+    def fail(p, data):
+        raise OSError("Datenträger voll")
+
+    monkeypatch.setattr(settings_mod, "_write_atomic", fail)
+    with pytest.raises(OSError):
+        store.flush()
+    assert store.dirty
+    store._write_in_background()  # Timer-Pfad: protokolliert statt zu werfen
+    assert store.dirty
+
+    monkeypatch.undo()
+    store.flush()
+    assert not store.dirty
+    assert json.loads(path.read_text(encoding="utf-8"))["country_default_value"] == "Österreich"
+
+@pytest.mark.parametrize("raw", [None, "", "abc", [3], "7"])
+def test_load_settings_tolerates_bad_backup_numbers(tmp_path, raw):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"backup_keep_last": raw, "backup_max_age_days": raw}), encoding="utf-8")
+    s, d = settings_mod.load_settings(path), AppSettings.defaults()
+    expected = (7, 7) if raw == "7" else (d.backup_keep_last, d.backup_max_age_days)
+    assert (s.backup_keep_last, s.backup_max_age_days) == expected
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from app.services.transforms import (
+    normalize_phone, normalize_phone_series, split_street_house, split_street_house_series, state_from_zip_de, states_from_zip_de,
+)
+
+# PLZ an Landesgrenzen, deren Leitbereich überwiegend zu einem anderen Land gehört
+BORDER_PLZ = {
+    "88131": "Bayern",  # Lindau
+    "88161": "Bayern",  # Lindenberg im Allgäu
+    "37269": "Hessen",  # Eschwege
+    "37213": "Hessen",  # Witzenhausen
+    "34346": "Niedersachsen",  # Hann. Münden
+    "65582": "Rheinland-Pfalz",  # Diez
+    "07985": "Sachsen",  # Elsterberg
+    "97877": "Baden-Württemberg",  # Wertheim
+    "69483": "Hessen",  # Wald-Michelbach
+    "68526": "Baden-Württemberg",  # Ladenburg
+    "48477": "Nordrhein-Westfalen",  # Hörstel
+    "12529": "Brandenburg",  # Schönefeld
+    "27499": "Hamburg",  # Neuwerk
+    # Nachbarn im selben Leitbereich bleiben beim Land des Bereichs
+    "88069": "Baden-Württemberg",  # Tettnang
+    "37073": "Niedersachsen",  # Göttingen
+    "34369": "Hessen",  # Hofgeismar
+    "97903": "Bayern",  # Collenberg
+    "07973": "Thüringen",  # Greiz
+}
+
+@pytest.mark.parametrize("plz, state", BORDER_PLZ.items())
+def test_state_from_zip_de_at_state_borders(plz, state):
+    assert state_from_zip_de(plz) == state
+
+def test_states_from_zip_de_matches_scalar():
+    zips = pd.Series(list(BORDER_PLZ) + ["D-10115", "1234", None, "", "00000", "abcde"], dtype=object)
+    expected = [state_from_zip_de(z) for z in zips]
+    assert states_from_zip_de(zips).tolist() == expected
+    assert expected[len(BORDER_PLZ)] == "Berlin"
+    assert expected[len(BORDER_PLZ) + 1:] == [None] * 5
+
+STREETS = [None, float("nan"), pd.NA, "", "   ", "Hauptstraße 12", "Hauptstraße 12a", "Am Markt 12-14", "Lindenweg 3/5b",
+           "Goethestraße  7 ", "Schillerplatz", "Straße des 17. Juni 101", "12", "Ernst-Ludwig-Straße 4 D", 42]
+PHONES = [None, float("nan"), pd.NA, "", "+", " + ", "06151 12345", "+49 6151 12345", "0049-6151-12345", "(0351) 12 34 56",
+          "+43 1 234567", "+1 (212) 555-0100", "0041 44 123 45 67", "n/a", 6151123]
+
+def test_split_street_house_series_matches_scalar():
+    street, house = split_street_house_series(pd.Series(STREETS, dtype=object))
+    assert list(zip(street, house)) == [split_street_house(v) for v in STREETS]
+
+def test_normalize_phone_series_matches_scalar():
+    assert normalize_phone_series(pd.Series(PHONES, dtype=object)).tolist() == [normalize_phone(v) for v in PHONES]